@@ -0,0 +1,238 @@
+"""
+Created on 19 Oct 2026.
+
+@author: Ben Lauret
+"""
+
+import logging
+
+from PySide6.QtCore import QObject, Qt, Signal
+
+warningPriority = 0
+cautionPriority = 1
+
+# knots below Vne the airspeed must fall to clear the overspeed alert
+overspeedHysteresis = 5
+
+"""
+Alert rules, in advisory panel order.
+
+Each rule is a dictionary:
+    name: alert name
+    text: annunciator text
+    color: annunciator color when active
+    priority: lower value first in the active alert list
+    inputs: state fields the conditions read
+    set: condition raising the alert, called with a dictionary of the inputs
+    clear: condition clearing the alert, defaults to not set. Using a
+        different threshold than set gives the hysteresis.
+    latch: the alert stays active until acknowledged once cleared, a click
+        on the advisory panel acknowledges
+"""
+alertRules = [
+    {
+        "name": "lowVolts",
+        "text": "LOW\nVOLTS",
+        "color": Qt.GlobalColor.red,
+        "priority": warningPriority,
+        "inputs": ("lowVolts",),
+        "set": lambda v: v["lowVolts"] == 1,
+    },
+    {
+        "name": "lowFuel",
+        "text": "LOW\nFUEL",
+        "color": Qt.GlobalColor.red,
+        "priority": warningPriority,
+        "inputs": ("lowFuel",),
+        "set": lambda v: v["lowFuel"] == 1,
+    },
+    {
+        "name": "oilPres",
+        "text": "OIL\nPRESS",
+        "color": Qt.GlobalColor.red,
+        "priority": warningPriority,
+        "inputs": ("oilPres",),
+        "set": lambda v: v["oilPres"] == 1,
+    },
+    {
+        "name": "parkBrake",
+        "text": "BRAKE",
+        "color": Qt.GlobalColor.red,
+        "priority": warningPriority,
+        "inputs": ("parkBrake",),
+        "set": lambda v: v["parkBrake"] == 1,
+    },
+    {
+        "name": "lowVacuum",
+        "text": "LOW\nVACUUM",
+        "color": Qt.GlobalColor.yellow,
+        "priority": cautionPriority,
+        "inputs": ("lowVacuum",),
+        "set": lambda v: v["lowVacuum"] == 1,
+    },
+    {
+        "name": "fuelPress",
+        "text": "FUEL\nPRESS",
+        "color": Qt.GlobalColor.yellow,
+        "priority": cautionPriority,
+        "inputs": ("fuelPress",),
+        "set": lambda v: v["fuelPress"] == 1,
+    },
+    {
+        "name": "overspeed",
+        "text": "OVER\nSPEED",
+        "color": Qt.GlobalColor.red,
+        "priority": warningPriority,
+        "inputs": ("kias", "vne"),
+        "set": lambda v: v["kias"] > v["vne"],
+        "clear": lambda v: v["kias"] < v["vne"] - overspeedHysteresis,
+        "latch": True,
+    },
+]
+
+
+class pyG5AlertEngine(QObject):
+    """pyG5AlertEngine Object.
+
+    Evaluate the alert rules when one of their input fields changes and
+    keep the active alert list ordered by priority, most recent first. A
+    latched alert whose condition cleared stays active until acknowledged,
+    or becomes the most recent alert again if its condition is raised.
+
+    Args:
+        stateStore: pyG5StateStore the rule inputs are read from
+        rules: list of alert rules
+        parent: QObject
+
+    Returns:
+        self
+    """
+
+    alertsChanged = Signal()
+
+    def __init__(self, stateStore, rules=alertRules, parent=None):
+        """Object constructor.
+
+        Args:
+            stateStore: pyG5StateStore the rule inputs are read from
+            rules: list of alert rules
+            parent: QObject
+
+        Returns:
+            self
+        """
+        QObject.__init__(self, parent)
+
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.stateStore = stateStore
+        self.rules = rules
+
+        # alert name: activation sequence number, for the active alerts
+        self.activeSince = {}
+        self.latched = set()
+        self.sequence = 0
+
+        # ordered list of the active alert rules
+        self.active = []
+
+        # state field name: rules reading it
+        self.fieldRules = {}
+        for rule in self.rules:
+            for field in rule["inputs"]:
+                self.fieldRules.setdefault(field, []).append(rule)
+
+        self.evaluate(self.rules)
+        self.stateStore.subscribe(self.stateChanged, self.fieldRules.keys())
+
+    def stateChanged(self, changed):
+        """Evaluate the rules reading one of the changed fields.
+
+        Args:
+            changed: set of changed field names
+
+        Returns:
+            None
+        """
+        rules = []
+        for field in changed:
+            for rule in self.fieldRules[field]:
+                if rule not in rules:
+                    rules.append(rule)
+
+        self.evaluate(rules)
+
+    def inputValues(self, rule):
+        """Return the dictionary of the rule inputs the conditions read."""
+        return {field: self.stateStore.value(field) for field in rule["inputs"]}
+
+    def evaluate(self, rules):
+        """Update the state of the given rules.
+
+        Args:
+            rules: list of alert rules
+
+        Returns:
+            None
+        """
+        changed = False
+        for rule in rules:
+            name = rule["name"]
+            values = self.inputValues(rule)
+
+            if name not in self.activeSince or name in self.latched:
+                if rule["set"](values):
+                    self.sequence += 1
+                    self.activeSince[name] = self.sequence
+                    self.latched.discard(name)
+                    changed = True
+            else:
+                if "clear" in rule:
+                    cleared = rule["clear"](values)
+                else:
+                    cleared = not rule["set"](values)
+
+                if cleared:
+                    if rule.get("latch", False):
+                        self.latched.add(name)
+                    else:
+                        del self.activeSince[name]
+                        changed = True
+
+        if changed:
+            self.updateActive()
+
+    def updateActive(self):
+        """Order the active alert list and notify the change."""
+        self.active = sorted(
+            (rule for rule in self.rules if rule["name"] in self.activeSince),
+            key=lambda rule: (rule["priority"], -self.activeSince[rule["name"]]),
+        )
+        self.logger.debug(
+            "Active alerts: {}".format([rule["name"] for rule in self.active])
+        )
+        self.alertsChanged.emit()
+
+    def isActive(self, name):
+        """Return True if the alert is active.
+
+        Args:
+            name: alert name
+
+        Returns:
+            bool
+        """
+        return name in self.activeSince
+
+    def acknowledge(self):
+        """Release the latched alerts whose condition is still cleared."""
+        if not len(self.latched):
+            return
+
+        for rule in self.rules:
+            name = rule["name"]
+            if name in self.latched and not rule["set"](self.inputValues(rule)):
+                del self.activeSince[name]
+        self.latched.clear()
+
+        self.updateActive()
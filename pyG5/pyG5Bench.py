@@ -0,0 +1,521 @@
+"""
+Created on 19 Oct 2026.
+
+@author: Ben Lauret
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from math import sin
+
+import numpy as np
+
+from PySide6.QtGui import QImage
+from PySide6.QtWidgets import QApplication
+
+from pyG5 import pyG5View
+from pyG5.pyG5Cache import (
+    formatCache,
+    paintResources,
+    pyG5PaintResources,
+    textCache,
+    tileCache,
+)
+from pyG5.pyG5Quality import defaultQualityTier, qualityTiers, renderScales
+from pyG5.pyG5Scheduler import pyG5FrameScheduler
+from pyG5.pyG5View import (
+    openGLAvailable,
+    pyG5DualStackFMA,
+    g5Width,
+    g5Height,
+    pyG5SecondaryWidget,
+)
+
+
+def flightProfile(frame):
+    """Generate the simulator state of a frame.
+
+    The state keeps changing so every frame is a full repaint, like in a
+    turning climb.
+
+    Args:
+        frame: frame number
+
+    Returns:
+        dictionary of state field values
+    """
+    return {
+        "avionicson": 1,
+        "magHeading": (0.7 * frame) % 360,
+        "groundTrack": (0.7 * frame + 5) % 360,
+        "rollAngle": 25 * sin(frame / 50),
+        "pitchAngle": 5 * sin(frame / 70),
+        "kias": 100 + 20 * sin(frame / 90),
+        "kiasDelta": 2 * sin(frame / 90),
+        "altitude": 3000 + 7 * frame,
+        "vh_ind_fpm": 500,
+        "turnRate": 30 * sin(frame / 50),
+        "slip": 0.5 * sin(frame / 40),
+        "nav1dft": sin(frame / 60),
+        "nav1gs": sin(frame / 80),
+        "nav1gsavailable": 1,
+        "headingBug": 90,
+        "windDirection": 200,
+        "windSpeed": 8,
+    }
+
+
+def benchWidget(widget, frames):
+    """Measure the paint time of a widget.
+
+    Args:
+        widget: pyG5Widget to render
+        frames: number of frames
+
+    Returns:
+        numpy array of the frame paint times in ms
+    """
+    image = QImage(widget.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    samples = np.empty(frames)
+
+    for frame in range(frames):
+        with widget.transaction():
+            for name, value in flightProfile(frame).items():
+                widget.stateStore.setValue(name, value)
+
+        start = time.perf_counter()
+        widget.render(image)
+        samples[frame] = (time.perf_counter() - start) * 1000
+
+    return samples
+
+
+def benchOpenGL(widget, frames):
+    """Measure the paint time of a widget painted through OpenGL.
+
+    Each frame is painted entirely and glFinish() waits for the rendering,
+    so the times compare with the raster ones.
+
+    Args:
+        widget: pyG5Widget painted through its OpenGL surface
+        frames: number of frames
+
+    Returns:
+        numpy array of the frame paint times in ms
+    """
+    surface = widget.glSurface
+    samples = np.empty(frames)
+
+    for frame in range(frames):
+        with widget.transaction():
+            for name, value in flightProfile(frame).items():
+                widget.stateStore.setValue(name, value)
+        widget.invalidate()
+
+        start = time.perf_counter()
+        widget.repaintIfDirty()
+        surface.makeCurrent()
+        surface.context().functions().glFinish()
+        surface.doneCurrent()
+        samples[frame] = (time.perf_counter() - start) * 1000
+
+    return samples
+
+
+def benchMemory(widget, frames):
+    """Measure the Python memory a widget allocates while painting.
+
+    tracemalloc records the peak of the memory allocated during each frame
+    above the memory in use before it. Only the Python heap is traced: the
+    wrappers of the Qt objects show, their C++ data does not.
+
+    Args:
+        widget: pyG5Widget to render
+        frames: number of frames
+
+    Returns:
+        numpy array of the frame allocation peaks in bytes
+    """
+    image = QImage(widget.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    samples = np.empty(frames)
+
+    tracemalloc.start()
+    for frame in range(frames):
+        with widget.transaction():
+            for name, value in flightProfile(frame).items():
+                widget.stateStore.setValue(name, value)
+
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        widget.render(image)
+        samples[frame] = tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+
+    return samples
+
+
+class pyG5UnpooledResources(pyG5PaintResources):
+    """pyG5UnpooledResources Object.
+
+    Paint resources built on every call, the reference the pool is
+    measured against.
+
+    Returns:
+        self
+    """
+
+    def insert(self, table, key, resource):
+        """Count the resource built without pooling it."""
+        self.misses += 1
+        return resource
+
+
+@contextmanager
+def unpooledResources():
+    """Context manager building the paint resources on every call."""
+    pooled = pyG5View.paintResources
+    pyG5View.paintResources = pyG5UnpooledResources()
+    try:
+        yield
+    finally:
+        pyG5View.paintResources = pooled
+
+
+def benchPooling(widget, frames):
+    """Count the paint resources a widget builds per frame.
+
+    Once the first frame pooled the pens, brushes, gradients, polygons and
+    line sets, the following frames should build none.
+
+    Args:
+        widget: pyG5Widget to render
+        frames: number of frames
+
+    Returns:
+        tuple of the first frame count and the numpy array of the others
+    """
+    image = QImage(widget.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    samples = np.empty(frames + 1, dtype=int)
+
+    for frame in range(frames + 1):
+        with widget.transaction():
+            for name, value in flightProfile(frame).items():
+                widget.stateStore.setValue(name, value)
+
+        misses = pyG5View.paintResources.misses
+        widget.render(image)
+        samples[frame] = pyG5View.paintResources.misses - misses
+
+    return samples[0], samples[1:]
+
+
+def checkTrends(widget, frames=10):
+    """Check the trends are repainted once the samples stop.
+
+    Without new samples the trends keep changing until their window slid
+    past the last one. The frame scheduler must repaint the widget
+    meanwhile and once they settled, then let it sleep.
+
+    Args:
+        widget: shown pyG5Widget drawing trends
+        frames: number of frames with new samples
+
+    Returns:
+        list of the failed checks, empty if the trends are repainted
+    """
+    scheduler = pyG5FrameScheduler(widget.stateStore)
+    scheduler.addWidget(widget)
+
+    for frame in range(frames):
+        with widget.transaction():
+            for name, value in flightProfile(frame).items():
+                widget.stateStore.setValue(name, value)
+        time.sleep(scheduler.period)
+        scheduler.frame()
+
+    failures = []
+    widget.takePaintedArea()
+    settleTime = max(
+        widget.stateStore.trendSettleTime(name) for name in widget.trendFields
+    )
+
+    time.sleep((settleTime - time.monotonic()) / 2)
+    scheduler.frame()
+    if not widget.takePaintedArea():
+        failures.append("not repainted while the trends settle")
+
+    time.sleep(settleTime - time.monotonic())
+    scheduler.frame()
+    if not widget.takePaintedArea():
+        failures.append("not repainted once the trends settled")
+
+    scheduler.frame()
+    if widget.takePaintedArea() or scheduler.timer.isActive():
+        failures.append("still repainted after the trends settled")
+
+    scheduler.timer.stop()
+    widget.frameRequested.disconnect(scheduler.requestFrame)
+    return failures
+
+
+def countQtCalls(widget, image):
+    """Count the Qt method calls made from Python while rendering a frame.
+
+    Args:
+        widget: pyG5Widget to render
+        image: QImage rendered into
+
+    Returns:
+        number of calls
+    """
+    calls = 0
+
+    def profile(frame, event, arg):
+        nonlocal calls
+        if event == "c_call":
+            if type(getattr(arg, "__self__", None)).__module__.startswith("PySide6"):
+                calls += 1
+
+    sys.setprofile(profile)
+    widget.render(image)
+    sys.setprofile(None)
+
+    return calls
+
+
+def benchCalls(widget, frames):
+    """Count the Qt calls of a frame rendering the cached layers again.
+
+    Then of the following frames, drawn from the caches.
+
+    Args:
+        widget: pyG5Widget to render
+        frames: number of frames
+
+    Returns:
+        tuple of the first frame calls and the numpy array of the others
+    """
+    image = QImage(widget.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    samples = np.empty(frames)
+
+    widget.invalidateStaticLayers()
+    tileCache.clear()
+    first = countQtCalls(widget, image)
+
+    for frame in range(frames):
+        with widget.transaction():
+            for name, value in flightProfile(frame).items():
+                widget.stateStore.setValue(name, value)
+
+        samples[frame] = countQtCalls(widget, image)
+
+    return first, samples
+
+
+def printSummary(name, samples):
+    """Print the paint time statistics.
+
+    Args:
+        name: measurement name
+        samples: numpy array of paint times in ms
+
+    Returns:
+        None
+    """
+    print(
+        "{:<22} mean {:6.3f} ms  median {:6.3f} ms  p95 {:6.3f} ms  max {:6.3f} ms".format(
+            name,
+            samples.mean(),
+            np.median(samples),
+            np.percentile(samples, 95),
+            samples.max(),
+        )
+    )
+
+
+def argumentParser():
+    """Parse the arguments passed from the command line.
+
+    Returns:
+        argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description="pyG5 paint benchmark")
+    parser.add_argument(
+        "-n", "--frames", help="number of measured frames", type=int, default=500
+    )
+    parser.add_argument(
+        "-w", "--warmup", help="number of frames not measured", type=int, default=20
+    )
+    parser.add_argument(
+        "-c",
+        "--cores",
+        help="number of CPU cores to run on, 1 is close to a Raspberry Pi",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "-m",
+        "--memory",
+        help="measure the memory allocated per frame with tracemalloc",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-Q",
+        "--quality",
+        help="rendering quality tier of the instruments",
+        choices=[tier["name"] for tier in qualityTiers],
+        default=defaultQualityTier,
+    )
+    parser.add_argument(
+        "-s",
+        "--render-scale",
+        help="internal resolution scale of the AI and HSI, upscaled on present",
+        type=float,
+        choices=renderScales,
+        default=1.0,
+    )
+    parser.add_argument(
+        "-g",
+        "--opengl",
+        help="also measure the AI and HSI painted through OpenGL, needs a display "
+        "platform, eg. QT_QPA_PLATFORM=xcb LIBGL_ALWAYS_SOFTWARE=1 for Mesa llvmpipe",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-p",
+        "--pooling",
+        help="check no paint resource is built after the first frame, "
+        "exits with status 1 otherwise",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-t",
+        "--trends",
+        help="check the trends are repainted until they settle once the samples "
+        "stop, exits with status 1 otherwise",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-q",
+        "--calls",
+        help="count the Qt calls made from Python per frame",
+        action="store_true",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = argumentParser()
+
+    # pin to a few cores to approach the embedded target
+    if hasattr(os, "sched_setaffinity"):
+        cores = sorted(os.sched_getaffinity(0))[: args.cores]
+        os.sched_setaffinity(0, cores)
+        print("Running on CPU cores {}".format(cores))
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    a = QApplication(sys.argv)
+
+    g5View = pyG5DualStackFMA()
+    g5View.resize(g5Width, 2 * g5Height)
+    secView = pyG5SecondaryWidget(stateStore=g5View.stateStore)
+    for widget in [g5View.pyG5AI, g5View.pyG5HSI, g5View.pyG5FMA, secView]:
+        widget.setQuality(args.quality)
+    for widget in [g5View.pyG5AI, g5View.pyG5HSI]:
+        widget.setRenderScale(args.render_scale)
+
+    # first, as the first frames fill the pool
+    pooled = True
+    if args.pooling:
+        for widget in [g5View.pyG5AI, g5View.pyG5HSI, g5View.pyG5FMA, secView]:
+            first, samples = benchPooling(widget, args.frames)
+            with unpooledResources():
+                _, unpooled = benchPooling(widget, args.frames)
+                unpooledPeaks = benchMemory(widget, args.frames)
+            peaks = benchMemory(widget, args.frames)
+
+            print(
+                "{:<22} paint resources built: first frame {:4d}  "
+                "following frames {:4d}  per frame without the pool {:5.1f}".format(
+                    widget.__class__.__name__,
+                    first,
+                    samples.sum(),
+                    unpooled.mean(),
+                )
+            )
+            print(
+                "{:<22} peak allocation per frame: mean {:7.1f} KiB  "
+                "without the pool {:7.1f} KiB".format(
+                    widget.__class__.__name__,
+                    peaks.mean() / 1024,
+                    unpooledPeaks.mean() / 1024,
+                )
+            )
+            pooled = pooled and not samples.any()
+
+    for widget in [g5View.pyG5AI, g5View.pyG5HSI, g5View.pyG5FMA, secView]:
+        benchWidget(widget, args.warmup)
+        printSummary(widget.__class__.__name__, benchWidget(widget, args.frames))
+
+    if args.opengl and not openGLAvailable():
+        print("OpenGL: no context on the {} platform".format(a.platformName()))
+    elif args.opengl:
+        g5View.show()
+        for widget in [g5View.pyG5AI, g5View.pyG5HSI]:
+            widget.setOpenGL(True)
+            a.processEvents()
+            benchOpenGL(widget, args.warmup)
+            printSummary(
+                "{} GL".format(widget.__class__.__name__),
+                benchOpenGL(widget, args.frames),
+            )
+            widget.setOpenGL(False)
+
+    if args.memory:
+        for widget in [g5View.pyG5AI, g5View.pyG5HSI, g5View.pyG5FMA, secView]:
+            samples = benchMemory(widget, args.frames)
+            print(
+                "{:<22} peak allocation per frame: mean {:7.1f} KiB  max {:7.1f} KiB".format(
+                    widget.__class__.__name__,
+                    samples.mean() / 1024,
+                    samples.max() / 1024,
+                )
+            )
+
+    print("Format cache: {}".format(formatCache.stats()))
+    print("Text cache: {}".format(textCache.stats()))
+    print("Tile cache: {}".format(tileCache.stats()))
+    print("Paint resources: {}".format(paintResources.stats()))
+
+    # last, as the cached layers are rendered again
+    if args.calls:
+        for widget in [g5View.pyG5AI, g5View.pyG5HSI, g5View.pyG5FMA, secView]:
+            first, samples = benchCalls(widget, args.frames)
+            print(
+                "{:<22} Qt calls: first frame {:5d}  cached frames mean {:6.1f}".format(
+                    widget.__class__.__name__, first, samples.mean()
+                )
+            )
+
+    repainted = True
+    if args.trends:
+        g5View.show()
+        a.processEvents()
+        for widget in [g5View.pyG5AI, g5View.pyG5HSI]:
+            failures = checkTrends(widget)
+            print(
+                "{:<22} trends: {}".format(
+                    widget.__class__.__name__,
+                    ", ".join(failures) or "repainted until settled",
+                )
+            )
+            repainted = repainted and not failures
+
+    if not pooled:
+        sys.exit("Paint resources built after the first frame, they are not pooled")
+    if not repainted:
+        sys.exit("Trends left on screen once the samples stopped")
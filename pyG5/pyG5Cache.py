@@ -0,0 +1,511 @@
+"""
+Created on 19 Oct 2026.
+
+@author: Ben Lauret
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+
+from PySide6.QtCore import QPointF, QRectF, Qt
+from PySide6.QtGui import (
+    QBrush,
+    QColor,
+    QFont,
+    QFontMetricsF,
+    QPen,
+    QPolygonF,
+    QStaticText,
+    QTextOption,
+    QTransform,
+)
+
+from pyG5.pyG5Geometry import toLines
+
+
+class pyG5FormatCache:
+    """pyG5FormatCache Object.
+
+    Bounded least recently used cache of formatted strings keyed by the
+    format and the values it renders. The instruments mostly display the
+    same few hundred values frame after frame, so in steady state the
+    text is looked up rather than formatted again.
+
+    Args:
+        size: maximum number of cached strings
+
+    Returns:
+        self
+    """
+
+    def __init__(self, size=4096):
+        """Object constructor.
+
+        Args:
+            size: maximum number of cached strings
+
+        Returns:
+            self
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.size = size
+        self.entries = OrderedDict()
+        # the instruments may be rendered on several threads
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def format(self, fmt, *values):
+        """Return the values formatted with fmt, formatted once per distinct values.
+
+        Args:
+            fmt: format string
+            values: hashable values to format
+
+        Returns:
+            string
+        """
+        key = (fmt, values)
+        with self.lock:
+            text = self.entries.get(key)
+            if text is not None:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return text
+
+        text = fmt.format(*values)
+        self.insert(key, text)
+        return text
+
+    def lines(self, fmt, values):
+        """Return the values formatted with fmt, one per line.
+
+        Args:
+            fmt: format string applied to each value
+            values: iterable of hashable values
+
+        Returns:
+            string
+        """
+        key = (fmt, tuple(values), "\n")
+        with self.lock:
+            text = self.entries.get(key)
+            if text is not None:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return text
+
+        text = "\n".join(fmt.format(value) for value in key[1])
+        self.insert(key, text)
+        return text
+
+    def insert(self, key, text):
+        """Add a string to the cache, evicting the least recently used."""
+        with self.lock:
+            self.misses += 1
+            self.entries[key] = text
+            if len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        """Return the cache statistics.
+
+        Returns:
+            dictionary with hits, misses, hitRate and entries
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+        }
+
+    def clear(self):
+        """Empty the cache and reset the statistics."""
+        with self.lock:
+            self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class pyG5TileCache:
+    """pyG5TileCache Object.
+
+    Least recently used cache of image tiles bounded by a memory budget.
+    Tiles are rendered on the first request and evicted, oldest first,
+    when the cached images exceed the budget.
+
+    Args:
+        budget: maximum size of the cached images in bytes
+
+    Returns:
+        self
+    """
+
+    def __init__(self, budget=4 * 1024 * 1024):
+        """Object constructor.
+
+        Args:
+            budget: maximum size of the cached images in bytes
+
+        Returns:
+            self
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.budget = budget
+        self.entries = OrderedDict()
+        # the instruments may be rendered on several threads
+        self.lock = threading.Lock()
+        self.nbytes = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    def tile(self, key, render):
+        """Return the tile for the key, rendering it if not cached.
+
+        Args:
+            key: hashable tile identifier
+            render: function returning the QImage of the tile
+
+        Returns:
+            QImage
+        """
+        with self.lock:
+            tile = self.entries.get(key)
+            if tile is not None:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return tile
+
+        tile = render()
+        with self.lock:
+            self.misses += 1
+            # rendered meanwhile by another thread
+            if key in self.entries:
+                self.nbytes -= self.imageSize(self.entries[key])
+            self.entries[key] = tile
+            self.nbytes += self.imageSize(tile)
+
+            # always keep the tile just rendered
+            while self.nbytes > self.budget and len(self.entries) > 1:
+                _, evicted = self.entries.popitem(last=False)
+                self.nbytes -= self.imageSize(evicted)
+        return tile
+
+    def imageSize(self, image):
+        """Return the memory size of an image in bytes."""
+        return image.width() * image.height() * image.depth() // 8
+
+    def stats(self):
+        """Return the cache statistics.
+
+        Returns:
+            dictionary with hits, misses, hitRate, entries and nbytes
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "nbytes": self.nbytes,
+        }
+
+    def clear(self):
+        """Empty the cache and reset the statistics."""
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+class pyG5TextCache:
+    """pyG5TextCache Object.
+
+    Least recently used cache of laid out QStaticText keyed by the string,
+    the font and the alignment flags. Drawing a QStaticText skips the
+    shaping and layout QPainter.drawText does on every call.
+
+    Args:
+        size: maximum number of cached texts
+
+    Returns:
+        self
+    """
+
+    def __init__(self, size=1024):
+        """Object constructor.
+
+        Args:
+            size: maximum number of cached texts
+
+        Returns:
+            self
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.size = size
+        self.entries = OrderedDict()
+        # the instruments may be rendered on several threads
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def text(self, string, font, flags):
+        """Return the static text for the string, laid out once per font.
+
+        The text is placed at rect.x() + xAlign * (rect.width() - width) and
+        rect.y() + yAlign * (rect.height() - height) to be aligned in rect.
+
+        Args:
+            string: text, lines separated by newlines
+            font: QFont
+            flags: Qt.AlignmentFlag
+
+        Returns:
+            tuple of the QStaticText, xAlign, yAlign, width and height
+        """
+        key = (string, font, flags)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return entry
+
+        entry = self.layout(string, font, flags)
+        with self.lock:
+            self.misses += 1
+            self.entries[key] = entry
+            if len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+        return entry
+
+    def layout(self, string, font, flags):
+        """Lay out a static text.
+
+        Args:
+            string: text, lines separated by newlines
+            font: QFont
+            flags: Qt.AlignmentFlag
+
+        Returns:
+            tuple of the QStaticText, xAlign, yAlign, width and height
+        """
+        if flags & Qt.AlignmentFlag.AlignRight:
+            alignment, xAlign = Qt.AlignmentFlag.AlignRight, 1.0
+        elif flags & Qt.AlignmentFlag.AlignHCenter:
+            alignment, xAlign = Qt.AlignmentFlag.AlignHCenter, 0.5
+        else:
+            alignment, xAlign = Qt.AlignmentFlag.AlignLeft, 0.0
+
+        if flags & Qt.AlignmentFlag.AlignBottom:
+            yAlign = 1.0
+        elif flags & Qt.AlignmentFlag.AlignVCenter:
+            yAlign = 0.5
+        else:
+            yAlign = 0.0
+
+        # drawText aligns the advance of the text and its font line height,
+        # the static text size is rounded up to whole pixels
+        metrics = QFontMetricsF(font)
+        lines = string.split("\n")
+        width = max(metrics.horizontalAdvance(line) for line in lines)
+        height = metrics.boundingRect(QRectF(), alignment, string).height()
+
+        # QStaticText breaks lines on the unicode line separator only
+        staticText = QStaticText("\u2028".join(lines))
+        staticText.setTextFormat(Qt.TextFormat.PlainText)
+        staticText.setPerformanceHint(QStaticText.PerformanceHint.AggressiveCaching)
+
+        if len(lines) > 1:
+            # align the lines within the widest one
+            option = QTextOption()
+            option.setAlignment(alignment)
+            staticText.setTextOption(option)
+            staticText.setTextWidth(width)
+
+        staticText.prepare(QTransform(), QFont(font))
+
+        return (staticText, xAlign, yAlign, width, height)
+
+    def stats(self):
+        """Return the cache statistics.
+
+        Returns:
+            dictionary with hits, misses, hitRate and entries
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+        }
+
+    def clear(self):
+        """Empty the cache and reset the statistics."""
+        with self.lock:
+            self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class pyG5PaintResources:
+    """pyG5PaintResources Object.
+
+    Pool of the pens, brushes, gradients, polygons and line sets the
+    instruments paint with. They are built on first use and shared by all the frames instead
+    of being allocated on every paint.
+
+    Returns:
+        self
+    """
+
+    def __init__(self):
+        """Object constructor.
+
+        Returns:
+            self
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.pens = {}
+        self.brushes = {}
+        self.polygons = {}
+        self.lineSets = {}
+
+        # the resources are also built on the render threads
+        self.lock = threading.Lock()
+
+        # number of resources built, the pooling works if it stops growing
+        self.misses = 0
+
+    def insert(self, table, key, resource):
+        """Pool a resource just built, unless another thread did first.
+
+        Args:
+            table: pool dictionary
+            key: resource key
+            resource: resource just built
+
+        Returns:
+            the pooled resource
+        """
+        with self.lock:
+            self.misses += 1
+            return table.setdefault(key, resource)
+
+    def colorKey(self, color):
+        """Return a hashable key for a Qt.GlobalColor or a QColor."""
+        return color.rgba() if isinstance(color, QColor) else color
+
+    def pen(self, width, color, style=Qt.PenStyle.SolidLine):
+        """Return the pen of the given width, color and style.
+
+        Args:
+            width: pen width, 0 is a cosmetic pen
+            color: Qt.GlobalColor or QColor
+            style: Qt.PenStyle
+
+        Returns:
+            QPen
+        """
+        key = (width, self.colorKey(color), style)
+        try:
+            return self.pens[key]
+        except KeyError:
+            pen = QPen(color)
+            pen.setWidth(width)
+            pen.setStyle(style)
+            return self.insert(self.pens, key, pen)
+
+    def brush(self, color):
+        """Return the solid brush of the given color.
+
+        Args:
+            color: Qt.GlobalColor or QColor
+
+        Returns:
+            QBrush
+        """
+        key = self.colorKey(color)
+        try:
+            return self.brushes[key]
+        except KeyError:
+            return self.insert(self.brushes, key, QBrush(color))
+
+    def polygon(self, key, build):
+        """Return a constant polygon, built on first use.
+
+        Args:
+            key: hashable polygon identifier
+            build: function returning the list of (x, y) vertices
+
+        Returns:
+            QPolygonF
+        """
+        try:
+            return self.polygons[key]
+        except KeyError:
+            polygon = QPolygonF([QPointF(x, y) for x, y in build()])
+            return self.insert(self.polygons, key, polygon)
+
+    def lines(self, key, build):
+        """Return a constant set of lines, built on first use.
+
+        Args:
+            key: hashable line set identifier
+            build: function returning the numpy array of x1, y1, x2, y2 rows
+
+        Returns:
+            list of QLineF
+        """
+        try:
+            return self.lineSets[key]
+        except KeyError:
+            return self.insert(self.lineSets, key, toLines(build()))
+
+    def gradient(self, key, build):
+        """Return a constant gradient brush, built on first use.
+
+        Args:
+            key: hashable gradient identifier
+            build: function returning the QGradient
+
+        Returns:
+            QBrush
+        """
+        try:
+            return self.brushes[key]
+        except KeyError:
+            return self.insert(self.brushes, key, QBrush(build()))
+
+    def stats(self):
+        """Return the number of pooled resources.
+
+        Returns:
+            dictionary with pens, brushes, polygons, line sets and misses
+        """
+        return {
+            "misses": self.misses,
+            "pens": len(self.pens),
+            "brushes": len(self.brushes),
+            "polygons": len(self.polygons),
+            "lineSets": len(self.lineSets),
+        }
+
+
+# shared by all the instruments
+formatCache = pyG5FormatCache()
+tileCache = pyG5TileCache()
+textCache = pyG5TextCache()
+paintResources = pyG5PaintResources()
@@ -0,0 +1,62 @@
+"""
+Created on 19 Oct 2026.
+
+@author: Ben Lauret
+"""
+
+import numpy as np
+
+from PySide6.QtCore import QLineF
+
+
+def radialTicks(angles, inner, outer):
+    """Return ticks along the radii of a circle centered on the origin.
+
+    The angles follow QPainter.rotate(): in degrees, clockwise from the
+    x axis on screen.
+
+    Args:
+        angles: tick angles
+        inner: radius of the tick start, scalar or one per angle
+        outer: radius of the tick end, scalar or one per angle
+
+    Returns:
+        numpy array of x1, y1, x2, y2 rows
+    """
+    angles = np.radians(np.asarray(angles, dtype=float))
+    cos = np.cos(angles)
+    sin = np.sin(angles)
+    inner = np.broadcast_to(inner, angles.shape)
+    outer = np.broadcast_to(outer, angles.shape)
+
+    return np.column_stack((inner * cos, inner * sin, outer * cos, outer * sin))
+
+
+def horizontalTicks(y, left, right):
+    """Return horizontal ticks.
+
+    Args:
+        y: tick ordinates
+        left: tick start abscissa, scalar or one per tick
+        right: tick end abscissa, scalar or one per tick
+
+    Returns:
+        numpy array of x1, y1, x2, y2 rows
+    """
+    y = np.asarray(y, dtype=float)
+    left = np.broadcast_to(left, y.shape)
+    right = np.broadcast_to(right, y.shape)
+
+    return np.column_stack((left, y, right, y))
+
+
+def toLines(lines):
+    """Convert tick rows to the QLineF list QPainter.drawLines() takes.
+
+    Args:
+        lines: numpy array of x1, y1, x2, y2 rows
+
+    Returns:
+        list of QLineF
+    """
+    return [QLineF(*line) for line in lines.tolist()]
@@ -9,6 +9,7 @@ __appName__ = "pyG5"
 
 import argparse
 import logging
+import os
 import sys
 import platform
 
@@ -16,6 +17,7 @@ import platform
 from PySide6.QtCore import (
     Qt,
     QTimer,
+    QThreadPool,
     QCoreApplication,
     QSettings,
     Slot,
@@ -30,7 +32,41 @@ from PySide6.QtWidgets import (
 )
 
 from pyG5.pyG5Network import pyG5NetWorkManager
-from pyG5.pyG5View import pyG5DualStackFMA, pyG5SecondaryWidget
+from pyG5.pyG5Quality import (
+    defaultQualityTier,
+    pyG5QualityGovernor,
+    qualityTiers,
+    renderScales,
+)
+from pyG5.pyG5Quick import pyG5QuickStack
+from pyG5.pyG5Scheduler import pyG5FrameScheduler
+from pyG5.pyG5State import pyG5StateStore
+from pyG5.pyG5View import openGLAvailable, pyG5DualStackFMA, pyG5SecondaryWidget
+
+
+def instrumentRate(text):
+    """Parse an instrument frame rate command line argument.
+
+    Args:
+        text: instrument=fps or instrument=fps:priority
+
+    Returns:
+        (instrument name, (fps, priority or None))
+    """
+    try:
+        name, rate = text.split("=")
+        fps, _, priority = rate.partition(":")
+        fps = float(fps)
+        priority = int(priority) if priority else None
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "expected instrument=fps[:priority], got {}".format(text)
+        )
+
+    if fps <= 0:
+        raise argparse.ArgumentTypeError("fps must be positive, got {}".format(fps))
+
+    return name, (fps, priority)
 
 
 class pyG5App(QApplication):
@@ -77,25 +113,60 @@ class pyG5App(QApplication):
 
         self.networkManager = pyG5NetWorkManager()
 
-        self.paintTimer = QTimer()
-        self.paintTimer.timeout.connect(
-            self.painTimerCB
-        )  # Let the interpreter run each 500 ms.
-        self.paintTimer.start(25)  # You may change this if you wish.
+        # single copy of the simulator state shared by all the instruments
+        self.stateStore = pyG5StateStore()
+        self.stateStore.setFilters(self.networkManager.datarefs)
+        self.networkManager.drefUpdate.connect(self.stateStore.drefHandler)
 
-        # The QWidget widget is the base class of all user interface objects in PySide6.
-        self.mainWindow = pyG5MainWindow()
-
-        self.networkManager.drefUpdate.connect(
-            self.mainWindow.pyG5DualStacked.pyG5AI.drefHandler
-        )
-        self.networkManager.drefUpdate.connect(
-            self.mainWindow.pyG5DualStacked.pyG5HSI.drefHandler
+        # restore the last session state so the instruments are not blank
+        # until the simulator data arrives, then keep the snapshot fresh
+        self.snapshotPath = os.path.join(
+            os.path.dirname(self.settings.fileName()), "pyG5State.bin"
         )
+        self.stateStore.loadSnapshot(self.snapshotPath)
 
-        self.networkManager.drefUpdate.connect(
-            self.mainWindow.pyG5DualStacked.pyG5FMA.drefHandler
-        )
+        self.snapshotTimer = QTimer()
+        self.snapshotTimer.timeout.connect(self.saveSnapshot)
+        self.snapshotTimer.start(5000)
+        self.aboutToQuit.connect(self.saveSnapshot)
+
+        # the displayed values are interpolated at the frame time
+        # so the frame rate is not bound to the 30Hz data rate, frames are
+        # only prepared while the state or the instruments change
+        self.frameScheduler = pyG5FrameScheduler(self.stateStore, self.args.fps)
+
+        # the quality tier of each instrument, then the internal resolution
+        # of the AI and HSI, steps down when its paint times overrun its
+        # frame period, and back up
+        self.qualityGovernor = pyG5QualityGovernor()
+
+        # repainted pixel area per second, logged in verbose mode
+        self.paintStatsTimer = QTimer()
+        self.paintStatsTimer.timeout.connect(self.logPaintStats)
+        self.paintStatsTimer.start(1000)
+
+        # The QWidget widget is the base class of all user interface objects in PySide6.
+        self.mainWindow = pyG5MainWindow(stateStore=self.stateStore)
+
+        if self.args.renderer == "quick":
+            # the scene graph is synchronized on the GUI thread and rendered
+            # on its own thread, QT_QUICK_BACKEND=software selects the
+            # software renderer when no GPU is available
+            os.environ.setdefault("QSG_RENDER_LOOP", "threaded")
+
+            stack = self.mainWindow.pyG5DualStacked
+            self.sceneGraphWindow = pyG5QuickStack(stack.pyG5AI, stack.pyG5HSI)
+            stack.setSceneGraphWindow(self.sceneGraphWindow)
+        elif self.args.renderer == "opengl":
+            # Mesa llvmpipe renders without a GPU, eg. with
+            # LIBGL_ALWAYS_SOFTWARE=1
+            if openGLAvailable():
+                self.mainWindow.pyG5DualStacked.pyG5AI.setOpenGL(True)
+                self.mainWindow.pyG5DualStacked.pyG5HSI.setOpenGL(True)
+            else:
+                logging.warning(
+                    "No OpenGL context, the raster engine paints the AI and HSI"
+                )
 
         # Show window
         self.mainWindow.loadSettings()
@@ -109,7 +180,7 @@ class pyG5App(QApplication):
         self.mainWindow.show()
 
         if self.args.mode == "full":
-            self.secondaryWindow = pyG5SecondWindow()
+            self.secondaryWindow = pyG5SecondWindow(stateStore=self.stateStore)
 
             self.secondaryWindow.loadSettings()
 
@@ -120,11 +191,6 @@ class pyG5App(QApplication):
 
                 self.secondaryWindow.setWindowState(Qt.WindowFullScreen)
 
-            # connect the value coming from the simulator
-            self.networkManager.drefUpdate.connect(
-                self.secondaryWindow.cWidget.drefHandler
-            )
-
             # connect the value to update to the simulator
             self.secondaryWindow.cWidget.xpdrCodeSignal.connect(
                 self.send_transponder_code
@@ -138,6 +204,33 @@ class pyG5App(QApplication):
             self.secondaryWindow.closed.connect(self.mainWindow.close)
             self.mainWindow.closed.connect(self.secondaryWindow.close)
 
+        instruments = self.mainWindow.pyG5DualStacked.instruments()
+        if self.args.mode == "full":
+            instruments.append(self.secondaryWindow.cWidget)
+        for widget in instruments:
+            widget.setQuality(self.args.quality)
+
+        rates = dict(self.args.rate or [])
+        for widget in self.paintedWidgets():
+            fps, priority = rates.pop(widget.instrumentName, (None, None))
+            period = self.frameScheduler.addWidget(widget, fps, priority)
+            if not self.args.fixed_quality:
+                minScale = (
+                    self.args.min_render_scale
+                    if widget.instrumentName in ("ai", "hsi")
+                    else 1.0
+                )
+                self.qualityGovernor.addWidget(widget, period, minScale)
+            if self.args.threaded:
+                widget.setThreadPool(QThreadPool.globalInstance())
+        if self.args.threaded:
+            # a C++ slot of a Qt owned object cannot be connected from Python
+            self.aboutToQuit.connect(lambda: QThreadPool.globalInstance().waitForDone())
+        if self.args.composite:
+            self.mainWindow.pyG5DualStacked.setCompositing(True)
+        for name in rates:
+            logging.warning("No {} instrument to set the rate of".format(name))
+
     def send_transponder_code(self, code):
         """Trigger the xpdr transmission to xplane."""
         self.networkManager.write_data_ref("sim/cockpit/radios/transponder_code", code)
@@ -146,12 +239,54 @@ class pyG5App(QApplication):
         """Trigger the xpdr transmission to xplane."""
         self.networkManager.write_data_ref("sim/cockpit/radios/transponder_mode", mode)
 
-    def painTimerCB(self):
-        """Trigger update of all the widgets."""
-        self.mainWindow.pyG5DualStacked.pyG5HSI.update()
-        self.mainWindow.pyG5DualStacked.update()
+    def saveSnapshot(self):
+        """Save the state snapshot once live data has been received."""
+        if self.stateStore.value("stale"):
+            return
+
+        os.makedirs(os.path.dirname(self.snapshotPath), exist_ok=True)
+        self.stateStore.saveSnapshot(self.snapshotPath)
+
+    def paintedWidgets(self):
+        """Return the instrument widgets repainted by the frame scheduler."""
+        widgets = [self.mainWindow.pyG5DualStacked.pyG5FMA]
+        # the scene graph window draws the AI and HSI at its own pace
+        if self.args.renderer != "quick":
+            widgets += [
+                self.mainWindow.pyG5DualStacked.pyG5AI,
+                self.mainWindow.pyG5DualStacked.pyG5HSI,
+            ]
         if self.args.mode == "full":
-            self.secondaryWindow.cWidget.update()
+            widgets.append(self.secondaryWindow.cWidget)
+
+        return widgets
+
+    def logPaintStats(self):
+        """Log the frames and pixel area repainted in the last second, and the quality tiers."""
+        logging.debug(
+            "Frames per second: {} ({} deferred repaints), "
+            "repainted area per second: {}".format(
+                *self.frameScheduler.takeStats(),
+                ", ".join(
+                    "{} {} px".format(
+                        widget.__class__.__name__, widget.takePaintedArea()
+                    )
+                    for widget in self.paintedWidgets()
+                ),
+            )
+        )
+        logging.debug(
+            "Quality tiers: {}".format(
+                ", ".join(
+                    "{} {} at {:.0%} ({} changes)".format(name, tier, scale, changes)
+                    for name, (
+                        tier,
+                        scale,
+                        changes,
+                    ) in self.qualityGovernor.takeStats().items()
+                )
+            )
+        )
 
     def argument_parser(self):
         """Initialize the arguments passed from the command line."""
@@ -171,9 +306,88 @@ class pyG5App(QApplication):
             ],
             default="hsi",
         )
+        self.parser.add_argument(
+            "-f",
+            "--fps",
+            help="Maximum number of frames per second",
+            type=int,
+            default=60,
+        )
+        self.parser.add_argument(
+            "-r",
+            "--rate",
+            help="Instrument target frame rate and optional priority, "
+            "the lowest priority is repainted first, eg. hsi=20:1. "
+            "Instruments: ai, hsi, fma, secondary",
+            type=instrumentRate,
+            action="append",
+        )
+        renderMode = self.parser.add_mutually_exclusive_group()
+        renderMode.add_argument(
+            "-t",
+            "--threaded",
+            help="Render the instruments in parallel on worker threads, the "
+            "text being laid out on every frame as the cached static texts "
+            "cannot be drawn off the GUI thread",
+            action="store_true",
+        )
+        renderMode.add_argument(
+            "-c",
+            "--composite",
+            help="Paint the stacked instruments into a single image per frame",
+            action="store_true",
+        )
+
+        self.parser.add_argument(
+            "-Q",
+            "--quality",
+            help="Highest rendering quality tier of the instruments",
+            choices=[tier["name"] for tier in qualityTiers],
+            default=defaultQualityTier,
+        )
+        self.parser.add_argument(
+            "--fixed-quality",
+            help="Keep the quality tier, the paint times do not step it down",
+            action="store_true",
+        )
+        self.parser.add_argument(
+            "--min-render-scale",
+            help="Lowest internal resolution scale the AI and HSI step down to "
+            "past the lowest quality tier, upscaled on present, 1 keeps the "
+            "native resolution",
+            type=float,
+            choices=renderScales,
+            default=1.0,
+        )
+        self.parser.add_argument(
+            "--renderer",
+            help="Draw the AI and HSI with the widget paint code on the raster "
+            "engine or through OpenGL, or with a retained Qt Quick scene graph",
+            choices=[
+                "widget",
+                "quick",
+                "opengl",
+            ],
+            default="widget",
+        )
 
         self.args = self.parser.parse_args()
 
+        if self.args.renderer != "widget" and self.args.composite:
+            self.parser.error("--composite requires the widget renderer")
+        if self.args.renderer == "opengl" and self.args.threaded:
+            self.parser.error("--threaded requires the widget or quick renderer")
+        if self.args.min_render_scale < 1 and (
+            self.args.renderer != "widget" or self.args.composite
+        ):
+            self.parser.error(
+                "--min-render-scale requires the widget renderer without --composite"
+            )
+        if self.args.min_render_scale < 1 and self.args.fixed_quality:
+            self.parser.error(
+                "--min-render-scale requires the governor, not --fixed-quality"
+            )
+
 
 class pyG5BaseWindow(QMainWindow):
     """pyG5App PySide6 application.
@@ -287,18 +501,19 @@ class pyG5MainWindow(pyG5BaseWindow):
 
     closed = Signal()
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, stateStore=None):
         """g5Widget Constructor.
 
         Args:
             parent: Parent Widget
+            stateStore: shared pyG5StateStore
 
         Returns:
             self
         """
         pyG5BaseWindow.__init__(self, parent)
 
-        self.pyG5DualStacked = pyG5DualStackFMA()
+        self.pyG5DualStacked = pyG5DualStackFMA(stateStore=stateStore)
 
         self.setCentralWidget(self.pyG5DualStacked)
 
@@ -315,18 +530,19 @@ class pyG5SecondWindow(pyG5BaseWindow):
 
     closed = Signal()
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, stateStore=None):
         """g5Widget Constructor.
 
         Args:
             parent: Parent Widget
+            stateStore: shared pyG5StateStore
 
         Returns:
             self
         """
         pyG5BaseWindow.__init__(self, parent)
 
-        self.cWidget = pyG5SecondaryWidget()
+        self.cWidget = pyG5SecondaryWidget(stateStore=stateStore)
 
         self.setCentralWidget(self.cWidget)
 
@@ -48,7 +48,8 @@ class pyG5NetWorkManager(QObject):
         self.xpHost = None
         # list the datarefs to request
         self.datarefs = [
-            # ( dataref, frequency, unit, description, num decimals to display in formatted output )
+            # ( dataref, frequency, unit, description, num decimals to display in formatted output, state field, [filter] )
+            # filter is ("lowpass", time constant in s) or ("alphabeta", alpha, beta)
             (
                 "sim/cockpit/radios/nav1_dme_dist_m",
                 30,
@@ -329,6 +330,7 @@ class pyG5NetWorkManager(QObject):
                 "NAV1 Vertical deviation in dots",
                 0,
                 "_nav1gs",
+                ("lowpass", 0.2),
             ),
             (
                 "sim/cockpit/radios/nav2_vdef_dot",
@@ -337,6 +339,7 @@ class pyG5NetWorkManager(QObject):
                 "NAV2 Vertical deviation in dots",
                 0,
                 "_nav2gs",
+                ("lowpass", 0.2),
             ),
             (
                 "sim/cockpit/radios/gps_vdef_dot",
@@ -345,6 +348,7 @@ class pyG5NetWorkManager(QObject):
                 "GPS Vertical deviation in dots",
                 0,
                 "_gpsgs",
+                ("lowpass", 0.2),
             ),
             (
                 "sim/cockpit/radios/nav1_CDI",
@@ -369,6 +373,7 @@ class pyG5NetWorkManager(QObject):
                 "GPS CRS",
                 0,
                 "_kiasDelta",
+                ("alphabeta", 0.3, 0.02),
             ),
             (
                 "sim/cockpit2/radios/actuators/HSI_source_select_pilot",
@@ -441,6 +446,7 @@ class pyG5NetWorkManager(QObject):
                 "NAV1 VOR coursedeflection",
                 0,
                 "_nav1dft",
+                ("lowpass", 0.2),
             ),
             (
                 "sim/cockpit/radios/nav2_hdef_dot",
@@ -449,6 +455,7 @@ class pyG5NetWorkManager(QObject):
                 "NAV1 VOR course deflection",
                 0,
                 "_nav2dft",
+                ("lowpass", 0.2),
             ),
             (
                 "sim/cockpit/radios/gps_hdef_dot",
@@ -457,6 +464,7 @@ class pyG5NetWorkManager(QObject):
                 "GPS course deflection",
                 0,
                 "_gpsdft",
+                ("lowpass", 0.2),
             ),
             (
                 "sim/flightmodel/position/magnetic_variation",
@@ -585,6 +593,7 @@ class pyG5NetWorkManager(QObject):
                 "Slip angle",
                 0,
                 "_slip",
+                ("lowpass", 0.25),
             ),
             (
                 "sim/cockpit2/gauges/indicators/turn_rate_heading_deg_pilot",
@@ -593,6 +602,7 @@ class pyG5NetWorkManager(QObject):
                 "Turn Rate",
                 0,
                 "_turnRate",
+                ("alphabeta", 0.4, 0.05),
             ),
             (
                 "sim/flightmodel/position/vh_ind_fpm",
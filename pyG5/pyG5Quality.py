@@ -0,0 +1,269 @@
+"""
+Created on 19 Oct 2026.
+
+@author: Ben Lauret
+"""
+
+import logging
+import time
+from collections import deque
+from functools import partial
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QFont
+
+"""Rendering quality tiers, highest first.
+
+    name: tier name
+    antialiasing: antialiased lines and shapes
+    textAntialiasing: antialiased text
+    smoothLayers: bilinear filtering of the rotated and scaled layers
+    gradients: gradient sky, ground and slip ball, flat colors otherwise
+    hinting: QFont.HintingPreference of the fonts
+    minorTicks: minor ticks of the scales, the major ones only otherwise
+"""
+qualityTiers = [
+    {
+        "name": "high",
+        "antialiasing": True,
+        "textAntialiasing": True,
+        "smoothLayers": True,
+        "gradients": True,
+        "hinting": QFont.HintingPreference.PreferDefaultHinting,
+        "minorTicks": True,
+    },
+    {
+        "name": "normal",
+        "antialiasing": False,
+        "textAntialiasing": True,
+        "smoothLayers": True,
+        "gradients": True,
+        "hinting": QFont.HintingPreference.PreferDefaultHinting,
+        "minorTicks": True,
+    },
+    {
+        "name": "reduced",
+        "antialiasing": False,
+        "textAntialiasing": True,
+        "smoothLayers": False,
+        "gradients": False,
+        "hinting": QFont.HintingPreference.PreferFullHinting,
+        "minorTicks": True,
+    },
+    {
+        "name": "low",
+        "antialiasing": False,
+        "textAntialiasing": False,
+        "smoothLayers": False,
+        "gradients": False,
+        "hinting": QFont.HintingPreference.PreferFullHinting,
+        "minorTicks": False,
+    },
+]
+
+"""tier of the widgets until set otherwise"""
+defaultQualityTier = "normal"
+
+"""internal resolution scales of the AI and HSI back buffer, native first"""
+renderScales = [1.0, 0.75, 0.5]
+
+"""widget pixels spanning a whole number of back buffer pixels at every scale"""
+renderScaleGrid = 4
+
+
+def qualityTier(name):
+    """Return a quality tier by name.
+
+    Args:
+        name: tier name
+
+    Returns:
+        qualityTiers dictionary
+    """
+    for tier in qualityTiers:
+        if tier["name"] == name:
+            return tier
+
+    raise ValueError("Unknown quality tier {}".format(name))
+
+
+class pyG5QualityGovernor(QObject):
+    """pyG5QualityGovernor Object.
+
+    Step the quality tier of the instruments to hold their frame rate. The
+    paint times of each instrument are averaged over a rolling window: the
+    tier steps down when the average exceeds the instrument budget, a share
+    of its frame period, and back up towards its ceiling tier while the
+    average stays under a fraction of the budget.
+
+    Past the lowest tier, an instrument allowed to steps down its internal
+    resolution scale, rendering into a reduced back buffer upscaled on
+    present. Stepping up restores the native resolution before the tiers.
+
+    After a change the window restarts and the step is held for a while,
+    so a step is judged on its own paint times and does not oscillate.
+
+    Args:
+        load: share of its frame period an instrument may spend painting
+        window: number of paint times averaged
+        hold: minimum time between two changes of a tier in s
+        parent: QObject
+
+    Returns:
+        self
+    """
+
+    """widget, previous tier name, new tier name"""
+    tierChanged = Signal(object, str, str)
+
+    """widget, previous render scale, new render scale"""
+    renderScaleChanged = Signal(object, float, float)
+
+    """the tier steps up when the average is under this share of the budget"""
+    stepUpShare = 0.5
+
+    def __init__(self, load=0.5, window=30, hold=2.0, parent=None):
+        """Object constructor.
+
+        Args:
+            load: share of its frame period an instrument may spend painting
+            window: number of paint times averaged
+            hold: minimum time between two changes of a tier in s
+            parent: QObject
+
+        Returns:
+            self
+        """
+        QObject.__init__(self, parent)
+
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.load = load
+        self.window = window
+        self.hold = hold
+
+        # widget: [budget in s, (tier name, render scale) steps, ceiling
+        # step index, paint times, last change]
+        self.widgets = {}
+
+        # widget: step changes since the last takeStats()
+        self.changes = {}
+
+    def addWidget(self, widget, period, minScale=1.0):
+        """Govern the quality tier and render scale of a widget.
+
+        The tier and scale the widget has when added are the highest ones it
+        steps up to.
+
+        Args:
+            widget: pyG5Widget
+            period: minimum period between repaints of the widget in s
+            minScale: lowest renderScales scale, 1 keeps the native resolution
+
+        Returns:
+            None
+        """
+        lowest = qualityTiers[-1]["name"]
+        steps = [(tier["name"], 1.0) for tier in qualityTiers] + [
+            (lowest, scale) for scale in renderScales[1:] if scale >= minScale
+        ]
+        self.widgets[widget] = [
+            self.load * period,
+            steps,
+            steps.index(self.step(widget)),
+            deque(maxlen=self.window),
+            0,
+        ]
+        self.changes[widget] = 0
+
+        widget.paintTimed.connect(partial(self.paintTimed, widget))
+
+    def step(self, widget):
+        """Return the step a widget is rendered at.
+
+        Args:
+            widget: pyG5Widget
+
+        Returns:
+            (tier name, render scale)
+        """
+        return (widget.quality["name"], widget.renderScale)
+
+    def paintTimed(self, widget, seconds):
+        """Record the paint time of a widget and step it if needed.
+
+        Args:
+            widget: pyG5Widget painted
+            seconds: paint time in s
+
+        Returns:
+            None
+        """
+        budget, steps, ceiling, times, lastChange = self.widgets[widget]
+        times.append(seconds)
+
+        now = time.monotonic()
+        if len(times) < self.window or now - lastChange < self.hold:
+            return
+
+        mean = sum(times) / len(times)
+        index = steps.index(self.step(widget))
+        if mean > budget and index < len(steps) - 1:
+            self.setStep(widget, index + 1, mean, now)
+        elif mean < self.stepUpShare * budget and index > ceiling:
+            self.setStep(widget, index - 1, mean, now)
+
+    def setStep(self, widget, index, mean, now):
+        """Change the quality tier or the render scale of a widget.
+
+        Args:
+            widget: pyG5Widget
+            index: index of the new step of the widget
+            mean: average paint time that triggered the change in s
+            now: time.monotonic() time of the change
+
+        Returns:
+            None
+        """
+        previousTier, previousScale = self.step(widget)
+        tier, scale = self.widgets[widget][1][index]
+        self.logger.info(
+            "{} quality {} at {:.0%} -> {} at {:.0%}, painting in {:.1f} ms "
+            "for a {:.1f} ms budget".format(
+                widget.__class__.__name__,
+                previousTier,
+                previousScale,
+                tier,
+                scale,
+                1000 * mean,
+                1000 * self.widgets[widget][0],
+            )
+        )
+
+        if tier != previousTier:
+            widget.setQuality(tier)
+        if scale != previousScale:
+            widget.setRenderScale(scale)
+        self.widgets[widget][3].clear()
+        self.widgets[widget][4] = now
+        self.changes[widget] += 1
+
+        if tier != previousTier:
+            self.tierChanged.emit(widget, previousTier, tier)
+        if scale != previousScale:
+            self.renderScaleChanged.emit(widget, previousScale, scale)
+
+    def takeStats(self):
+        """Return the step of each widget and its changes since the last call.
+
+        Returns:
+            dictionary of widget class name: (tier name, render scale, changes)
+        """
+        stats = {
+            widget.__class__.__name__: (*self.step(widget), self.changes[widget])
+            for widget in self.widgets
+        }
+        for widget in self.changes:
+            self.changes[widget] = 0
+
+        return stats
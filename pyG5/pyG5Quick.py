@@ -0,0 +1,673 @@
+"""
+Created on 19 Oct 2026.
+
+@author: Ben Lauret
+"""
+
+import logging
+import time
+
+from contextlib import contextmanager
+from functools import partial
+
+from PySide6.QtCore import QRect, QRectF, QSizeF, Qt, QTimer
+from PySide6.QtGui import QColor, QImage, QMatrix4x4, QPainter, QPaintEvent, QRegion
+from PySide6.QtQuick import (
+    QQuickItem,
+    QQuickWindow,
+    QSGClipNode,
+    QSGGeometry,
+    QSGNode,
+    QSGSimpleRectNode,
+    QSGSimpleTextureNode,
+    QSGTexture,
+    QSGTransformNode,
+)
+
+from pyG5.pyG5View import (
+    compassLabels,
+    g5CenterX,
+    g5CenterY,
+    g5Diag,
+    g5Height,
+    g5Width,
+    imagePainter,
+    mstokt,
+    pyG5AIWidget,
+    pyG5HSIWidget,
+    tapeBackgroundColor,
+)
+
+
+class pyG5QuickItem(QQuickItem):
+    """pyG5QuickItem Object.
+
+    Draw an instrument with a retained Qt Quick scene graph. The layers and
+    tape tiles the widget renders once are uploaded as textures and only
+    moved by the nodes, the readouts being painted by the widget into an
+    overlay texture for the areas whose displayed values changed.
+
+    The widget is not shown, it holds the artwork of the scene graph.
+    updatePolish() runs on the GUI thread and prepares the node values and
+    images, updatePaintNode() applies them on the render thread.
+
+    Args:
+        widget: pyG5Widget drawn
+        parent: QQuickItem
+
+    Returns:
+        self
+    """
+
+    """(QRect, function of the widget returning the values displayed in the
+    area), the overlay area is painted again when the values change"""
+    overlayAreas = ()
+
+    def __init__(self, widget, parent=None):
+        """Object constructor.
+
+        Args:
+            widget: pyG5Widget drawn
+            parent: QQuickItem
+
+        Returns:
+            self
+        """
+        QQuickItem.__init__(self, parent)
+
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.setFlag(QQuickItem.Flag.ItemHasContents, True)
+        self.setClip(True)
+        self.setSize(QSizeF(widget.size()))
+
+        self.widget = widget
+        self.widget.sceneGraphLayers = True
+
+        # node name: image of its texture and key the image was rendered
+        # for, and the names of the images to upload on the next sync
+        self.images = {}
+        self.textureKeys = {}
+        self.changedImages = set()
+
+        # node values prepared for the next sync
+        self.frame = {}
+
+        # node name: QSGNode, the nodes are deleted with their reference
+        self.nodes = {}
+
+        self.overlay = None
+        self.overlayKeys = [None] * len(self.overlayAreas)
+        self.scratch = QImage(1, 1, QImage.Format.Format_ARGB32_Premultiplied)
+
+        # the trends keep changing without new samples, a frame is prepared
+        # at the widget rate until they settle
+        self.trendTimer = QTimer(self)
+        self.trendTimer.setSingleShot(True)
+        self.trendTimer.setInterval(round(1000 / self.widget.frameRate))
+        self.trendTimer.timeout.connect(self.polish)
+        self.trendTimer.timeout.connect(self.update)
+
+        self.widget.stateStore.subscribe(self.stateChanged, self.widget.stateFields)
+        self.polish()
+
+    def stateChanged(self, changed):
+        """Prepare a frame when the state drawn changes.
+
+        Args:
+            changed: set of changed field names
+
+        Returns:
+            None
+        """
+        self.polish()
+        self.update()
+
+    @contextmanager
+    def painting(self):
+        """Context manager giving the widget a painter to render its artwork."""
+        self.widget.qp = QPainter(self.scratch)
+        self.widget.qp.setFont(self.widget.font())
+        try:
+            yield self.widget
+        finally:
+            self.widget.qp.end()
+
+    def texture(self, name, key, render):
+        """Render the image of a node texture if its key changed.
+
+        Args:
+            name: node name
+            key: value compared with the key of the current image
+            render: function returning the QImage
+
+        Returns:
+            None
+        """
+        if name not in self.textureKeys or self.textureKeys[name] != key:
+            self.textureKeys[name] = key
+            self.images[name] = render()
+            self.changedImages.add(name)
+
+    def layer(self, name, rect, paint, fill=Qt.GlobalColor.transparent, key=()):
+        """Use a layer of the widget artwork as a node texture.
+
+        Args:
+            name: node name
+            rect: QRectF covering the layer, in the node coordinates
+            paint: function painting the layer
+            fill: layer background
+            key: state the layer depends on, rendered again when it changes
+
+        Returns:
+            None
+        """
+        self.texture(
+            name,
+            (self.widget.quality["name"], key),
+            lambda: self.widget.renderLayer(rect, paint, fill),
+        )
+        self.frame[name] = rect
+
+    def tape(self, name, tiles):
+        """Use the tiles of a tape as the textures of its nodes.
+
+        Args:
+            name: tape name, the tile nodes are numbered after it
+            tiles: pyG5Widget.tapeTiles() list
+
+        Returns:
+            None
+        """
+        for index, (key, position, tile) in enumerate(tiles):
+            tileName = "{}{}".format(name, index)
+            self.texture(tileName, key, lambda tile=tile: tile)
+            self.frame[tileName] = QRectF(position, tile.deviceIndependentSize())
+        self.frame[name] = len(tiles)
+
+    def updateOverlay(self):
+        """Paint the overlay areas whose displayed values changed."""
+        region = QRegion()
+        for index, (area, key) in enumerate(self.overlayAreas):
+            value = key(self.widget)
+            if value != self.overlayKeys[index]:
+                self.overlayKeys[index] = value
+                region |= area
+
+        if self.overlay is None:
+            dpr = self.widget.devicePixelRatioF()
+            self.overlay = QImage(
+                (self.size() * dpr).toSize(), QImage.Format.Format_ARGB32_Premultiplied
+            )
+            self.overlay.setDevicePixelRatio(dpr)
+            region = QRegion(self.widget.rect())
+        elif region.isEmpty():
+            return
+
+        self.widget.renderPainter = imagePainter(
+            self.overlay, region, QColor(Qt.GlobalColor.transparent)
+        )
+        try:
+            self.widget.paintEvent(QPaintEvent(region))
+        finally:
+            self.widget.renderPainter = None
+
+        # a shared copy would lose the system clip of the next paint
+        self.images["overlay"] = self.overlay.copy()
+        self.changedImages.add("overlay")
+
+    def updatePolish(self):
+        """Prepare the node values and images, on the GUI thread."""
+        with self.painting():
+            self.prepare()
+        self.frame["visible"] = bool(self.widget.value("avionicson"))
+
+        self.updateOverlay()
+
+        if self.widget.unsettledTrends(time.monotonic()):
+            self.trendTimer.start()
+
+    def updatePaintNode(self, node, data):
+        """Build the scene graph once and apply the prepared frame to it.
+
+        Args:
+            node: QSGNode returned by the last call, None to build it
+            data: QQuickItem.UpdatePaintNodeData
+
+        Returns:
+            QSGNode
+        """
+        if node is None:
+            # the textures are lost with the previous scene graph
+            self.changedImages.update(self.images)
+
+            node = QSGNode()
+            self.nodes = {}
+            # the software renderer loses the item position of the moving
+            # transform nodes not nested in another transform node
+            self.addNode(node, "below", QSGTransformNode())
+            self.textureNode(node, "overlay")
+            self.addNode(node, "above", QSGTransformNode())
+            self.buildNodes(self.nodes["below"], self.nodes["above"])
+
+        # the overlay is opaque when the avionics are off, hiding the nodes
+        # below it while the scene graph keeps its structure
+        self.nodes["overlay"].setRect(QRectF(0, 0, g5Width, g5Height))
+
+        self.updateNodes()
+
+        # the texture of a node replaces and deletes the previous one
+        window = self.window()
+        for name in list(self.changedImages):
+            if name in self.nodes:
+                self.nodes[name].setTexture(
+                    window.createTextureFromImage(self.images[name])
+                )
+                self.changedImages.discard(name)
+
+        return node
+
+    def addNode(self, parent, name, node):
+        """Append a named node to a parent node.
+
+        Args:
+            parent: QSGNode
+            name: node name
+            node: QSGNode
+
+        Returns:
+            node
+        """
+        # the Python reference owns the node
+        node.setFlag(QSGNode.Flag.OwnedByParent, False)
+        parent.appendChildNode(node)
+        self.nodes[name] = node
+
+        return node
+
+    def textureNode(self, parent, name):
+        """Append a node drawing a texture prepared under its name.
+
+        Args:
+            parent: QSGNode
+            name: node name
+
+        Returns:
+            QSGSimpleTextureNode
+        """
+        node = QSGSimpleTextureNode()
+        node.setOwnsTexture(True)
+        node.setFiltering(QSGTexture.Filtering.Linear)
+        if name in self.frame:
+            node.setRect(self.frame[name])
+
+        return self.addNode(parent, name, node)
+
+    def rectNode(self, parent, name, color):
+        """Append a node filling a rectangle with a color.
+
+        Args:
+            parent: QSGNode
+            name: node name
+            color: QColor
+
+        Returns:
+            QSGSimpleRectNode
+        """
+        return self.addNode(parent, name, QSGSimpleRectNode(QRectF(), QColor(color)))
+
+    def clipNode(self, parent, name, rect):
+        """Append a node clipping its children to a rectangle.
+
+        Args:
+            parent: QSGNode
+            name: node name
+            rect: QRectF
+
+        Returns:
+            QSGClipNode
+        """
+        node = QSGClipNode()
+        node.setIsRectangular(True)
+        node.setClipRect(rect)
+
+        # the geometry is kept by the node name
+        geometry = QSGGeometry(QSGGeometry.defaultAttributes_Point2D(), 4)
+        QSGGeometry.updateRectGeometry(geometry, rect)
+        node.setGeometry(geometry)
+        self.nodes[name + "Geometry"] = geometry
+
+        return self.addNode(parent, name, node)
+
+    def updateTape(self, name):
+        """Move the tile nodes of a tape, adding the missing ones.
+
+        The tiles are drawn by the children of the node named after the
+        tape, the unused ones being emptied.
+
+        Args:
+            name: tape name
+
+        Returns:
+            None
+        """
+        index = 0
+        while True:
+            tileName = "{}{}".format(name, index)
+            if index < self.frame[name]:
+                if tileName not in self.nodes:
+                    self.textureNode(self.nodes[name], tileName)
+                self.nodes[tileName].setRect(self.frame[tileName])
+            elif tileName in self.nodes:
+                self.nodes[tileName].setRect(QRectF())
+            else:
+                break
+            index += 1
+
+    def prepare(self):
+        """Prepare the node values and images from the widget state."""
+
+    def buildNodes(self, below, above):
+        """Build the nodes drawn below and above the overlay.
+
+        Args:
+            below: QSGNode drawn below the overlay
+            above: QSGNode drawn above the overlay
+
+        Returns:
+            None
+        """
+
+    def updateNodes(self):
+        """Apply the prepared frame to the nodes."""
+
+
+class pyG5AIQuickItem(pyG5QuickItem):
+    """pyG5AIQuickItem Object.
+
+    Attitude indicator scene graph: the ground and pitch ladder move with
+    the roll and pitch transforms, the tape tiles with the speed and
+    altitude, the trend and vertical speed bars being rectangle nodes.
+
+    Args:
+        widget: pyG5AIWidget drawn
+        parent: QQuickItem
+
+    Returns:
+        self
+    """
+
+    overlayAreas = (
+        (
+            QRect(0, 0, g5Width, g5Height),
+            lambda w: (w._avionicson, w._stale),
+        ),
+        (
+            pyG5AIWidget.speedTapeArea,
+            lambda w: (int(w._kias), int(w._ktas), int(w._gs * mstokt)),
+        ),
+        (
+            pyG5AIWidget.altitudeTapeArea,
+            lambda w: (int(w._altitude), int(w._altitudeSel), w._alt_setting),
+        ),
+        (
+            pyG5AIWidget.turnCoordinatorArea,
+            lambda w: (w._turnRate, w._slip),
+        ),
+    )
+
+    def prepare(self):
+        """Prepare the node values and images from the widget state."""
+        w = self.widget
+
+        # default font of the paint event
+        w.setFontSize(6, True)
+
+        self.layer(
+            "sky", QRectF(0, 0, g5Width, g5Height), w.paintSky, Qt.GlobalColor.black
+        )
+        self.layer("ground", w.groundRect(), w.paintGround)
+        self.layer("pitchLadder", w.pitchLadderRect(), w.paintPitchLadder)
+        self.layer("rollScale", w.rollScaleRect(), w.paintRollScale)
+        self.layer("aircraftSymbol", w.aircraftSymbolRect(), w.paintAircraftSymbol)
+        self.layer("vsScale", w.vsScaleRect(), w.paintVSScale)
+
+        self.tape("speedTape", w.speedTapeTiles())
+        self.tape("altitudeTape", w.altitudeTapeTiles())
+
+        self.frame["roll"] = w._rollAngle
+        self.frame["horizon"] = w.horizon()
+        self.frame["pitchLadderWindow"] = w.pitchLadderWindow()
+        # the airspeed trend is drawn with a 1 pixel outline
+        self.frame["speedTrend"] = w.speedTrendRect().normalized().adjusted(0, 0, 1, 1)
+        self.frame["altitudeTrend"] = w.altitudeTrendRect().normalized()
+        self.frame["vs"] = w.vsRect().normalized()
+
+    def buildNodes(self, below, above):
+        """Build the nodes drawn below and above the overlay.
+
+        Args:
+            below: QSGNode drawn below the overlay
+            above: QSGNode drawn above the overlay
+
+        Returns:
+            None
+        """
+        w = self.widget
+
+        self.textureNode(below, "sky")
+
+        roll = self.addNode(below, "roll", QSGTransformNode())
+        self.textureNode(roll, "ground")
+        clip = self.clipNode(roll, "pitchLadderClip", self.frame["pitchLadderWindow"])
+        self.textureNode(clip, "pitchLadder")
+        self.textureNode(roll, "rollScale")
+
+        self.textureNode(below, "aircraftSymbol")
+
+        self.rectNode(below, "speedTapeBackground", tapeBackgroundColor).setRect(
+            w.speedTapeRect
+        )
+        self.addNode(below, "speedTape", QSGNode())
+        self.rectNode(below, "speedTrend", Qt.GlobalColor.magenta)
+
+        self.rectNode(below, "altitudeTapeBackground", tapeBackgroundColor).setRect(
+            w.altitudeTapeRect
+        )
+        self.textureNode(below, "vsScale")
+        self.rectNode(below, "vs", Qt.GlobalColor.magenta)
+        self.addNode(below, "altitudeTape", QSGNode())
+        self.rectNode(below, "altitudeTrend", Qt.GlobalColor.magenta)
+
+    def updateNodes(self):
+        """Apply the prepared frame to the nodes."""
+        frame = self.frame
+        horizon = frame["horizon"]
+
+        matrix = QMatrix4x4()
+        matrix.translate(g5CenterX, g5CenterY)
+        matrix.rotate(-frame["roll"], 0, 0, 1)
+        self.nodes["roll"].setMatrix(matrix)
+
+        # the ground texture spans the widget diagonal so it covers the
+        # widget at any roll angle
+        self.nodes["ground"].setRect(
+            QRectF(-g5Diag / 2, horizon, g5Diag, frame["ground"].height())
+        )
+        self.nodes["pitchLadder"].setRect(frame["pitchLadder"].translated(0, horizon))
+
+        self.updateTape("speedTape")
+        self.updateTape("altitudeTape")
+
+        self.nodes["speedTrend"].setRect(frame["speedTrend"])
+        self.nodes["altitudeTrend"].setRect(frame["altitudeTrend"])
+        self.nodes["vs"].setRect(frame["vs"])
+
+
+class pyG5HSIQuickItem(pyG5QuickItem):
+    """pyG5HSIQuickItem Object.
+
+    Horizontal situation indicator scene graph: the compass card, the
+    heading bug and the navigation pointers rotate with the heading, the
+    labels are upright sprites moved along the card.
+
+    Args:
+        widget: pyG5HSIWidget drawn
+        parent: QQuickItem
+
+    Returns:
+        self
+    """
+
+    """fields drawn by the nodes only"""
+    nodeFields = ("magHeading", "groundTrack", "nav1bearing", "nav2bearing")
+
+    overlayAreas = (
+        (
+            QRect(0, 0, g5Width, g5Height),
+            lambda w: (w._stale,)
+            + tuple(
+                w.value(name)
+                for name in w.stateFields
+                if name not in pyG5HSIQuickItem.nodeFields
+            ),
+        ),
+        (
+            pyG5HSIWidget.windArea,
+            lambda w: (w._windDirection - w._magHeading,) + w.derived("wind"),
+        ),
+        (
+            QRect(int(g5CenterX) - 26, 0, 52, 32),
+            lambda w: int(w._magHeading),
+        ),
+        (
+            # the 6 seconds heading trend arc
+            QRect(70, 20, 340, 175),
+            lambda w: int(max(min(w.trend("magHeading", w._turnRate), 90), -90) * 16),
+        ),
+    )
+
+    def prepare(self):
+        """Prepare the node values and images from the widget state."""
+        w = self.widget
+
+        # default font of the paint event, the labels are rendered with
+        w.setFontSize(20, True)
+
+        # in the compass center coordinates
+        self.layer(
+            "hsiFrame",
+            QRectF(-g5CenterX, -w.hsiCenter, g5Width, g5Height),
+            w.paintHSIFrame,
+            Qt.GlobalColor.black,
+        )
+        self.layer("compassCard", QRectF(-162, -162, 324, 324), w.paintCompassCard)
+
+        fontSize = w.qp.font().pixelSize()
+        labelRect = QRectF(-fontSize / 2 - 3, -fontSize / 2, fontSize + 6, fontSize)
+        for heading, text in compassLabels:
+            name = "compassLabel{}".format(heading)
+            self.layer(name, labelRect, partial(w.paintCompassLabel, labelRect, text))
+            self.frame[name] = labelRect.translated(*w.compassLabelOffset(heading))
+
+        # the pointers move with the card, rendered heading up
+        self.layer(
+            "cardPointers",
+            QRectF(w.cardArea).translated(-g5CenterX, -w.hsiCenter),
+            w.paintCardPointers,
+            key=(
+                w._headingBug,
+                w._nav1fromto,
+                w._nav1bearing,
+                w._nav2fromto,
+                w._nav2bearing,
+                w.derived("navSource"),
+            ),
+        )
+
+        self.layer("groundTrack", QRectF(-10, -170, 20, 172), w.paintGroundTrack)
+        self.layer("aircraft", QRectF(213, 161, 54, 58), w.paintAircraft)
+
+        self.frame["heading"] = w._magHeading
+        self.frame["track"] = w._groundTrack
+
+    def buildNodes(self, below, above):
+        """Build the nodes drawn below and above the overlay.
+
+        Args:
+            below: QSGNode drawn below the overlay
+            above: QSGNode drawn above the overlay
+
+        Returns:
+            None
+        """
+        center = self.addNode(below, "center", QSGTransformNode())
+        matrix = QMatrix4x4()
+        matrix.translate(g5CenterX, self.widget.hsiCenter)
+        center.setMatrix(matrix)
+
+        self.textureNode(center, "hsiFrame")
+        card = self.addNode(center, "card", QSGTransformNode())
+        self.textureNode(card, "compassCard")
+        for heading, _ in compassLabels:
+            self.textureNode(center, "compassLabel{}".format(heading))
+        pointers = self.addNode(center, "pointers", QSGTransformNode())
+        self.textureNode(pointers, "cardPointers")
+
+        self.addNode(above, "track", QSGTransformNode())
+        self.textureNode(self.nodes["track"], "groundTrack")
+        self.textureNode(above, "aircraft")
+
+    def updateNodes(self):
+        """Apply the prepared frame to the nodes."""
+        frame = self.frame
+
+        matrix = QMatrix4x4()
+        matrix.rotate(-frame["heading"], 0, 0, 1)
+        self.nodes["card"].setMatrix(matrix)
+        self.nodes["pointers"].setMatrix(matrix)
+
+        for heading, _ in compassLabels:
+            name = "compassLabel{}".format(heading)
+            self.nodes[name].setRect(frame[name])
+
+        matrix = QMatrix4x4()
+        matrix.translate(g5CenterX, self.widget.hsiCenter)
+        matrix.rotate(frame["track"] - frame["heading"], 0, 0, 1)
+        self.nodes["track"].setMatrix(matrix)
+
+        # the nodes above the overlay are emptied when the avionics are off
+        for name in ("groundTrack", "aircraft"):
+            self.nodes[name].setRect(frame[name] if frame["visible"] else QRectF())
+
+
+class pyG5QuickStack(QQuickWindow):
+    """pyG5QuickStack Object.
+
+    Qt Quick window drawing the AI above the HSI with retained scene graphs.
+
+    Args:
+        ai: pyG5AIWidget artwork of the attitude indicator
+        hsi: pyG5HSIWidget artwork of the horizontal situation indicator
+
+    Returns:
+        self
+    """
+
+    def __init__(self, ai, hsi):
+        """Object constructor.
+
+        Args:
+            ai: pyG5AIWidget artwork of the attitude indicator
+            hsi: pyG5HSIWidget artwork of the horizontal situation indicator
+
+        Returns:
+            self
+        """
+        QQuickWindow.__init__(self)
+
+        self.setColor(QColor(Qt.GlobalColor.black))
+
+        self.aiItem = pyG5AIQuickItem(ai, self.contentItem())
+        self.hsiItem = pyG5HSIQuickItem(hsi, self.contentItem())
+        self.hsiItem.setY(g5Height)
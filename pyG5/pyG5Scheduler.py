@@ -0,0 +1,200 @@
+"""
+Created on 19 Oct 2026.
+
+@author: Ben Lauret
+"""
+
+import logging
+import time
+from math import ceil
+
+from PySide6.QtCore import QObject, Qt, QTimer
+from PySide6.QtGui import QGuiApplication
+
+
+class pyG5FrameScheduler(QObject):
+    """pyG5FrameScheduler Object.
+
+    Prepare the frames and repaint the instruments only when needed. The
+    scheduler sleeps until the state store starts animating the displayed
+    values or a widget becomes dirty, then ticks until both settle and the
+    trends drawn stop changing.
+
+    The frame period is a whole number of display refresh periods, the
+    shortest one within the maximum frame rate. Each widget is repainted
+    at its own target rate, its dirty regions accumulating in between.
+
+    The due widgets are repainted in priority order. Once the frame budget
+    is spent the next ones are deferred to the following frame, unless
+    they were already deferred for a whole period of their own.
+
+    Args:
+        stateStore: pyG5StateStore the frames are prepared from
+        fps: maximum number of frames per second
+        parent: QObject
+
+    Returns:
+        self
+    """
+
+    def __init__(self, stateStore, fps=60, parent=None):
+        """Object constructor.
+
+        Args:
+            stateStore: pyG5StateStore the frames are prepared from
+            fps: maximum number of frames per second
+            parent: QObject
+
+        Returns:
+            self
+        """
+        QObject.__init__(self, parent)
+
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.stateStore = stateStore
+        self.stateStore.frameRequested.connect(self.requestFrame)
+
+        self.period = self.framePeriod(fps)
+        self.logger.info("Frame period {:.1f} ms".format(1000 * self.period))
+
+        # painting time available in a frame
+        self.budget = self.period
+
+        # widget: [minimum period between repaints, priority, last repaint],
+        # the widgets being ordered by priority
+        self.widgets = {}
+
+        self.lastFrame = 0
+        self.nextFrame = 0
+        self.frameCount = 0
+        self.deferredCount = 0
+
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.frame)
+
+    def framePeriod(self, fps):
+        """Return the frame period aligned to the display refresh.
+
+        Args:
+            fps: maximum number of frames per second
+
+        Returns:
+            period in s
+        """
+        screen = QGuiApplication.primaryScreen()
+        refreshRate = screen.refreshRate() if screen is not None else 0
+        if refreshRate <= 0:
+            return 1 / fps
+
+        return ceil(refreshRate / fps - 1e-3) / refreshRate
+
+    def addWidget(self, widget, fps=None, priority=None):
+        """Schedule the repaints of a widget.
+
+        Args:
+            widget: pyG5Widget
+            fps: target repaints per second, widget.frameRate if None
+            priority: lowest served first, widget.framePriority if None
+
+        Returns:
+            minimum period between repaints of the widget in s
+        """
+        if fps is None:
+            fps = widget.frameRate
+        if priority is None:
+            priority = widget.framePriority
+
+        period = self.period * max(1, round(1 / (fps * self.period)))
+        self.logger.info(
+            "{} repainted at {:.1f} fps, priority {}".format(
+                widget.__class__.__name__, 1 / period, priority
+            )
+        )
+
+        self.widgets[widget] = [period, priority, 0]
+        self.widgets = dict(sorted(self.widgets.items(), key=lambda item: item[1][1]))
+
+        widget.frameRequested.connect(self.requestFrame)
+        if widget.isDirty():
+            self.requestFrame()
+
+        return period
+
+    def requestFrame(self):
+        """Schedule the next frame as soon as the frame rate allows."""
+        frameTime = self.lastFrame + self.period
+        if not self.timer.isActive() or self.nextFrame > frameTime:
+            self.scheduleFrame(frameTime)
+
+    def scheduleFrame(self, frameTime):
+        """Start the timer of the next frame.
+
+        Args:
+            frameTime: time.monotonic() time of the frame
+
+        Returns:
+            None
+        """
+        self.nextFrame = max(frameTime, self.lastFrame + self.period)
+        self.timer.start(max(0, round(1000 * (self.nextFrame - time.monotonic()))))
+
+    def frame(self):
+        """Prepare a frame and repaint the dirty widgets due for a repaint."""
+        now = time.monotonic()
+        self.lastFrame = now
+        self.frameCount += 1
+
+        self.stateStore.prepareFrame(now)
+
+        # time of the next frame needed by a dirty widget
+        dueFrame = None
+        for widget, (period, priority, lastRepaint) in self.widgets.items():
+            # the trends keep changing without new samples, a widget last
+            # repainted before they settled draws them again
+            unsettled = widget.unsettledTrends(lastRepaint)
+            if unsettled:
+                widget.stateChanged(unsettled)
+
+            if not widget.isDirty():
+                continue
+
+            # half a frame of slack absorbs the timer jitter
+            due = lastRepaint + period - self.period / 2
+            if now < due:
+                dueFrame = due if dueFrame is None else min(dueFrame, due)
+                continue
+
+            if time.monotonic() - now > self.budget and now - due < period:
+                self.deferredCount += 1
+                dueFrame = now
+                continue
+
+            widget.repaintIfDirty()
+            self.widgets[widget][2] = now
+
+            if widget.unsettledTrends(now):
+                due = now + period - self.period / 2
+                dueFrame = due if dueFrame is None else min(dueFrame, due)
+
+        # the widgets dirtied by this frame were repainted already
+        if self.stateStore.isAnimating(now):
+            self.scheduleFrame(now)
+        elif dueFrame is not None:
+            self.scheduleFrame(dueFrame)
+        else:
+            self.timer.stop()
+
+    def takeStats(self):
+        """Return the frames and deferred repaints since the last call.
+
+        Returns:
+            (frame count, deferred repaint count)
+        """
+        stats = (self.frameCount, self.deferredCount)
+        self.frameCount = 0
+        self.deferredCount = 0
+
+        return stats
@@ -0,0 +1,799 @@
+"""
+Created on 19 Oct 2026.
+
+@author: Ben Lauret
+"""
+
+import logging
+import os
+import struct
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from PySide6.QtCore import QObject, Signal, Slot
+
+
+"""property name, default value"""
+stateProperties = [
+    ("altitudeHold", 0),
+    ("altitudeVNAV", 0),
+    ("navSrc", 0),
+    ("apAltitude", 0),
+    ("apVS", 0),
+    ("apAirSpeed", 0),
+    ("apState", 0),
+    ("apMode", 0),
+    ("fuelPress", 0),
+    ("lowVolts", 0),
+    ("oilPres", 0),
+    ("parkBrake", 0),
+    ("lowVacuum", 0),
+    ("lowFuel", 0),
+    ("fuelSel", 4),
+    ("xpdrMode", 0),
+    ("xpdrCode", 5470),
+    ("trims", 0),
+    ("flaps", 0),
+    ("fuelpump", 0),
+    ("carbheat", 0),
+    ("gpsdmedist", 0),
+    ("gpshsisens", 0),
+    ("nav1type", 0),
+    ("nav2type", 0),
+    ("gpstype", 0),
+    ("avionicson", 1),
+    ("hsiSource", 0),
+    ("nav1fromto", 0),
+    ("nav2fromto", 0),
+    ("gpsfromto", 0),
+    ("nav1crs", 0),
+    ("nav1gsavailable", 0),
+    ("nav1gs", 0),
+    ("nav2crs", 0),
+    ("gpscrs", 0),
+    ("nav2gsavailable", 0),
+    ("nav2gs", 0),
+    ("nav1dft", 0),
+    ("nav2dft", 0),
+    ("nav1bearing", 0),
+    ("nav2bearing", 0),
+    ("nav1dme", 0),
+    ("nav2dme", 0),
+    ("gpsdft", 0),
+    ("gpsgsavailable", 0),
+    ("gpsvnavavailable", 0),
+    ("gpsgs", 0),
+    ("groundTrack", 0),
+    ("magHeading", 0),
+    ("windDirection", 0),
+    ("windSpeed", 0),
+    ("rollAngle", 0),
+    ("pitchAngle", 0),
+    ("gs", 0),
+    ("kias", 0),
+    ("kiasDelta", 0),
+    ("ktas", 0),
+    ("altitude", 0),
+    ("altitudeSel", 0),
+    ("alt_setting", 1013),
+    ("alt_setting_metric", 1),
+    ("vh_ind_fpm", 0),
+    ("turnRate", 0),
+    ("slip", 0),
+    ("headingBug", 0),
+    ("vs", 30),
+    ("vs0", 23),
+    ("vfe", 88),
+    ("vno", 118),
+    ("vne", 127),
+    # set while displaying the snapshot of the last session
+    ("stale", 0),
+]
+
+snapshotMagic = b"PYG5"
+snapshotVersion = 1
+
+
+"""field name: (rate field name, rate scale to units per second)"""
+deadReckoningFields = {
+    "magHeading": ("turnRate", 1.0),
+    "altitude": ("vh_ind_fpm", 1 / 60),
+    "kias": ("kiasDelta", 1.0),
+}
+
+"""fields interpolated between the last two received samples"""
+interpolatedFields = [
+    "rollAngle",
+    "pitchAngle",
+    "slip",
+]
+
+"""fields wrapping around at 360 degrees"""
+headingFields = [
+    "magHeading",
+]
+
+"""fields whose recent samples are kept for the trend vectors"""
+historyFields = [
+    "kias",
+    "altitude",
+    "magHeading",
+]
+
+
+class pyG5StateStore(QObject):
+    """pyG5StateStore Object.
+
+    Single copy of the simulator state shared by all the instruments.
+    Every widget subscribes with the list of fields it reads and is
+    notified only when one of them changes value.
+
+    Incoming samples first go through a per field low-pass or alpha-beta
+    filter configured in the dataref registry. Each sample is stored with
+    its receive time. prepareFrame() computes
+    the values displayed at the frame time, interpolating the attitude
+    between the last two samples and dead reckoning heading, altitude and
+    speed with their rate of change.
+
+    Values derived from several fields are registered with addDerived()
+    and recomputed only when one of their inputs changed.
+
+    Changes made between begin() and commit(), or within a transaction()
+    block, are notified once on commit.
+
+    The state can be saved to a binary snapshot and reloaded at startup
+    so the instruments show the last known state, flagged stale until
+    the simulator data arrives.
+
+    The displayed values keep moving for a short while after a sample is
+    received. frameRequested is emitted when this starts so frames are only
+    prepared while isAnimating().
+
+    Args:
+        parent: Parent object
+
+    Returns:
+        self
+    """
+
+    frameRequested = Signal()
+
+    def __init__(self, parent=None):
+        """Object constructor.
+
+        Args:
+            parent: Parent object
+
+        Returns:
+            self
+        """
+        QObject.__init__(self, parent)
+
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.names = [prop[0] for prop in stateProperties]
+        self.index = {name: idx for idx, name in enumerate(self.names)}
+
+        # last received sample and its receive time
+        self.values = np.array([prop[1] for prop in stateProperties], dtype=float)
+        self.stamps = np.full(len(self.names), time.monotonic())
+
+        # previous sample used for the interpolation
+        self.prevValues = self.values.copy()
+        self.prevStamps = self.stamps.copy()
+
+        # values at the frame time, read by the paint code
+        self.display = self.values.copy()
+
+        # render the interpolated fields one sample period in the past
+        self.interpolationDelay = 1 / 30
+        # never project a sample further than this in the future
+        self.maxExtrapolation = 0.1
+        # time until which prepareFrame() may change the displayed values
+        self.animatedUntil = 0
+
+        self.deadReckoningIdx = np.array(
+            [self.index[name] for name in deadReckoningFields], dtype=int
+        )
+        self.deadReckoningRateIdx = np.array(
+            [self.index[rate[0]] for rate in deadReckoningFields.values()], dtype=int
+        )
+        self.deadReckoningScale = np.array(
+            [rate[1] for rate in deadReckoningFields.values()]
+        )
+        self.interpolatedIdx = np.array(
+            [self.index[name] for name in interpolatedFields], dtype=int
+        )
+        self.headingIdx = np.array(
+            [self.index[name] for name in headingFields], dtype=int
+        )
+
+        # per field filter, pass through by default
+        # lowpass when filterTau > 0, alpha-beta tracker otherwise
+        self.filterTau = np.zeros(len(self.names))
+        self.filterAlpha = np.ones(len(self.names))
+        self.filterBeta = np.zeros(len(self.names))
+        self.filterRate = np.zeros(len(self.names))
+        self.isHeading = np.zeros(len(self.names), dtype=bool)
+        self.isHeading[self.headingIdx] = True
+        # residual below which the filter snaps onto the sample
+        self.filterEpsilon = 1e-3
+
+        # recent samples of the trended fields
+        self.history = pyG5History(historyFields, headingFields=headingFields)
+        self.historyRows = np.full(len(self.names), -1, dtype=int)
+        for row, name in enumerate(historyFields):
+            self.historyRows[self.index[name]] = row
+
+        # list of (watched field indexes, callback)
+        self.subscribers = []
+
+        # nested transactions and the changes they hold
+        self.transactionDepth = 0
+        self.pendingChanges = set()
+
+        # derived values: name -> (input names, function), cached results
+        # and for each field the derived values depending on it
+        self.derivedFunctions = {}
+        self.derivedCache = {}
+        self.derivedDependents = [[] for name in self.names]
+
+    def setFilters(self, registry):
+        """Configure the per field filters from the dataref registry.
+
+        Args:
+            registry: list of dataref tuples, the optional 7th element being
+                ("lowpass", time constant in s) or ("alphabeta", alpha, beta)
+
+        Returns:
+            None
+        """
+        for dataref in registry:
+            if len(dataref) < 7:
+                continue
+
+            idx = self.index.get(dataref[5].lstrip("_"))
+            if idx is None:
+                continue
+
+            params = dataref[6]
+            if params[0] == "lowpass":
+                self.filterTau[idx] = params[1]
+            elif params[0] == "alphabeta":
+                self.filterTau[idx] = 0
+                self.filterAlpha[idx] = params[1]
+                self.filterBeta[idx] = params[2]
+            else:
+                self.logger.error(
+                    "unknown filter {} for {}".format(params[0], dataref[0])
+                )
+
+    def filter(self, fields, samples, now):
+        """Run the filter stage over the updated fields.
+
+        Args:
+            fields: array of field indexes
+            samples: array of received values
+            now: receive time
+
+        Returns:
+            array of filtered values
+        """
+        dt = np.clip(now - self.stamps[fields], 1e-3, 1)
+        rate = self.filterRate[fields]
+        tau = self.filterTau[fields]
+
+        predicted = self.values[fields] + rate * dt
+        residual = samples - predicted
+        heading = self.isHeading[fields]
+        residual[heading] = (residual[heading] + 180) % 360 - 180
+
+        alpha = np.where(
+            tau > 0, -np.expm1(-dt / np.maximum(tau, 1e-3)), self.filterAlpha[fields]
+        )
+        filtered = predicted + alpha * residual
+        rate += self.filterBeta[fields] * residual / dt
+
+        # snap onto the sample once settled to stop repainting for nothing
+        settled = np.abs(samples - filtered) < self.filterEpsilon
+        filtered[settled] = samples[settled]
+        rate[settled] = 0
+        filtered[heading] %= 360
+
+        self.filterRate[fields] = rate
+        return filtered
+
+    def saveSnapshot(self, path):
+        """Write the current state to a binary snapshot file.
+
+        The file holds a header, the field names and the values as
+        float64. It is written to a temporary file and moved in place.
+
+        Args:
+            path: snapshot file path
+
+        Returns:
+            None
+        """
+        names = "\0".join(self.names).encode()
+        data = struct.pack("<4sHI", snapshotMagic, snapshotVersion, len(names))
+        data += names + self.values.tobytes()
+
+        try:
+            tmpPath = path + ".tmp"
+            with open(tmpPath, "wb") as snapshot:
+                snapshot.write(data)
+            os.replace(tmpPath, path)
+        except OSError as inst:
+            self.logger.warning("Snapshot save: {}".format(inst))
+
+    def loadSnapshot(self, path):
+        """Restore the state saved by saveSnapshot and mark it stale.
+
+        Fields unknown to the snapshot keep their default value.
+
+        Args:
+            path: snapshot file path
+
+        Returns:
+            True if the snapshot was loaded
+        """
+        try:
+            with open(path, "rb") as snapshot:
+                data = snapshot.read()
+
+            headerSize = struct.calcsize("<4sHI")
+            magic, version, namesSize = struct.unpack_from("<4sHI", data)
+            if magic != snapshotMagic or version != snapshotVersion:
+                raise ValueError("unsupported snapshot format")
+
+            names = data[headerSize : headerSize + namesSize].decode().split("\0")
+            values = np.frombuffer(data, dtype=float, offset=headerSize + namesSize)
+            if len(values) != len(names):
+                raise ValueError("truncated snapshot")
+        except (OSError, ValueError, struct.error) as inst:
+            self.logger.info("Snapshot not loaded: {}".format(inst))
+            return False
+
+        for name, value in zip(names, values):
+            idx = self.index.get(name)
+            if idx is not None:
+                self.values[idx] = value
+
+        self.values[self.index["stale"]] = 1
+        self.prevValues = self.values.copy()
+        self.display = self.values.copy()
+        self.notify(set(range(len(self.names))))
+
+        self.logger.info("Snapshot loaded: {}".format(path))
+        return True
+
+    def subscribe(self, callback, fields=None):
+        """Register a callback notified when a watched field changes.
+
+        Args:
+            callback: callable receiving the set of changed field names
+            fields: iterable of field names, None to watch all of them
+
+        Returns:
+            None
+        """
+        if fields is None:
+            watched = set(range(len(self.names)))
+        else:
+            watched = {self.index[name] for name in fields}
+
+        self.subscribers.append((watched, callback))
+
+    def addDerived(self, name, inputs, function):
+        """Register a value derived from state fields.
+
+        The function is called with a dictionary of the input values the
+        first time the derived value is read after one of them changed.
+
+        Args:
+            name: derived value name
+            inputs: iterable of field names the value depends on
+            function: callable returning the derived value
+
+        Returns:
+            None
+        """
+        if name in self.derivedFunctions:
+            return
+
+        inputs = tuple(inputs)
+        self.derivedFunctions[name] = (inputs, function)
+        for field in inputs:
+            self.derivedDependents[self.index[field]].append(name)
+
+    def derived(self, name):
+        """Return a derived value, recomputing it if an input changed.
+
+        Args:
+            name: derived value name
+
+        Returns:
+            value
+        """
+        try:
+            return self.derivedCache[name]
+        except KeyError:
+            inputs, function = self.derivedFunctions[name]
+            result = function({field: self.value(field) for field in inputs})
+            self.derivedCache[name] = result
+            return result
+
+    def trend(self, name, horizon=6, duration=1):
+        """Return the change of a field expected over the horizon.
+
+        Args:
+            name: field name
+            horizon: projection time in s
+            duration: window used to measure the rate of change in s
+
+        Returns:
+            change over the horizon, nan without enough recent samples
+        """
+        return self.history.slope(name, duration) * horizon
+
+    def trendSettleTime(self, name, duration=1):
+        """Return the time the trend of a field stops changing.
+
+        Without new samples the trend still changes until its window slid
+        past the last sample of the field.
+
+        Args:
+            name: field name
+            duration: window used to measure the rate of change in s
+
+        Returns:
+            time.monotonic() time, -inf without samples
+        """
+        return self.history.lastStamp(name) + duration
+
+    def value(self, name):
+        """Return the displayed value of a field.
+
+        Args:
+            name: field name
+
+        Returns:
+            value
+        """
+        return self.display[self.index[name]]
+
+    def setValue(self, name, value):
+        """Set a single field and notify the subscribers.
+
+        The value is applied immediately, without interpolation.
+
+        Args:
+            name: field name
+            value: new value
+
+        Returns:
+            None
+        """
+        idx = self.index[name]
+        now = time.monotonic()
+        if self.historyRows[idx] >= 0:
+            self.history.append(self.historyRows[idx : idx + 1], value, now)
+        self.filterRate[idx] = 0
+        self.prevValues[idx] = value
+        self.prevStamps[idx] = now
+        self.stamps[idx] = now
+        if self.values[idx] != value or self.display[idx] != value:
+            self.values[idx] = value
+            self.display[idx] = value
+            self.notify({idx})
+
+    @Slot(dict)
+    def drefHandler(self, retValues):
+        """Handle the DREF update."""
+        fields = []
+        samples = []
+        for idx, value in retValues.items():
+            fieldIdx = self.index.get(value[3].lstrip("_"))
+            if fieldIdx is not None:
+                fields.append(fieldIdx)
+                samples.append(value[0])
+
+        if not len(fields):
+            return
+
+        fields = np.array(fields, dtype=int)
+        now = time.monotonic()
+        samples = self.filter(fields, np.array(samples, dtype=float), now)
+
+        # the displayed values move until they reach a repeated sample
+        if np.any(self.values[fields] != samples) or np.any(
+            self.prevValues[fields] != self.values[fields]
+        ):
+            self.animate(now)
+
+        self.prevValues[fields] = self.values[fields]
+        self.prevStamps[fields] = self.stamps[fields]
+        self.stamps[fields] = now
+
+        # live data replaces the snapshot of the last session
+        staleIdx = self.index["stale"]
+        if self.values[staleIdx]:
+            fields = np.append(fields, staleIdx)
+            samples = np.append(samples, 0)
+
+        rows = self.historyRows[fields]
+        tracked = rows >= 0
+        self.history.append(rows[tracked], samples[tracked], now)
+
+        changedMask = self.values[fields] != samples
+        changed = fields[changedMask]
+        self.values[changed] = samples[changedMask]
+        self.display[changed] = samples[changedMask]
+
+        if len(changed):
+            self.notify(set(changed.tolist()))
+
+    def animate(self, sampleTime):
+        """Extend the time during which the displayed values move.
+
+        Args:
+            sampleTime: receive time of the sample
+
+        Returns:
+            None
+        """
+        wasIdle = not self.isAnimating(sampleTime)
+        self.animatedUntil = max(
+            self.animatedUntil,
+            sampleTime + self.interpolationDelay + self.maxExtrapolation,
+        )
+        if wasIdle:
+            self.frameRequested.emit()
+
+    def isAnimating(self, frameTime):
+        """Return True if the displayed values may change at the frame time.
+
+        Args:
+            frameTime: time.monotonic() time of the frame
+
+        Returns:
+            bool
+        """
+        return frameTime < self.animatedUntil
+
+    def prepareFrame(self, frameTime=None):
+        """Compute the displayed values at the frame time.
+
+        Args:
+            frameTime: time.monotonic() time of the frame, now if None
+
+        Returns:
+            None
+        """
+        if frameTime is None:
+            frameTime = time.monotonic()
+
+        display = self.values.copy()
+
+        # interpolate between the last two samples, delayed by one period
+        idx = self.interpolatedIdx
+        span = self.stamps[idx] - self.prevStamps[idx]
+        elapsed = frameTime - self.interpolationDelay - self.prevStamps[idx]
+        valid = span > 0
+        frac = np.ones(len(idx))
+        frac[valid] = np.clip(
+            elapsed[valid] / span[valid],
+            0,
+            1 + self.maxExtrapolation / span[valid],
+        )
+        display[idx] = self.prevValues[idx] + frac * (
+            self.values[idx] - self.prevValues[idx]
+        )
+
+        # dead reckon from the last sample using its rate of change
+        idx = self.deadReckoningIdx
+        elapsed = np.clip(frameTime - self.stamps[idx], 0, self.maxExtrapolation)
+        display[idx] += (
+            self.values[self.deadReckoningRateIdx] * self.deadReckoningScale * elapsed
+        )
+        display[self.headingIdx] %= 360
+
+        changed = np.flatnonzero(display != self.display)
+        self.display = display
+
+        if len(changed):
+            self.notify(set(changed.tolist()))
+
+    def begin(self):
+        """Start a transaction, notifications are held until commit."""
+        self.transactionDepth += 1
+
+    def commit(self):
+        """End a transaction, notifying once all the changes it made.
+
+        Raises:
+            RuntimeError: no transaction was started
+        """
+        if self.transactionDepth == 0:
+            raise RuntimeError("commit without a matching begin")
+
+        self.transactionDepth -= 1
+        if self.transactionDepth == 0 and len(self.pendingChanges):
+            changed = self.pendingChanges
+            self.pendingChanges = set()
+            self.notify(changed)
+
+    @contextmanager
+    def transaction(self):
+        """Context manager grouping changes into a single notification."""
+        self.begin()
+        try:
+            yield self
+        finally:
+            self.commit()
+
+    def notify(self, changed):
+        """Notify the subscribers watching any of the changed fields.
+
+        Args:
+            changed: set of changed field indexes
+
+        Returns:
+            None
+        """
+        for idx in changed:
+            for name in self.derivedDependents[idx]:
+                self.derivedCache.pop(name, None)
+
+        # within a transaction the subscribers are notified on commit
+        if self.transactionDepth:
+            self.pendingChanges |= changed
+            return
+
+        for watched, callback in self.subscribers:
+            hit = watched & changed
+            if len(hit):
+                callback({self.names[idx] for idx in hit})
+
+
+class pyG5History:
+    """pyG5History Object.
+
+    Fixed size ring buffer of timestamped samples for a set of fields.
+    Appending is O(1) and the queries are vectorized over a time window.
+
+    Args:
+        fields: list of field names
+        depth: number of samples kept per field
+        headingFields: fields wrapping around at 360 degrees
+
+    Returns:
+        self
+    """
+
+    def __init__(self, fields, depth=320, headingFields=()):
+        """Object constructor.
+
+        Args:
+            fields: list of field names
+            depth: number of samples kept per field
+            headingFields: fields wrapping around at 360 degrees
+
+        Returns:
+            self
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.fields = list(fields)
+        self.index = {name: idx for idx, name in enumerate(self.fields)}
+        self.depth = depth
+        self.headingFields = set(headingFields)
+
+        self.values = np.zeros((len(self.fields), depth))
+        self.stamps = np.full((len(self.fields), depth), -np.inf)
+        self.heads = np.zeros(len(self.fields), dtype=int)
+
+        self.logger.info(
+            "{} fields x {} samples, {:.1f} kB".format(
+                len(self.fields), depth, self.nbytes() / 1024
+            )
+        )
+
+    def nbytes(self):
+        """Return the memory used by the buffers.
+
+        Returns:
+            size in bytes
+        """
+        return self.values.nbytes + self.stamps.nbytes + self.heads.nbytes
+
+    def append(self, rows, samples, now):
+        """Append one sample to each of the given rows.
+
+        Args:
+            rows: array of row indexes, without duplicates
+            samples: array of values
+            now: sample time
+
+        Returns:
+            None
+        """
+        heads = self.heads[rows]
+        self.values[rows, heads] = samples
+        self.stamps[rows, heads] = now
+        self.heads[rows] = (heads + 1) % self.depth
+
+    def lastStamp(self, name):
+        """Return the time of the last sample of a field, -inf without."""
+        row = self.index[name]
+        return self.stamps[row, self.heads[row] - 1]
+
+    def window(self, name, duration, now=None):
+        """Return the samples of a field received in the last duration.
+
+        Args:
+            name: field name
+            duration: window length in s
+            now: end of the window, now if None
+
+        Returns:
+            (times, values) arrays in chronological order
+        """
+        if now is None:
+            now = time.monotonic()
+
+        row = self.index[name]
+        order = np.roll(np.arange(self.depth), -self.heads[row])
+        stamps = self.stamps[row, order]
+        values = self.values[row, order]
+
+        valid = stamps >= now - duration
+        stamps = stamps[valid]
+        values = values[valid]
+
+        if name in self.headingFields and len(values):
+            values = np.rad2deg(np.unwrap(np.deg2rad(values)))
+
+        return stamps, values
+
+    def slope(self, name, duration, now=None):
+        """Return the least-squares rate of change over a window.
+
+        Args:
+            name: field name
+            duration: window length in s
+            now: end of the window, now if None
+
+        Returns:
+            rate in units per second, nan with less than 2 samples
+        """
+        stamps, values = self.window(name, duration, now)
+        if len(stamps) < 2:
+            return np.nan
+
+        stamps = stamps - stamps.mean()
+        spread = np.dot(stamps, stamps)
+        if spread <= 0:
+            return np.nan
+
+        return np.dot(stamps, values - values.mean()) / spread
+
+    def stats(self, name, duration, now=None):
+        """Return the minimum, maximum and mean over a window.
+
+        Args:
+            name: field name
+            duration: window length in s
+            now: end of the window, now if None
+
+        Returns:
+            (min, max, mean), nan without samples
+        """
+        stamps, values = self.window(name, duration, now)
+        if not len(values):
+            return (np.nan, np.nan, np.nan)
+
+        return (values.min(), values.max(), values.mean())
@@ -5,33 +5,53 @@ Created on 6 Aug 2021.
 """
 
 import logging
+import threading
+import time
 
-from math import cos, radians, sin, sqrt, floor
-from functools import wraps
+from math import ceil, cos, radians, sin, sqrt, floor, isnan
+from contextlib import contextmanager
+from functools import partial, wraps
+
+import numpy as np
 
 from PySide6.QtCore import (
-    QLine,
+    QEvent,
     QPoint,
     QPointF,
+    QRect,
     QRectF,
-    QLineF,
+    QSizeF,
     Qt,
+    QTimer,
     Slot,
     Signal,
 )
 from PySide6.QtGui import (
-    QBrush,
+    QFont,
+    QImage,
+    QPaintEvent,
     QPainter,
     QPolygonF,
     QColor,
     QLinearGradient,
+    QOpenGLContext,
     QRadialGradient,
+    QRegion,
+    QSurfaceFormat,
+    QTransform,
 )
+from PySide6.QtOpenGLWidgets import QOpenGLWidget
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
 )
 
+from pyG5.pyG5Alerts import pyG5AlertEngine
+from pyG5.pyG5Cache import formatCache, paintResources, textCache, tileCache
+from pyG5.pyG5Geometry import horizontalTicks, radialTicks, toLines
+from pyG5.pyG5Quality import defaultQualityTier, qualityTier, renderScaleGrid
+from pyG5.pyG5State import pyG5StateStore, stateProperties
+
 g5Width = 480
 g5CenterX = g5Width / 2
 g5Height = 360
@@ -42,29 +62,256 @@ fmaHeight = 30
 
 g5Diag = sqrt(g5Width**2 + g5Height**2)
 
+# attitude indicator pitch range
+maxPitch = 90
+
 mstokt = 1.94384
 
+# paint colors, shared by the frames
+greyColor = QColor(128, 128, 128, 255)
+advisoryGridColor = QColor("#5d5b59")
+tapeBackgroundColor = QColor(0, 0, 0, 90)
+turnRateScaleColor = QColor(0, 0, 0, 127)
+turnRateMarkerColor = QColor(255, 255, 255, 128)
+slipMarkerPenColor = QColor(0, 0, 0, 128)
+slipMarkerColor = QColor(220, 220, 220)
+
+
+def imagePainter(image, region, background):
+    """Return a QPainter on an image that only paints a region.
+
+    As for a widget paint event, the region is set as the system clip so
+    the clip set by the paint code cannot extend it, and filled with the
+    window background first. A transparent background clears the region.
+
+    Args:
+        image: QImage, or pyG5GLSurface within paintGL()
+        region: QRegion in the image device independent pixels
+        background: QColor of the window background
+
+    Returns:
+        QPainter
+    """
+    dpr = image.devicePixelRatio()
+    image.paintEngine().setSystemClip(QTransform.fromScale(dpr, dpr).map(region))
+
+    qp = QPainter(image)
+    qp.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+    qp.fillRect(region.boundingRect(), background)
+    qp.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+
+    return qp
+
+
+def openGLAvailable():
+    """Return True if an OpenGL context can be created on the platform."""
+    return QOpenGLContext().create()
+
+
+def navTypeString(navType, navIndex):
+    """Return the display string of a nav receiver type.
+
+    Args:
+        navType: type number
+        navIndex: receiver index appended to the string
+
+    Returns:
+        string
+    """
+    value = int(navType)
+
+    if value == 0:
+        return ""
+    elif value == 3:
+        return "VOR" + navIndex
+    elif value >= 4:
+        return "LOC" + navIndex
+
+    logging.error("Failed to decode navtype")
+
+
+def deriveNavTypes(v):
+    """Derive the nav receivers type strings.
+
+    Args:
+        v: dictionary of the input fields
+
+    Returns:
+        (nav1, nav2, nav1 with index, nav2 with index) strings
+    """
+    return (
+        "{}".format(navTypeString(v["nav1type"], "")),
+        "{}".format(navTypeString(v["nav2type"], "")),
+        "{}".format(navTypeString(v["nav1type"], "1")),
+        "{}".format(navTypeString(v["nav2type"], "2")),
+    )
+
+
+navTypesInputs = ("nav1type", "nav2type")
+
+"""GPS CDI sensitivity: 0=OCN, 1=ENR, 2=TERM, 3=DPRT, 4=MAPR, 5=APR, 6=RNPAR, 7=LNAV, 8=LNAV+V, 9=L/VNAV, 10=LP, 11=LPV, 12=LP+V, 13=GLS"""
+gpsCdiSensitivity = [
+    "OCN",
+    "ENR",
+    "TERM",
+    "DPRT",
+    "MAPR",
+    "APR",
+    "RNPAR",
+    "LNAV",
+    "LNAV+V",
+    "L/VNAV",
+    "LP",
+    "LPV",
+    "LP+V",
+    "GLS",
+    "",
+]
+
+
+def deriveNavSource(v):
+    """Derive the Horizontal Situation Indicator source selection.
+
+    Args:
+        v: dictionary of the input fields
+
+    Returns:
+        dictionary of the values displayed for the selected source
+    """
+    source = int(v["hsiSource"])
+    if source == 2:
+        try:
+            annunciator = gpsCdiSensitivity[int(v["gpshsisens"])]
+        except IndexError:
+            annunciator = gpsCdiSensitivity[-1]
+
+        return {
+            "cdiSource": "GPS",
+            "annunciator": annunciator,
+            "color": Qt.GlobalColor.magenta,
+            "dft": v["gpsdft"],
+            "fromto": v["gpsfromto"],
+            "crs": v["gpscrs"],
+            "vertAvailable": 1
+            if (v["gpsvnavavailable"] != -1000) or v["gpsgsavailable"]
+            else 0,
+            "vertSource": "V" if v["gpsgsavailable"] == 0 else "G",
+            "gsDev": v["gpsgs"],
+            "showDist": True,
+            "dist": v["gpsdmedist"],
+        }
+
+    nav = "nav2" if source == 1 else "nav1"
+    return {
+        "cdiSource": "{}".format(
+            navTypeString(v[nav + "type"], "2" if source == 1 else "1")
+        ),
+        "annunciator": "",
+        "color": Qt.GlobalColor.green,
+        "dft": v[nav + "dft"],
+        "fromto": v[nav + "fromto"],
+        "crs": v[nav + "crs"],
+        "vertAvailable": v[nav + "gsavailable"],
+        "vertSource": "G",
+        "gsDev": v[nav + "gs"],
+        "showDist": int(v[nav + "fromto"]) != 0,
+        "dist": v[nav + "dme"],
+    }
+
+
+navSourceInputs = (
+    "hsiSource",
+    "gpshsisens",
+    "gpsdft",
+    "gpsfromto",
+    "gpscrs",
+    "gpsvnavavailable",
+    "gpsgsavailable",
+    "gpsgs",
+    "gpsdmedist",
+    "nav1type",
+    "nav1dft",
+    "nav1fromto",
+    "nav1crs",
+    "nav1gsavailable",
+    "nav1gs",
+    "nav1dme",
+    "nav2type",
+    "nav2dft",
+    "nav2fromto",
+    "nav2crs",
+    "nav2gsavailable",
+    "nav2gs",
+    "nav2dme",
+)
+
+
+def deriveWind(v):
+    """Derive the wind box strings.
+
+    The arrow rotation follows the heading and is computed when painting,
+    so a turn does not format the strings again.
+
+    Args:
+        v: dictionary of the input fields
+
+    Returns:
+        (direction string, speed string)
+    """
+    return (
+        "{:03d}˚".format(int(v["windDirection"])),
+        "{:02d}kt".format(int(v["windSpeed"] * mstokt)),
+    )
+
+
+windInputs = ("windDirection", "windSpeed")
+
+
+def deriveSpeedBands(v):
+    """Derive the airspeed tape color bands.
+
+    Args:
+        v: dictionary of the input fields
+
+    Returns:
+        list of (x offset, width, color, low speed, high speed)
+    """
+    return [
+        (8, 8, Qt.GlobalColor.red, v["vne"], float("inf")),
+        (8, 8, Qt.GlobalColor.yellow, v["vno"], v["vne"]),
+        (8, 8, Qt.GlobalColor.green, v["vs"], v["vno"]),
+        (13, 3, Qt.GlobalColor.white, v["vs0"], v["vfe"]),
+    ]
+
+
+speedBandsInputs = ("vs0", "vs", "vfe", "vno", "vne")
+
 
 class pyG5DualStackFMA(QWidget):
     """Base class for the G5 wdiget view."""
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, stateStore=None):
         """g5Widget Constructor.
 
         Args:
             parent: Parent Widget
+            stateStore: shared pyG5StateStore, a private one is created if None
 
         Returns:
             self
         """
         QWidget.__init__(self, parent)
 
-        self.pyG5FMA = pyG5FMA()
+        if stateStore is None:
+            stateStore = pyG5StateStore(self)
+        self.stateStore = stateStore
+
+        self.pyG5FMA = pyG5FMA(stateStore=stateStore)
         self.pyG5FMA.setFixedSize(g5Width, fmaHeight)
 
-        self.pyG5AI = pyG5AIWidget()
+        self.pyG5AI = pyG5AIWidget(stateStore=stateStore)
         self.pyG5AI.setFixedSize(g5Width, g5Height)
-        self.pyG5HSI = pyG5HSIWidget()
+        self.pyG5HSI = pyG5HSIWidget(stateStore=stateStore)
         self.pyG5HSI.setFixedSize(g5Width, g5Height)
 
         self.vlayout = QVBoxLayout()
@@ -76,24 +323,143 @@ class pyG5DualStackFMA(QWidget):
 
         self.setLayout(self.vlayout)
 
+        # compositor mode: the instruments are painted into backingImage
+        # with a single painter and shown with a single blit
+        self.compositing = False
+        self.backingImage = None
+        self.painter = None
+        self.queued = []
+
+        self.composeTimer = QTimer(self)
+        self.composeTimer.setSingleShot(True)
+        self.composeTimer.timeout.connect(self.compose)
+
+    def instruments(self):
+        """Return the stacked instrument widgets."""
+        return [self.pyG5FMA, self.pyG5AI, self.pyG5HSI]
+
+    def setCompositing(self, enabled):
+        """Paint the instruments into a single backing image.
+
+        The instruments keep their place in the layout but no longer
+        receive paint events, the stack painting them all at once.
+
+        Args:
+            enabled: True for the compositor mode
+
+        Returns:
+            None
+        """
+        self.compositing = enabled
+        self.backingImage = None
+        for widget in self.instruments():
+            widget.compositor = self if enabled else None
+            widget.paintTransform = QTransform()
+            widget.setUpdatesEnabled(not enabled)
+            widget.invalidate()
+
+    def setSceneGraphWindow(self, window):
+        """Show the AI and HSI through a Qt Quick window.
+
+        The instrument widgets leave the layout, only providing the artwork
+        and the state drawn by the window.
+
+        Args:
+            window: pyG5QuickStack drawing the AI above the HSI
+
+        Returns:
+            None
+        """
+        for widget in (self.pyG5AI, self.pyG5HSI):
+            self.vlayout.removeWidget(widget)
+            widget.hide()
+
+        self.sceneGraphContainer = QWidget.createWindowContainer(window, self)
+        self.sceneGraphContainer.setFixedSize(g5Width, 2 * g5Height)
+        self.vlayout.addWidget(self.sceneGraphContainer)
+
+    def queue(self, widget):
+        """Paint a dirty instrument with the next composited frame.
+
+        Args:
+            widget: pyG5Widget
+
+        Returns:
+            None
+        """
+        if widget not in self.queued:
+            self.queued.append(widget)
+
+        # the instruments due in the same frame are painted together
+        if not self.composeTimer.isActive():
+            self.composeTimer.start(0)
+
+    def compose(self):
+        """Paint the queued instruments and show the frame."""
+        queued = self.queued
+        self.queued = []
+
+        dpr = self.devicePixelRatioF()
+        size = (QSizeF(self.size()) * dpr).toSize()
+        if self.backingImage is None or self.backingImage.size() != size:
+            self.backingImage = QImage(size, QImage.Format.Format_ARGB32_Premultiplied)
+            self.backingImage.setDevicePixelRatio(dpr)
+            self.backingImage.fill(self.palette().window().color())
+            for widget in self.instruments():
+                widget.dirtyRegion = QRegion(widget.rect())
+            queued = self.instruments()
+
+        regions = []
+        region = QRegion()
+        for widget in queued:
+            if widget.isDirty():
+                regions.append((widget, widget.dirtyRegion))
+                region |= widget.dirtyRegion.translated(widget.pos())
+                widget.dirtyRegion = QRegion()
+
+        if region.isEmpty():
+            return
+
+        self.painter = imagePainter(
+            self.backingImage, region, self.palette().window().color()
+        )
+        for widget, widgetRegion in regions:
+            widget.paintEvent(QPaintEvent(widgetRegion))
+        self.painter.end()
+        self.painter = None
+
+        self.repaint(region)
+
+    def paintEvent(self, event):
+        """Paint the widget, showing the composited frame in compositor mode."""
+        if self.compositing and self.backingImage is not None:
+            qp = QPainter(self)
+            qp.drawImage(0, 0, self.backingImage)
+            qp.end()
+
 
 class pyG5DualStack(QWidget):
     """Base class for the G5 wdiget view."""
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, stateStore=None):
         """g5Widget Constructor.
 
         Args:
             parent: Parent Widget
+            stateStore: shared pyG5StateStore, a private one is created if None
 
         Returns:
             self
         """
         QWidget.__init__(self, parent)
 
-        self.pyG5AI = pyG5AIWidget()
+        if stateStore is None:
+            stateStore = pyG5StateStore(self)
+        self.stateStore = stateStore
+
+        self.pyG5AI = pyG5AIWidget(stateStore=stateStore)
         self.pyG5AI.setFixedSize(g5Width, g5Height)
-        self.pyG5HSI = pyG5HSIWidget()
+        self.pyG5HSI = pyG5HSIWidget(stateStore=stateStore)
         self.pyG5HSI.setFixedSize(g5Width, g5Height)
 
         self.vlayout = QVBoxLayout()
@@ -107,14 +473,126 @@ class pyG5DualStack(QWidget):
         # self.setFixedSize(480,800)
 
 
+class pyG5GLSurface(QOpenGLWidget):
+    """pyG5GLSurface Object.
+
+    OpenGL surface covering an instrument widget, painted by the paint code
+    of the widget. The OpenGL paint engine uploads the images of the
+    cached layers and tape tiles once as textures and applies the painter
+    transforms on the GPU. The framebuffer is kept between the frames so
+    only the dirty regions are painted again.
+
+    Args:
+        widget: pyG5Widget painted
+        samples: multisampling samples per pixel, the antialiasing
+
+    Returns:
+        self
+    """
+
+    def __init__(self, widget, samples=4):
+        """Object constructor.
+
+        Args:
+            widget: pyG5Widget painted
+            samples: multisampling samples per pixel, the antialiasing
+
+        Returns:
+            self
+        """
+        QOpenGLWidget.__init__(self, widget)
+
+        self.widget = widget
+
+        surfaceFormat = QSurfaceFormat.defaultFormat()
+        surfaceFormat.setSamples(samples)
+        self.setFormat(surfaceFormat)
+        self.setUpdateBehavior(QOpenGLWidget.UpdateBehavior.PartialUpdate)
+        self.resize(widget.size())
+
+        # region to paint on the next paintGL()
+        self.dirtyRegion = QRegion()
+
+    def invalidate(self, region):
+        """Flag a region for the next paintGL().
+
+        Args:
+            region: QRegion in the widget coordinates
+
+        Returns:
+            None
+        """
+        self.dirtyRegion |= region
+
+    def resizeGL(self, w, h):
+        """Paint the new framebuffer entirely.
+
+        Args:
+            w: width in device pixels
+            h: height in device pixels
+
+        Returns:
+            None
+        """
+        self.dirtyRegion = QRegion(self.rect())
+
+    def paintGL(self):
+        """Paint the dirty regions with the widget paint code."""
+        region = self.dirtyRegion
+        if region.isEmpty():
+            return
+        self.dirtyRegion = QRegion()
+
+        self.widget.renderPainter = imagePainter(
+            self, region, self.widget.palette().window().color()
+        )
+        try:
+            self.widget.paintEvent(QPaintEvent(region))
+        finally:
+            self.widget.renderPainter = None
+            # the paint engine is shared by the surfaces of the thread
+            self.paintEngine().setSystemClip(QRegion())
+
+
 class pyG5Widget(QWidget):
     """Base class for the G5 wdiget view."""
 
-    def __init__(self, parent=None):
+    """state fields read by the paint code, None for all of them"""
+    stateFields = None
+
+    """derived value name: (input fields, function)"""
+    derivedValues = {}
+
+    """state fields whose trend the paint code reads"""
+    trendFields = ()
+
+    """state field name: QRect list the field is drawn in, a change of a
+    field not listed repaints the whole widget"""
+    fieldRegions = {}
+
+    """name of the instrument in the --rate command line option"""
+    instrumentName = None
+
+    """target repaints per second and scheduling priority, the lowest
+    priority is repainted first when the frame budget is exceeded"""
+    frameRate = 60
+    framePriority = 0
+
+    """emitted when the widget becomes dirty, to wake up the frame scheduler"""
+    frameRequested = Signal()
+
+    """emitted by the render thread with the region of the frame rendered"""
+    frameRendered = Signal(QRegion)
+
+    """emitted on the GUI thread with the paint time of a frame in s"""
+    paintTimed = Signal(float)
+
+    def __init__(self, parent=None, stateStore=None):
         """g5Widget Constructor.
 
         Args:
             parent: Parent Widget
+            stateStore: shared pyG5StateStore, a private one is created if None
 
         Returns:
             self
@@ -123,2099 +601,2753 @@ class pyG5Widget(QWidget):
 
         self.logger = logging.getLogger(self.__class__.__name__)
 
-        """property name, default value"""
-        propertyList = [
-            ("altitudeHold", 0),
-            ("altitudeVNAV", 0),
-            ("navSrc", 0),
-            ("apAltitude", 0),
-            ("apVS", 0),
-            ("apAirSpeed", 0),
-            ("apState", 0),
-            ("apMode", 0),
-            ("fuelPress", 0),
-            ("lowVolts", 0),
-            ("oilPres", 0),
-            ("parkBrake", 0),
-            ("lowVacuum", 0),
-            ("lowFuel", 0),
-            ("fuelSel", 4),
-            ("xpdrMode", 0),
-            ("xpdrCode", 5470),
-            ("trims", 0),
-            ("flaps", 0),
-            ("fuelpump", 0),
-            ("carbheat", 0),
-            ("gpsdmedist", 0),
-            ("gpshsisens", 0),
-            ("nav1type", 0),
-            ("nav2type", 0),
-            ("gpstype", 0),
-            ("avionicson", 1),
-            ("hsiSource", 0),
-            ("nav1fromto", 0),
-            ("nav2fromto", 0),
-            ("gpsfromto", 0),
-            ("nav1crs", 0),
-            ("nav1gsavailable", 0),
-            ("nav1gs", 0),
-            ("nav2crs", 0),
-            ("gpscrs", 0),
-            ("nav2gsavailable", 0),
-            ("nav2gs", 0),
-            ("nav1dft", 0),
-            ("nav2dft", 0),
-            ("nav1bearing", 0),
-            ("nav2bearing", 0),
-            ("nav1dme", 0),
-            ("nav2dme", 0),
-            ("gpsdft", 0),
-            ("gpsgsavailable", 0),
-            ("gpsvnavavailable", 0),
-            ("gpsgs", 0),
-            ("groundTrack", 0),
-            ("magHeading", 0),
-            ("windDirection", 0),
-            ("windSpeed", 0),
-            ("rollAngle", 0),
-            ("pitchAngle", 0),
-            ("gs", 0),
-            ("kias", 0),
-            ("kiasDelta", 0),
-            ("ktas", 0),
-            ("altitude", 0),
-            ("altitudeSel", 0),
-            ("alt_setting", 1013),
-            ("alt_setting_metric", 1),
-            ("vh_ind_fpm", 0),
-            ("turnRate", 0),
-            ("slip", 0),
-            ("headingBug", 0),
-            ("vs", 30),
-            ("vs0", 23),
-            ("vfe", 88),
-            ("vno", 118),
-            ("vne", 127),
-        ]
+        if stateStore is None:
+            stateStore = pyG5StateStore(self)
+        self.stateStore = stateStore
+
+        # region to repaint on the next frame
+        self.dirtyRegion = QRegion()
+        self.invalidate()
+        self.stateStore.subscribe(self.stateChanged, self.stateFields)
+
+        self.fieldRegion = {
+            name: sum((QRegion(rect) for rect in rects), QRegion())
+            for name, rects in self.fieldRegions.items()
+        }
+
+        # area of the current paint event and pixels repainted since the
+        # last takePaintedArea()
+        self.paintRect = self.rect()
+        self.paintedArea = 0
+
+        for name, (inputs, function) in self.derivedValues.items():
+            self.stateStore.addDerived(name, inputs, function)
 
         def _make_setter(val):
             """Generate a setter function."""
 
             @wraps(val)
             def setter(inputVal):
-                setattr(self, "_{}".format(val), inputVal)
-                self.repaint()
+                with self.transaction():
+                    self.stateStore.setValue(val, inputVal)
 
             return setter
 
-        for prop in propertyList:
-            setattr(self, "_{}".format(prop[0]), prop[1])
+        for prop in stateProperties:
             setattr(self, "{}".format(prop[0]), _make_setter(prop[0]))
 
-    def setPen(self, width, color, style=Qt.PenStyle.SolidLine):
-        """Set the pen color and width."""
-        pen = self.qp.pen()
-        pen.setColor(color)
-        pen.setWidth(width)
-        pen.setStyle(style)
-        self.qp.setPen(pen)
+        # layer name: image of the parts drawn identically every frame
+        self.staticLayers = {}
+
+        # (pixel size, bold): QFont derived from the widget font
+        self.fonts = {}
+
+        # the layers and fonts may be built on the render threads, a layer
+        # or font built before the last invalidateStaticLayers() is dropped
+        self.cacheLock = threading.Lock()
+        self.cacheGeneration = 0
+
+        # copy of the state read by a threaded render, None to read the
+        # state store
+        self.snapshot = None
+        self.snapshotDerived = {}
+        self.snapshotTrends = {}
+
+        # threaded rendering into renderImage, None to paint in paintEvent,
+        # frontImage holding the last frame rendered
+        self.threadPool = None
+        self.renderImage = None
+        self.frontImage = None
+        self.renderPainter = None
+        self.rendering = False
+        self.frameRendered.connect(self.presentFrame)
+
+        # pyG5DualStackFMA painting the widget into its backing image, and
+        # the transform placing the widget in it
+        self.compositor = None
+        self.paintTransform = QTransform()
+
+        # the moving layers are drawn by a Qt Quick scene graph, the paint
+        # code only drawing the readouts over them
+        self.sceneGraphLayers = False
+
+        # pyG5GLSurface the widget is painted through, None for the raster
+        # engine
+        self.glSurface = None
+
+        # qualityTiers tier the widget is rendered at, and the time spent
+        # in the last paint
+        self.quality = qualityTier(defaultQualityTier)
+        self.paintStart = 0
+        self.paintTime = 0
+
+        # internal resolution scale, below 1 the widget is rendered into a
+        # reduced back buffer, scaledImage unless threaded, upscaled on present
+        self.renderScale = 1.0
+        self.scaledImage = None
+
+    def stateChanged(self, changed):
+        """Flag the regions of the changed fields for repaint.
 
-    @Slot(dict)
-    def drefHandler(self, retValues):
-        """Handle the DREF update."""
-        for idx, value in retValues.items():
-            try:
-                setattr(self, value[3], value[0])
-            except Exception as e:
-                self.logger.error("failed to set value {}: {}".format(value[5], e))
+        Args:
+            changed: set of changed field names
 
-    def getNavTypeString(self, navType, navIndex):
-        """getNavTypeString.
+        Returns:
+            None
+        """
+        wasClean = not self.isDirty()
+        for name in changed:
+            region = self.fieldRegion.get(name)
+            if region is None:
+                self.dirtyRegion = QRegion(self.rect())
+                break
+            self.dirtyRegion |= region
+
+        if wasClean and self.isDirty():
+            self.frameRequested.emit()
+
+    def invalidate(self, region=None):
+        """Flag a region for repaint on the next frame.
 
         Args:
-            type: type number
+            region: QRect or QRegion, None for the whole widget
 
         Returns:
-            string
+            None
         """
-        value = int(navType)
-
-        if value == 0:
-            return ""
-        elif value == 3:
-            return "VOR" + navIndex
-        elif value >= 4:
-            return "LOC" + navIndex
+        wasClean = not self.isDirty()
+        self.dirtyRegion |= self.rect() if region is None else region
 
-        logging.error("Failed to decode navtype")
+        if wasClean and self.isDirty():
+            self.frameRequested.emit()
 
+    def isDirty(self):
+        """Return True if a region is waiting to be repainted."""
+        return not self.dirtyRegion.isEmpty()
 
-secWidth = 800
-secHeight = 480
+    def trend(self, name, rate):
+        """Return the 6 seconds trend of a field.
 
+        Args:
+            name: field name
+            rate: rate of change used until enough samples are received
 
-class pyG5SecondaryWidget(pyG5Widget):
-    """Generate G5 wdiget view."""
+        Returns:
+            change expected in the next 6 seconds
+        """
+        if self.snapshot is not None:
+            trend = self.snapshotTrends[name]
+        else:
+            trend = self.stateStore.trend(name)
+        if isnan(trend):
+            trend = 6 * rate
 
-    xpdrCodeSignal = Signal(int)
-    xpdrModeSignal = Signal(int)
+        return trend
 
-    def __init__(self, parent=None):
-        """g5Widget Constructor.
+    def unsettledTrends(self, paintTime):
+        """Return the trend fields still changing at a paint time.
 
         Args:
-            parent: Parent Widget
+            paintTime: time.monotonic() time of the paint
 
         Returns:
-            self
+            set of trend field names
         """
-        pyG5Widget.__init__(self, parent)
+        return {
+            name
+            for name in self.trendFields
+            if paintTime < self.stateStore.trendSettleTime(name)
+        }
 
-        self.xpdrKeyboard = False
+    def derived(self, name):
+        """Return a value derived from the state.
 
-        self.setFixedSize(secWidth, secHeight)
+        Args:
+            name: derived value name
 
-        self.xpdrXbase = 20
-        self.xpdrYbase = 20
+        Returns:
+            value
+        """
+        if self.snapshot is not None:
+            return self.snapshotDerived[name]
+        return self.stateStore.derived(name)
 
-        self.xpdrwidth = 160
-        self.xpdrheight = 40
+    def value(self, name):
+        """Return the displayed value of a field.
 
-        self.xpdrRect = QRectF(
-            self.xpdrXbase, self.xpdrYbase, self.xpdrwidth, self.xpdrheight
-        )
+        Args:
+            name: field name
 
-        self.xpdrKeyXbase = 20
-        self.xpdrKeyYbase = self.xpdrYbase + self.xpdrheight
+        Returns:
+            value
+        """
+        if self.snapshot is not None:
+            return self.snapshot[self.stateStore.index[name]]
+        return self.stateStore.value(name)
 
-        self.xpdrKeyWidth = 420
-        self.xpdrKeyHeight = secHeight - (self.xpdrYbase + self.xpdrheight) - 20
+    @contextmanager
+    def transaction(self):
+        """Context manager grouping property changes into a single repaint.
 
-        self.xpdrkeyRect = QRectF(
-            self.xpdrKeyXbase, self.xpdrKeyYbase, self.xpdrKeyWidth, self.xpdrKeyHeight
-        )
+        The changes are committed to the state store on exit and one
+        deferred update() is scheduled if any watched field changed.
+        """
+        with self.stateStore.transaction():
+            yield self
+
+        if not self.stateStore.transactionDepth:
+            self.updateIfDirty()
+
+    def updateIfDirty(self):
+        """Schedule a repaint of the regions changed since the last one."""
+        if self.threadPool is not None or self.compositor is not None:
+            self.repaintIfDirty()
+        elif self.isDirty():
+            if self.glSurface is not None:
+                self.glSurface.invalidate(self.dirtyRegion)
+                self.glSurface.update()
+            else:
+                self.update(self.dirtyRegion)
+            self.dirtyRegion = QRegion()
 
-        self.xpdrPos = 3
+    def repaintIfDirty(self):
+        """Repaint immediately the regions changed since the last repaint.
 
-        self.keyArea = []
+        With threaded rendering the frame is rendered on the thread pool,
+        the regions changed meanwhile being left dirty for the next frame.
+        A composited widget is painted with the other instruments of its
+        compositor once the frame is scheduled.
+        """
+        if not self.isDirty():
+            return
 
-        index = 0
-        for i in [1, 2, 3, 4]:
-            rect = QRectF(
-                self.xpdrKeyXbase + 26.125 + index * 95,
-                self.xpdrKeyYbase + 20,
-                82.5,
-                82.5,
-            )
-            self.keyArea.append([rect, i])
-            index += 1
+        if self.compositor is not None:
+            self.compositor.queue(self)
+        elif self.glSurface is not None:
+            self.glSurface.invalidate(self.dirtyRegion)
+            self.dirtyRegion = QRegion()
+            self.glSurface.repaint()
+        elif self.threadPool is None:
+            region = self.dirtyRegion
+            self.dirtyRegion = QRegion()
+            self.repaint(region)
+        elif not self.rendering:
+            self.startRender()
+
+    def setThreadPool(self, threadPool):
+        """Render the widget on a thread pool into a QImage.
+
+        paintEvent() then runs on the pool threads and the GUI thread only
+        draws the last frame rendered.
 
-        index = 0
-        for i in [5, 6, 7, 0]:
-            rect = QRectF(
-                self.xpdrKeyXbase + 26.125 + index * 95,
-                self.xpdrKeyYbase + 20 + 95 + 20,
-                82.5,
-                82.5,
-            )
-            self.keyArea.append([rect, i])
-            index += 1
+        Args:
+            threadPool: QThreadPool, None to paint in paintEvent
 
-        self.keyCtrlArea = []
-        self.keyCtrlArea.append(
-            [
-                QRectF(
-                    self.xpdrKeyXbase,
-                    self.xpdrKeyYbase + self.xpdrKeyHeight / 2 + 40,
-                    self.xpdrKeyWidth / 2,
-                    self.xpdrKeyHeight / 4 - 20,
-                ),
-                "OFF",
-                0,
-            ]
-        )
-        self.keyCtrlArea.append(
-            [
-                QRectF(
-                    self.xpdrKeyXbase,
-                    self.xpdrKeyYbase + self.xpdrKeyHeight * 3 / 4 + 20,
-                    self.xpdrKeyWidth / 2,
-                    self.xpdrKeyHeight / 4 - 20,
-                ),
-                "ON",
-                2,
-            ]
-        )
+        Returns:
+            None
+        """
+        self.threadPool = threadPool
+        self.renderImage = None
+        self.frontImage = None
+        self.invalidate()
 
-        self.keyCtrlArea.append(
-            [
-                QRectF(
-                    self.xpdrKeyXbase + self.xpdrKeyWidth / 2,
-                    self.xpdrKeyYbase + self.xpdrKeyHeight / 2 + 40,
-                    self.xpdrKeyWidth / 2,
-                    self.xpdrKeyHeight / 4 - 20,
-                ),
-                "STBY",
-                1,
-            ]
-        )
+    def setOpenGL(self, enabled):
+        """Paint the widget through an OpenGL surface covering it.
 
-        self.keyCtrlArea.append(
-            [
-                QRectF(
-                    self.xpdrKeyXbase + self.xpdrKeyWidth / 2,
-                    self.xpdrKeyYbase + self.xpdrKeyHeight * 3 / 4 + 20,
-                    self.xpdrKeyWidth / 2,
-                    self.xpdrKeyHeight / 4 - 20,
-                ),
-                "ALT",
-                3,
-            ]
-        )
+        Args:
+            enabled: True to paint with OpenGL, False with the raster engine
 
-    def mousePressEvent(self, event):
-        """Mouse Pressed event overload."""
-        if self._avionicson:
-            if self.xpdrRect.contains(event.position()):
-                self.xpdrKeyboard = not self.xpdrKeyboard
+        Returns:
+            None
+        """
+        if enabled and self.glSurface is None:
+            self.glSurface = pyG5GLSurface(self)
+            self.glSurface.show()
+        elif not enabled and self.glSurface is not None:
+            self.glSurface.deleteLater()
+            self.glSurface = None
+        self.invalidate()
+
+    def takeSnapshot(self):
+        """Copy the state read by the paint code for a threaded render."""
+        self.snapshotDerived = {
+            name: self.stateStore.derived(name) for name in self.derivedValues
+        }
+        self.snapshotTrends = {
+            name: self.stateStore.trend(name) for name in self.trendFields
+        }
+        self.snapshot = self.stateStore.display.copy()
+
+    def startRender(self):
+        """Render the dirty regions on the thread pool."""
+        ratio = self.renderRatio()
+        size = (QSizeF(self.size()) * ratio).toSize()
+        if (
+            self.renderImage is None
+            or self.renderImage.size() != size
+            or self.renderImage.devicePixelRatio() != ratio
+        ):
+            self.renderImage = QImage(size, QImage.Format.Format_ARGB32_Premultiplied)
+            self.renderImage.setDevicePixelRatio(ratio)
+            self.renderImage.fill(self.palette().window().color())
+            self.dirtyRegion = QRegion(self.rect())
 
-            else:
-                if self.xpdrkeyRect.contains(event.position()):
-                    for key in self.keyArea:
-                        if key[0].contains(event.position()):
-                            # the input is a BCD value received as integer.
-                            # First step is to turn it into a real integer
-                            codestr = "{:04d}".format(int(self._xpdrCode))
-                            code = 0
-                            for idx, c in enumerate(codestr):
-                                code |= int(c) << (4 * (3 - idx))
+        region = self.alignRegion(self.dirtyRegion)
+        self.dirtyRegion = QRegion()
 
-                            # code is the integer value of the string
-                            # now apply on code the new number
-                            code = code & ((0xF << (4 * self.xpdrPos)) ^ 0xFFFF)
-                            code = code | (key[1] << (4 * self.xpdrPos))
+        self.takeSnapshot()
+        self.rendering = True
+        self.threadPool.start(partial(self.renderFrame, region))
 
-                            # shift the position we update
-                            self.xpdrPos = (self.xpdrPos - 1) % 4
+    def renderFrame(self, region):
+        """Paint a region into the render image, called on the thread pool.
 
-                            # emit the new code value
-                            self._xpdrCode = int("{:04x}".format(code))
-                            self.xpdrCodeSignal.emit(self._xpdrCode)
+        Args:
+            region: QRegion to paint
 
-                    for key in self.keyCtrlArea:
-                        if key[0].contains(event.position()):
-                            self.xpdrMode(key[2])
-                            self.xpdrModeSignal.emit(key[2])
-                            self.xpdrKeyboard = False
-                else:
-                    self.xpdrKeyboard = False
-
-            if not self.xpdrKeyboard:
-                self.xpdrPos = 3
-        self.update()
-
-    def paintEvent(self, event):
-        """Paint the widget."""
-        self.qp = QPainter(self)
+        Returns:
+            None
+        """
+        self.renderPainter = imagePainter(
+            self.renderImage, region, self.palette().window().color()
+        )
+        try:
+            self.paintEvent(QPaintEvent(region))
+        finally:
+            self.renderPainter = None
+            self.frameRendered.emit(region)
 
-        # Draw the background
-        self.setPen(1, Qt.GlobalColor.black)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.black))
-        self.qp.drawRect(0, 0, secWidth, secHeight)
+    def presentFrame(self, region):
+        """Show the frame rendered by the thread pool.
 
-        self.setPen(1, Qt.GlobalColor.white)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.black))
+        Args:
+            region: QRegion rendered
 
-        # flaps settings
-        flapXBase = 620
-        flapYBase = 20
-        flapHeight = secHeight - 40
-        flapWidth = 130
+        Returns:
+            None
+        """
+        # a shared copy would lose the system clip of the next render
+        self.frontImage = self.renderImage.copy()
+        self.snapshot = None
+        self.rendering = False
+        self.update(region)
+        self.paintTimed.emit(self.paintTime)
 
-        self.setPen(1, Qt.GlobalColor.white)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.white))
-        font = self.qp.font()
-        font.setPixelSize(30)
-        font.setBold(True)
-        self.qp.setFont(font)
+        if self.isDirty():
+            self.frameRequested.emit()
 
-        # draw the title
-        self.qp.drawText(
-            QRectF(
-                flapXBase,
-                flapYBase,
-                flapWidth,
-                40,
-            ),
-            Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignTop,
-            "FLAPS",
-        )
+    def event(self, event):
+        """Event overload, drawing the last frame rendered with threaded rendering.
 
-        font.setPixelSize(20)
-        font.setBold(False)
-        self.qp.setFont(font)
+        Args:
+            event: QEvent
 
-        # draw the flaps angle legend
-        for i in range(0, 4):
-            self.qp.drawText(
-                QRectF(
-                    flapXBase,
-                    flapYBase + 40 + int((flapHeight) * i / 4),
-                    40,
-                    40,
-                ),
-                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-                "{:02d}°".format(10 * i),
-            )
+        Returns:
+            bool
+        """
+        if event.type() == QEvent.Type.Paint and self.glSurface is not None:
+            # the surface covers the widget
+            return True
+        if event.type() == QEvent.Type.Paint and self.threadPool is not None:
+            if self.frontImage is not None:
+                self.presentImage(self.frontImage)
+            return True
+        if (
+            event.type() == QEvent.Type.Paint
+            and self.renderScale != 1
+            and self.compositor is None
+        ):
+            self.paintScaled(event.region())
+            return True
 
-        # draw the indicator rectangle
-        self.qp.setBrush(QBrush(Qt.GlobalColor.black))
-        self.qp.drawRect(flapXBase + 90, flapYBase + 40, 40, flapHeight - 40)
+        return QWidget.event(self, event)
 
-        # draw the indicator legend white
-        self.setPen(1, Qt.GlobalColor.white)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.white))
-        rect = QRectF(
-            flapXBase + 50,
-            flapYBase + 40 + int((flapHeight - 40) / 3),
-            40,
-            flapHeight - 40 - +int((flapHeight - 40) / 3),
-        )
-        self.qp.drawRect(rect)
-        self.setPen(1, Qt.GlobalColor.black)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.black))
-        self.qp.drawText(
-            rect, Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter, "8\n5"
-        )
+    def presentImage(self, image):
+        """Draw a frame rendered into an image over the widget.
 
-        # draw the indicator legend cyan
-        self.setPen(1, Qt.GlobalColor.cyan)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.cyan))
-        rect = QRectF(
-            flapXBase + 50, flapYBase + 40, 40, int((flapHeight - 40) / 3 + 20)
-        )
-        self.qp.drawRect(rect)
-        self.setPen(1, Qt.GlobalColor.black)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.black))
-        self.qp.drawText(
-            rect,
-            Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-            "1\n1\n0",
-        )
+        An image rendered at a reduced scale is upscaled to the widget size.
 
-        self.setPen(1, Qt.GlobalColor.white)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.white))
+        Args:
+            image: QImage
 
-        self.qp.drawPolygon(
-            QPolygonF(
-                [
-                    QPointF(
-                        flapXBase + flapWidth,
-                        flapYBase + 50 + self._flaps * int((flapHeight - 100)),
-                    ),
-                    QPointF(
-                        flapXBase + flapWidth,
-                        flapYBase + 70 + self._flaps * int((flapHeight - 100)),
-                    ),
-                    QPointF(
-                        flapXBase + flapWidth - 30,
-                        flapYBase + 70 + self._flaps * int((flapHeight - 100)),
-                    ),
-                    QPointF(
-                        flapXBase + flapWidth - 40,
-                        flapYBase + 60 + self._flaps * int((flapHeight - 100)),
-                    ),
-                    QPointF(
-                        flapXBase + flapWidth - 30,
-                        flapYBase + 50 + self._flaps * int((flapHeight - 100)),
-                    ),
-                    QPointF(
-                        flapXBase + flapWidth,
-                        flapYBase + 50 + self._flaps * int((flapHeight - 100)),
-                    ),
-                ]
+        Returns:
+            None
+        """
+        qp = QPainter(self)
+        if self.renderScale == 1:
+            qp.drawImage(0, 0, image)
+        else:
+            qp.setRenderHint(
+                QPainter.RenderHint.SmoothPixmapTransform, self.quality["smoothLayers"]
             )
-        )
-
-        # trim settings
-        trimXBase = 460
-        trimYBase = 20
-        trimHeight = secHeight - 40
-        trimWidth = 130
+            qp.drawImage(QRectF(self.rect()), image)
+        qp.end()
 
-        self.setPen(1, Qt.GlobalColor.white)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.white))
-        font = self.qp.font()
-        font.setPixelSize(30)
-        font.setBold(True)
-        self.qp.setFont(font)
+    def paintScaled(self, region):
+        """Paint a region into the reduced back buffer and present it.
 
-        # draw the title
-        self.qp.drawText(
-            QRectF(
-                trimXBase + 40,
-                trimYBase,
-                90,
-                40,
-            ),
-            Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignTop,
-            "TRIM",
-        )
+        Args:
+            region: QRegion of the paint event
 
-        font.setPixelSize(20)
-        font.setBold(False)
-        self.qp.setFont(font)
+        Returns:
+            None
+        """
+        ratio = self.renderRatio()
+        size = (QSizeF(self.size()) * ratio).toSize()
+        if (
+            self.scaledImage is None
+            or self.scaledImage.size() != size
+            or self.scaledImage.devicePixelRatio() != ratio
+        ):
+            self.scaledImage = QImage(size, QImage.Format.Format_ARGB32_Premultiplied)
+            self.scaledImage.setDevicePixelRatio(ratio)
+            region = QRegion(self.rect())
 
-        # draw the flaps angle legend
-        self.qp.drawText(
-            QRectF(
-                trimXBase,
-                trimYBase + 40 + int((trimHeight) / 2 - 40),
-                80,
-                40,
-            ),
-            Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-            "Take-off",
+        region = self.alignRegion(region)
+        self.renderPainter = imagePainter(
+            self.scaledImage, region, self.palette().window().color()
         )
+        try:
+            self.paintEvent(QPaintEvent(region))
+        finally:
+            self.renderPainter = None
 
-        # draw the indicator rectangle
-        self.qp.setBrush(QBrush(Qt.GlobalColor.black))
-        self.qp.drawRect(trimXBase + 90, trimYBase + 40, 40, trimHeight - 40)
+        self.presentImage(self.scaledImage)
+        self.paintTime = time.perf_counter() - self.paintStart
+        self.paintTimed.emit(self.paintTime)
 
-        self.setPen(1, Qt.GlobalColor.white)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.white))
-
-        trimShift = (trimHeight - 60) * (self._trims / 2 + 0.5)
+    def renderRatio(self):
+        """Return the back buffer pixels per widget pixel the widget is rendered at."""
+        return self.devicePixelRatioF() * self.renderScale
 
-        self.qp.drawPolygon(
-            QPolygonF(
-                [
-                    QPointF(trimXBase + trimWidth, trimYBase + 40 + trimShift),
-                    QPointF(trimXBase + trimWidth, trimYBase + 60 + trimShift),
-                    QPointF(trimXBase + trimWidth - 30, trimYBase + 60 + trimShift),
-                    QPointF(trimXBase + trimWidth - 40, trimYBase + 50 + trimShift),
-                    QPointF(trimXBase + trimWidth - 30, trimYBase + 40 + trimShift),
-                    QPointF(trimXBase + trimWidth, trimYBase + 40 + trimShift),
-                ]
-            )
-        )
+    def alignRegion(self, region):
+        """Return a region expanded to whole pixels of the reduced back buffer.
 
-        # sqawk code and status
-        if self._avionicson:
-            font = self.qp.font()
-            font.setPixelSize(self.xpdrheight - 6)
-            font.setBold(True)
-            self.qp.setFont(font)
+        A back buffer pixel straddling the region border would otherwise be
+        left out of the repaint, its content going stale.
 
-            # draw the indicator rectangle
-            self.setPen(2, Qt.GlobalColor.white)
-            self.qp.setBrush(QBrush(Qt.GlobalColor.white))
-            self.qp.drawRect(self.xpdrRect)
+        Args:
+            region: QRegion in the widget coordinates
 
-            self.setPen(1, Qt.GlobalColor.black)
-            self.qp.setBrush(QBrush(Qt.GlobalColor.black))
-            self.qp.drawText(
-                self.xpdrRect,
-                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-                "XPDR",
-            )
+        Returns:
+            QRegion
+        """
+        if self.renderScale == 1:
+            return region
 
-            self.setPen(2, Qt.GlobalColor.white)
-            self.qp.setBrush(QBrush(Qt.GlobalColor.black))
-            rect = QRectF(
-                self.xpdrXbase + self.xpdrwidth,
-                self.xpdrYbase,
-                420 - self.xpdrwidth,
-                self.xpdrheight,
-            )
-            self.qp.drawRect(rect)
+        aligned = QRegion()
+        for rect in region:
+            left = floor(rect.left() / renderScaleGrid) * renderScaleGrid
+            top = floor(rect.top() / renderScaleGrid) * renderScaleGrid
+            right = ceil((rect.right() + 1) / renderScaleGrid) * renderScaleGrid
+            bottom = ceil((rect.bottom() + 1) / renderScaleGrid) * renderScaleGrid
+            aligned |= QRect(left, top, right - left, bottom - top)
 
-            self.setPen(1, Qt.GlobalColor.white)
-            self.qp.setBrush(QBrush(Qt.GlobalColor.white))
+        return aligned & self.rect()
 
-            if int(self._xpdrMode) == 0:
-                xpdrMode = "OFF"
-            elif int(self._xpdrMode) == 1:
-                xpdrMode = "STDBY"
-            elif int(self._xpdrMode) == 2:
-                xpdrMode = "ON"
-            elif int(self._xpdrMode) == 3:
-                xpdrMode = "ALT"
-            elif int(self._xpdrMode) == 4:
-                xpdrMode = "TEST"
+    def setRenderScale(self, scale):
+        """Render the widget at an internal resolution scale.
 
-            self.qp.drawText(
-                rect,
-                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-                "{:04d} {}".format(int(self._xpdrCode), xpdrMode),
-            )
+        Args:
+            scale: renderScales scale, 1 for the native resolution
 
-        if self.xpdrKeyboard:
-            self.setPen(2, Qt.GlobalColor.white)
-            self.qp.setBrush(QBrush(Qt.GlobalColor.black))
-            self.qp.drawRect(self.xpdrkeyRect)
+        Returns:
+            None
+        """
+        self.renderScale = scale
+        self.scaledImage = None
+        self.invalidate()
+        self.updateIfDirty()
 
-            for key in self.keyArea:
-                self.qp.drawEllipse(key[0])
-                self.qp.drawText(
-                    key[0],
-                    Qt.AlignmentFlag.AlignCenter,
-                    "{:01d}".format(key[1]),
-                )
+    def beginPaint(self, event):
+        """Open the widget painter for a paint event.
 
-            for key in self.keyCtrlArea:
-                self.qp.drawRect(key[0])
-                self.qp.drawText(
-                    key[0],
-                    Qt.AlignmentFlag.AlignCenter,
-                    key[1],
-                )
+        Args:
+            event: QPaintEvent
 
+        Returns:
+            None
+        """
+        self.paintStart = time.perf_counter()
+
+        if self.compositor is not None:
+            # the painter is shared by the instruments of the compositor
+            self.qp = self.compositor.painter
+            self.qp.save()
+            self.paintTransform = QTransform.fromTranslate(self.x(), self.y())
+            self.qp.setTransform(self.paintTransform)
+            self.qp.setClipRegion(event.region())
+        elif self.renderPainter is not None:
+            self.qp = self.renderPainter
         else:
-            # carb heat status
-            carbXbase = 20
-            carbYbase = self.xpdrYbase + self.xpdrheight + 20
+            self.qp = QPainter(self)
+
+        if self.compositor is not None or self.renderPainter is not None:
+            # the widget painter would start with the widget font and pen
+            self.qp.setFont(self.font())
+            self.qp.setPen(self.palette().windowText().color())
+        self.setQualityHints()
+        self.paintRect = event.rect()
+        for rect in event.region():
+            self.paintedArea += rect.width() * rect.height()
+
+    def endPaint(self):
+        """Close the painter opened by beginPaint()."""
+        if self.compositor is not None:
+            self.qp.restore()
+        else:
+            self.qp.end()
 
-            carbwidth = 80
-            carbheight = 80
+        self.paintTime = time.perf_counter() - self.paintStart
+        # a threaded render is reported once presented, on the GUI thread,
+        # and a scaled one with its upscale
+        if self.threadPool is None and self.scaledImage is None:
+            self.paintTimed.emit(self.paintTime)
 
-            font.setPixelSize(20)
-            font.setBold(False)
-            self.qp.setFont(font)
+    def setQualityHints(self):
+        """Set the render hints of the quality tier on the painter."""
+        self.qp.setRenderHint(
+            QPainter.RenderHint.Antialiasing, self.quality["antialiasing"]
+        )
+        self.qp.setRenderHint(
+            QPainter.RenderHint.TextAntialiasing, self.quality["textAntialiasing"]
+        )
+        self.qp.setRenderHint(
+            QPainter.RenderHint.SmoothPixmapTransform, self.quality["smoothLayers"]
+        )
 
-            rect = QRectF(carbXbase, carbYbase, carbwidth, 40)
+    def setQuality(self, name):
+        """Render the widget at a quality tier.
 
-            self.qp.drawText(
-                rect,
-                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-                "CARB",
-            )
+        Args:
+            name: qualityTiers tier name
 
-            self.setPen(2, Qt.GlobalColor.white)
-            if self._carbheat > 0.1:
-                self.qp.setBrush(QBrush(Qt.GlobalColor.green))
-            else:
-                self.qp.setBrush(QBrush(Qt.GlobalColor.black))
+        Returns:
+            None
+        """
+        self.quality = qualityTier(name)
+        self.invalidateStaticLayers()
 
-            rect = QRectF(carbXbase, carbYbase + 40, carbwidth, carbheight)
+    def keepTicks(self, major):
+        """Return the mask of the scale ticks drawn at the quality tier.
 
-            self.qp.drawEllipse(rect)
+        Args:
+            major: numpy mask of the major ticks, always drawn
 
-            # fuel pump status
-            fuelXbase = 20
-            fuelYbase = carbYbase + carbheight + 20
+        Returns:
+            numpy mask
+        """
+        return major | self.quality["minorTicks"]
 
-            fuelwidth = 80
-            fuelheight = 80
+    def resetPaintTransform(self):
+        """Reset the painter transform to the widget coordinates."""
+        self.qp.setTransform(self.paintTransform)
 
-            font.setPixelSize(20)
-            font.setBold(False)
-            self.qp.setFont(font)
+    def exposed(self, rect):
+        """Return True if a rectangle needs painting in the current paint event.
 
-            rect = QRectF(fuelXbase, fuelYbase, fuelwidth, 100)
+        Args:
+            rect: QRect
 
-            self.qp.drawText(
-                rect,
-                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-                "FUEL\nPUMP",
-            )
+        Returns:
+            bool
+        """
+        return self.paintRect.intersects(rect)
 
-            self.setPen(2, Qt.GlobalColor.white)
-            self.qp.setBrush(QBrush(Qt.GlobalColor.green))
+    def takePaintedArea(self):
+        """Return the pixels repainted since the last call.
 
-            rect = QRectF(fuelXbase, fuelYbase + 80, fuelwidth, fuelheight)
+        Returns:
+            int
+        """
+        area = self.paintedArea
+        self.paintedArea = 0
+        return area
 
-            if self._fuelpump > 0 and self._avionicson:
-                self.qp.setBrush(QBrush(Qt.GlobalColor.green))
-            else:
-                self.qp.setBrush(QBrush(Qt.GlobalColor.black))
+    def staticLayer(self, name, rect, paint, fill=Qt.GlobalColor.transparent):
+        """Return a layer rendered once into an image.
 
-            self.qp.drawEllipse(rect)
+        The paint function draws the layer with self.qp in the current
+        coordinates. The image matches the render ratio and is
+        rendered again after invalidateStaticLayers().
 
-            # fuel feed settings
+        Args:
+            name: layer name
+            rect: QRectF covering the layer, in the current coordinates
+            paint: function painting the layer
+            fill: layer background, an opaque color gives an opaque image
 
-            ffXBase = 120
-            ffYBase = carbYbase + 40
+        Returns:
+            QImage
+        """
+        with self.cacheLock:
+            layer = self.staticLayers.get(name)
+            generation = self.cacheGeneration
 
-            ffWdidth = 440 - ffXBase
-            ffHeight = 220
+        if layer is None or layer.devicePixelRatio() != self.renderRatio():
+            layer = self.renderLayer(rect, paint, fill)
+            with self.cacheLock:
+                if generation == self.cacheGeneration:
+                    self.staticLayers[name] = layer
 
-            self.setPen(1, Qt.GlobalColor.white)
-            self.qp.setBrush(QBrush(Qt.GlobalColor.white))
-            rect = QRectF(ffXBase, carbYbase, ffWdidth, 20)
-            self.qp.drawText(
-                rect,
-                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-                "FUEL FEED",
-            )
+        return layer
 
-            self.setPen(1, Qt.GlobalColor.white)
-            self.qp.setBrush(QBrush(Qt.GlobalColor.black))
+    def renderLayer(self, rect, paint, fill=Qt.GlobalColor.transparent):
+        """Render a layer into an image.
 
-            rect = QRectF(ffXBase, ffYBase, ffWdidth, ffHeight)
-            self.qp.drawRect(rect)
+        A QImage rather than a QPixmap, as the layers are also rendered on
+        the render threads where pixmaps are not supported on every
+        platform.
 
-            self.qp.drawText(
-                rect,
-                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop,
-                "BOTH",
-            )
-            self.qp.drawText(
-                rect,
-                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignBottom,
-                "OFF",
-            )
+        Args:
+            rect: QRectF covering the layer, in the current coordinates
+            paint: function painting the layer with self.qp
+            fill: layer background
 
-            self.qp.drawText(
-                rect,
-                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
-                "LEFT",
-            )
+        Returns:
+            QImage
+        """
+        dpr = self.renderRatio()
+        layer = QImage(
+            (rect.size() * dpr).toSize(),
+            (
+                QImage.Format.Format_RGB32
+                if QColor(fill).alpha() == 255
+                else QImage.Format.Format_ARGB32_Premultiplied
+            ),
+        )
+        layer.setDevicePixelRatio(dpr)
+        layer.fill(fill)
+
+        qp = self.qp
+        self.qp = QPainter(layer)
+        self.qp.setFont(qp.font())
+        self.setQualityHints()
+        self.qp.translate(-rect.topLeft())
+        paint()
+        self.qp.end()
+        self.qp = qp
 
-            self.qp.drawText(
-                rect,
-                Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
-                "RIGHT",
-            )
+        return layer
 
-            self.qp.translate(rect.center())
+    def drawStaticLayer(self, name, rect, paint, fill=Qt.GlobalColor.transparent):
+        """Draw a layer rendered once into an image.
 
-            if self._fuelSel == 0:
-                self.qp.rotate(180)
-            elif self._fuelSel == 1:
-                self.qp.rotate(-90)
-            elif self._fuelSel == 2:
-                self.qp.rotate(45)
-            elif self._fuelSel == 3:
-                self.qp.rotate(90)
-            elif self._fuelSel == 4:
-                self.qp.rotate(0)
-            else:
-                self.qp.rotate(0)
+        Args:
+            name: layer name
+            rect: QRectF covering the layer, in the current coordinates
+            paint: function painting the layer
+            fill: layer background, an opaque color gives an opaque image
 
-            brect = QRectF(-50, -50, 100, 100)
-            self.qp.drawEllipse(brect)
+        Returns:
+            None
+        """
+        layer = self.staticLayer(name, rect, paint, fill)
 
-            self.setPen(1, Qt.GlobalColor.white)
-            self.qp.setBrush(QBrush(Qt.GlobalColor.white))
-            self.qp.drawPolygon(
-                QPolygonF(
-                    [
-                        QPointF(-10, +50),
-                        QPointF(+10, +50),
-                        QPointF(+10, -50),
-                        QPointF(0, -70),
-                        QPointF(-10, -50),
-                    ]
-                )
-            )
+        self.qp.drawImage(rect.topLeft(), layer)
 
-            self.setPen(1, Qt.GlobalColor.black)
-            self.qp.setBrush(QBrush(Qt.GlobalColor.black))
-            brect = QRectF(-5, -5, 10, 10)
-            self.qp.drawEllipse(brect)
+    def tapeTiles(self, name, value, scale, span, left, width, paint, key=()):
+        """Return the cached tiles of a vertical tape scrolling with a value.
 
-            self.qp.resetTransform()
+        The tape shows value +/- scale / 2 over the widget height with value
+        at the vertical center. Each tile covers span units of the tape and
+        is rendered on first use by paint(low, high, y), where y maps a tape
+        value to the tile ordinate and x is in widget coordinates.
 
-            # advisory panel (low voltage)
-            advXBase = 20
-            advYBase = fuelYbase + fuelheight + 100
+        Args:
+            name: tape name
+            value: value at the center of the tape
+            scale: tape range displayed over the widget height
+            span: tape range covered by a tile
+            left: tape left position
+            width: tape width
+            paint: function painting the tape between two values
+            key: hashable state the tiles depend on
 
-            advWdidth = 420
-            advHeight = 100
+        Returns:
+            list of (tile cache key, QPointF tile position, QImage)
+        """
+        dpr = self.renderRatio()
+        pixelsPerUnit = g5Height / scale
+
+        tiles = []
+        first = floor((value - scale / 2) / span)
+        last = floor((value + scale / 2) / span)
+        for index in range(first, last + 1):
+            tileKey = (name, index, dpr, self.quality["name"], key)
+            tile = tileCache.tile(
+                tileKey,
+                partial(
+                    self.renderTapeTile,
+                    index * span,
+                    span,
+                    pixelsPerUnit,
+                    left,
+                    width,
+                    paint,
+                ),
+            )
+            top = round((1 - 2 * ((index + 1) * span - value) / scale) * g5CenterY)
+            tiles.append((tileKey, QPointF(left, top), tile))
 
-            advTable = [
-                {
-                    "text": "LOW\nVOLTS",
-                    "color": Qt.GlobalColor.red,
-                    "name": "_lowVolts",
-                },
-                {"text": "LOW\nFUEL", "color": Qt.GlobalColor.red, "name": "_lowFuel"},
-                {"text": "OIL\nPRESS", "color": Qt.GlobalColor.red, "name": "_oilPres"},
-                {"text": "BRAKE", "color": Qt.GlobalColor.red, "name": "_parkBrake"},
-                {
-                    "text": "LOW\nVACUUM",
-                    "color": Qt.GlobalColor.yellow,
-                    "name": "_lowVacuum",
-                },
-                {
-                    "text": "FUEL\nPRESS",
-                    "color": Qt.GlobalColor.yellow,
-                    "name": "_fuelPress",
-                },
-            ]
+        return tiles
 
-            grayColor = QColor("#5d5b59")
-            self.setPen(1, grayColor)
-            self.qp.setBrush(QBrush(Qt.GlobalColor.black))
+    def drawTape(self, tiles):
+        """Draw the tiles of a vertical tape.
 
-            rect = QRectF(advXBase, advYBase, advWdidth, advHeight)
-            self.qp.drawRect(rect)
+        Args:
+            tiles: tapeTiles() list
 
-            for i in range(0, 2):
-                for j in range(0, 4):
-                    advrect = QRectF(
-                        advXBase + j * advWdidth / 4,
-                        advYBase + i * advHeight / 2,
-                        advWdidth / 4,
-                        advHeight / 2,
-                    )
-                    self.qp.drawRect(advrect)
-
-                    if j + 4 * i < len(advTable):
-                        if getattr(self, advTable[4 * i + j]["name"]) == 1:
-                            self.setPen(1, advTable[4 * i + j]["color"])
+        Returns:
+            None
+        """
+        for _, position, tile in tiles:
+            self.qp.drawImage(position, tile)
 
-                        self.qp.drawText(
-                            advrect,
-                            Qt.AlignmentFlag.AlignHCenter
-                            | Qt.AlignmentFlag.AlignVCenter,
-                            advTable[4 * i + j]["text"],
-                        )
+    def renderTapeTile(self, low, span, pixelsPerUnit, left, width, paint):
+        """Render a tape tile.
 
-                        self.setPen(1, grayColor)
+        Args:
+            low: lowest tape value of the tile
+            span: tape range covered by the tile
+            pixelsPerUnit: tape scale
+            left: tape left position
+            width: tape width
+            paint: function painting the tape between two values
 
+        Returns:
+            QImage
+        """
+        dpr = self.renderRatio()
+        tile = QImage(
+            int(width * dpr),
+            round(span * pixelsPerUnit * dpr),
+            QImage.Format.Format_ARGB32_Premultiplied,
+        )
+        tile.setDevicePixelRatio(dpr)
+        tile.fill(Qt.GlobalColor.transparent)
+
+        qp = self.qp
+        self.qp = QPainter(tile)
+        self.qp.setFont(qp.font())
+        self.setQualityHints()
+        self.qp.translate(-left, 0)
+        paint(low, low + span, lambda value: (low + span - value) * pixelsPerUnit)
         self.qp.end()
+        self.qp = qp
+
+        return tile
+
+    def invalidateStaticLayers(self):
+        """Render the static layers and fonts again on the next paint."""
+        with self.cacheLock:
+            self.staticLayers.clear()
+            self.fonts.clear()
+            self.cacheGeneration += 1
+        self.invalidate()
+        self.updateIfDirty()
+
+    def resizeEvent(self, event):
+        """Resize event overload."""
+        if self.glSurface is not None:
+            self.glSurface.resize(event.size())
+        self.invalidateStaticLayers()
+        QWidget.resizeEvent(self, event)
+
+    def changeEvent(self, event):
+        """Change event overload, the layers and tiles depend on the font and theme."""
+        if event.type() in (
+            QEvent.Type.FontChange,
+            QEvent.Type.PaletteChange,
+            QEvent.Type.StyleChange,
+        ):
+            self.invalidateStaticLayers()
+            tileCache.clear()
+        QWidget.changeEvent(self, event)
 
+    def setPen(self, width, color, style=Qt.PenStyle.SolidLine):
+        """Set the pen color and width."""
+        self.qp.setPen(paintResources.pen(width, color, style))
 
-class pyG5HSIWidget(pyG5Widget):
-    """Generate G5 wdiget view."""
+    def setBrush(self, color):
+        """Set a solid brush of the color."""
+        self.qp.setBrush(paintResources.brush(color))
 
-    def __init__(self, parent=None):
-        """g5Widget Constructor.
+    def setFontSize(self, pixelSize, bold=False):
+        """Set the widget font with the pixel size and weight.
 
         Args:
-            parent: Parent Widget
+            pixelSize: font size in pixels
+            bold: bold font
 
         Returns:
-            self
+            None
         """
-        pyG5Widget.__init__(self, parent)
+        with self.cacheLock:
+            font = self.fonts.get((pixelSize, bold))
+            generation = self.cacheGeneration
+
+        if font is None:
+            font = QFont(self.font())
+            font.setPixelSize(pixelSize)
+            font.setBold(bold)
+            font.setHintingPreference(self.quality["hinting"])
+            with self.cacheLock:
+                if generation == self.cacheGeneration:
+                    self.fonts[(pixelSize, bold)] = font
 
-    def paintEvent(self, event):
-        """Paint the widget."""
-        self.qp = QPainter(self)
+        self.qp.setFont(font)
 
-        greyColor = QColor(128, 128, 128, 255)
-        rotatinghsiCircleRadius = 160
-        hsiCircleRadius = 90
-        hsiTextRadius = 120
-        hsiCenter = 190
-        groundTrackDiamondSize = 7
+    def shape(self, name, build):
+        """Return a polygon of the widget class, built once.
 
-        headingBoxWidth = 50
-        headingBoxHeight = 22
+        Args:
+            name: polygon name
+            build: function returning the list of (x, y) vertices
 
-        font = self.qp.font()
-        font.setPixelSize(headingBoxHeight - 2)
-        font.setBold(True)
-        self.qp.setFont(font)
+        Returns:
+            QPolygonF
+        """
+        return paintResources.polygon((self.__class__.__name__, name), build)
 
-        # Draw the background
-        self.setPen(1, Qt.GlobalColor.black)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.black))
-        self.qp.drawRect(0, 0, g5Width, g5Height)
+    def gradient(self, name, build):
+        """Return a gradient brush of the widget class, built once.
 
-        if self._avionicson == 0:
-            self.setPen(1, Qt.GlobalColor.white)
-            self.qp.drawLine(0, 0, g5Width, g5Height)
-            self.qp.drawLine(0, g5Height, g5Width, 0)
-            self.qp.end()
-            return
+        Args:
+            name: gradient name
+            build: function returning the QGradient
 
-        # Draw the Horizontal Situation Indicator circle
-        self.setPen(2, greyColor)
+        Returns:
+            QBrush
+        """
+        return paintResources.gradient((self.__class__.__name__, name), build)
 
-        # offset the center to the Horizontal Situation Indicator center
-        self.qp.translate(g5CenterX, hsiCenter)
+    def lines(self, name, build):
+        """Return a set of lines of the widget class, built once.
 
-        self.qp.drawArc(
-            -hsiCircleRadius,
-            -hsiCircleRadius,
-            2 * hsiCircleRadius,
-            2 * hsiCircleRadius,
-            0,
-            360 * 16,
-        )
+        Args:
+            name: line set name
+            build: function returning the numpy array of x1, y1, x2, y2 rows
 
-        # Draw the fixed Horizontal Situation Indicator marker
-        hsiPeripheralMarkers = [
-            45,
-            90,
-            135,
-            225,
-            270,
-            315,
-        ]
-        self.setPen(2, Qt.GlobalColor.white)
+        Returns:
+            list of QLineF
+        """
+        return paintResources.lines((self.__class__.__name__, name), build)
 
-        for marker in hsiPeripheralMarkers:
-            self.qp.rotate(-marker)
-            self.qp.drawLine(0, 170, 0, 185)
-            self.qp.rotate(marker)
+    def drawLines(self, lines):
+        """Draw tick rows with a single QPainter call.
 
-        # Draw the RotatingHSI lines and Text
+        Args:
+            lines: numpy array of x1, y1, x2, y2 rows
 
-        # rotate by the current magnetic heading
-        self.qp.rotate(-self._magHeading)
+        Returns:
+            None
+        """
+        self.qp.drawLines(toLines(lines))
 
-        currentHead = 0
-        while currentHead < 360:
-            if (currentHead % 90) == 0:
-                length = 20
-            elif (currentHead % 10) == 0:
-                length = 15
-            else:
-                length = 10
-            self.qp.drawLine(
-                0, rotatinghsiCircleRadius - length, 0, rotatinghsiCircleRadius
-            )
-
-            if currentHead == 0:
-                text = "N"
-            elif currentHead == 90:
-                text = "E"
-            elif currentHead == 180:
-                text = "S"
-            elif currentHead == 270:
-                text = "W"
-            elif (currentHead % 30) == 0:
-                text = "{:2d}".format(int(currentHead / 10))
-            else:
-                text = ""
+    def drawShape(self, polygon, x=0, y=0):
+        """Draw a polygon translated by x, y.
 
-            if len(text):
-                self.qp.translate(0, -hsiTextRadius)
-                self.qp.rotate(+self._magHeading - currentHead)
-                self.qp.drawText(
-                    QRectF(
-                        -self.qp.font().pixelSize() / 2 - 3,
-                        -self.qp.font().pixelSize() / 2,
-                        self.qp.font().pixelSize() + 6,
-                        self.qp.font().pixelSize(),
-                    ),
-                    Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-                    text,
-                )
-                self.qp.rotate(-self._magHeading + currentHead)
-                self.qp.translate(0, hsiTextRadius)
+        Args:
+            polygon: QPolygonF in local coordinates
+            x: translation along x
+            y: translation along y
 
-            self.qp.rotate(+5)
-            currentHead += 5
+        Returns:
+            None
+        """
+        self.qp.translate(x, y)
+        self.qp.drawPolygon(polygon)
+        self.qp.translate(-x, -y)
 
-        # draw the Heading bug
-        self.setPen(1, Qt.GlobalColor.cyan)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.cyan))
+    def drawText(self, rect, flags, text):
+        """Draw text aligned in a rectangle from the shared static text cache.
 
-        self.qp.rotate(180 + self._headingBug)
+        Same as QPainter.drawText with a rectangle and alignment flags, the
+        text is laid out once and reused while the string and font are the
+        same.
 
-        self.qp.drawPolygon(
-            QPolygonF(
-                [
-                    QPointF(-15, rotatinghsiCircleRadius - 3),
-                    QPointF(+15, rotatinghsiCircleRadius - 3),
-                    QPointF(+15, rotatinghsiCircleRadius + 6),
-                    QPointF(+6, rotatinghsiCircleRadius + 6),
-                    QPointF(0, rotatinghsiCircleRadius + 1),
-                    QPointF(-6, rotatinghsiCircleRadius + 6),
-                    QPointF(-15, rotatinghsiCircleRadius + 6),
-                ]
-            )
-        )
+        Args:
+            rect: QRectF or QRect the text is aligned in
+            flags: Qt.AlignmentFlag
+            text: string, lines separated by newlines
 
-        self.setPen(1, Qt.GlobalColor.black)
-        gpscdianonciator = ""
-        if int(self._hsiSource) == 2:
-            cdiSource = "GPS"
-            # 0=OCN, 1=ENR, 2=TERM, 3=DPRT, 4=MAPR, 5=APR, 6=RNPAR, 7=LNAV, 8=LNAV+V, 9=L/VNAV, 10=LP, 11=LPV, 12=LP+V, 13=GLS
-            tableMap = [
-                "OCN",
-                "ENR",
-                "TERM",
-                "DPRT",
-                "MAPR",
-                "APR",
-                "RNPAR",
-                "LNAV",
-                "LNAV+V",
-                "L/VNAV",
-                "LP",
-                "LPV",
-                "LP+V",
-                "GLS",
-                "",
-            ]
-            try:
-                gpscdianonciator = tableMap[int(self._gpshsisens)]
-            except IndexError:
-                gpscdianonciator = tableMap[-1]
-
-            navColor = Qt.GlobalColor.magenta
-            navdft = self._gpsdft
-            navfromto = self._gpsfromto
-            navcrs = self._gpscrs
-            if (self._gpsvnavavailable != -1000) or self._gpsgsavailable:
-                vertAvailable = 1
-            else:
-                vertAvailable = 0
-            gsDev = self._gpsgs
-        elif int(self._hsiSource) == 1:
-            cdiSource = "{}".format(self.getNavTypeString(self._nav2type, "2"))
-            navColor = Qt.GlobalColor.green
-            navdft = self._nav2dft
-            navfromto = self._nav2fromto
-            navcrs = self._nav2crs
-            vertAvailable = self._nav2gsavailable
-            gsDev = self._nav2gs
+        Returns:
+            None
+        """
+        if not len(text):
+            return
+
+        # a QStaticText drawn by several painters off the GUI thread crashes
+        # Qt, the render threads lay the text out on every call
+        if threading.current_thread() is not threading.main_thread():
+            self.qp.drawText(rect, flags, text)
+            return
+
+        staticText, xAlign, yAlign, width, height = textCache.text(
+            text, self.qp.font(), flags
+        )
+        rectWidth = rect.width()
+        rectHeight = rect.height()
+        x = rect.x() + xAlign * (rectWidth - width)
+        y = rect.y() + yAlign * (rectHeight - height)
+
+        # drawText clips the text overflowing the rectangle
+        if width > rectWidth or height > rectHeight:
+            self.qp.save()
+            self.qp.setClipRect(rect, Qt.ClipOperation.IntersectClip)
+            self.qp.drawStaticText(QPointF(x, y), staticText)
+            self.qp.restore()
         else:
-            cdiSource = "{}".format(self.getNavTypeString(self._nav1type, "1"))
-            navColor = Qt.GlobalColor.green
-            navdft = self._nav1dft
-            navfromto = self._nav1fromto
-            navcrs = self._nav1crs
-            vertAvailable = self._nav1gsavailable
-            gsDev = self._nav1gs
+            self.qp.drawStaticText(QPointF(x, y), staticText)
 
-        # bearing 1
-        if int(self._nav1fromto) != 0:
-            self.qp.rotate(90 - self._headingBug + self._nav1bearing)
+    def drawStaleMarker(self, x, y):
+        """Flag the display as showing the snapshot of the last session.
 
-            self.setPen(2, Qt.GlobalColor.cyan)
+        Args:
+            x: marker center x
+            y: marker center y
 
-            # upside
-            self.qp.drawPolyline(
-                QPolygonF(
-                    [
-                        QPointF(rotatinghsiCircleRadius - 25, 0),
-                        QPointF(hsiCircleRadius, 0),
-                    ]
-                )
-            )
-            # backside
-            self.qp.drawPolyline(
-                QPolygonF(
-                    [
-                        QPointF(-rotatinghsiCircleRadius + 25, 0),
-                        QPointF(-hsiCircleRadius, 0),
-                    ]
-                )
-            )
-            # arrow
-            self.qp.drawPolyline(
-                QPolygonF(
-                    [
-                        QPointF(hsiCircleRadius + 20, -10),
-                        QPointF(hsiCircleRadius + 30, 0),
-                        QPointF(hsiCircleRadius + 20, 10),
-                    ]
-                )
-            )
+        Returns:
+            None
+        """
+        if not self._stale:
+            return
 
-            self.qp.rotate(-90 + self._headingBug - self._nav1bearing)
+        self.setFontSize(16, True)
 
-        # bearing 2
-        if int(self._nav2fromto) != 0:
-            self.qp.rotate(90 - self._headingBug + self._nav2bearing)
+        rect = QRectF(x - 32, y - 11, 64, 22)
+        self.setPen(2, Qt.GlobalColor.yellow)
+        self.setBrush(Qt.GlobalColor.black)
+        self.qp.drawRect(rect)
+        self.drawText(
+            rect,
+            Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+            "STALE",
+        )
 
-            self.setPen(2, Qt.GlobalColor.cyan)
+    @Slot(dict)
+    def drefHandler(self, retValues):
+        """Handle the DREF update."""
+        self.stateStore.drefHandler(retValues)
 
-            # backside
-            self.qp.drawPolyline(
-                QPolygonF(
-                    [
-                        QPointF(-hsiCircleRadius, -5),
-                        QPointF(-hsiCircleRadius - 25, -5),
-                        QPointF(-hsiCircleRadius - 30, 0),
-                        QPointF(-rotatinghsiCircleRadius + 25, 0),
-                        QPointF(-hsiCircleRadius - 30, 0),
-                        QPointF(-hsiCircleRadius - 25, +5),
-                        QPointF(-hsiCircleRadius, +5),
-                    ]
-                )
-            )
+    def getNavTypeString(self, navType, navIndex):
+        """getNavTypeString.
 
-            # upside
-            self.qp.drawPolyline(
-                QPolygonF(
-                    [
-                        QPointF(rotatinghsiCircleRadius - 42, -5),
-                        QPointF(hsiCircleRadius, -5),
-                    ]
-                )
-            )
-            self.qp.drawPolyline(
-                QPolygonF(
-                    [
-                        QPointF(rotatinghsiCircleRadius - 42, +5),
-                        QPointF(hsiCircleRadius, +5),
-                    ]
-                )
-            )
-            # arrow
-            self.qp.drawPolyline(
-                QPolygonF(
-                    [
-                        QPointF(hsiCircleRadius + 25, -10),
-                        QPointF(hsiCircleRadius + 35, 0),
-                        QPointF(hsiCircleRadius + 45, 0),
-                        QPointF(hsiCircleRadius + 35, 0),
-                        QPointF(hsiCircleRadius + 25, 10),
-                    ]
-                )
-            )
+        Args:
+            type: type number
 
-            self.qp.rotate(-90 + self._headingBug - self._nav2bearing)
+        Returns:
+            string
+        """
+        return navTypeString(navType, navIndex)
 
-        self.setPen(1, Qt.GlobalColor.black)
-        self.qp.setBrush(QBrush(navColor))
-        # Draw the CDI
-        self.qp.rotate(90 - self._headingBug + navcrs)
 
-        # CDI arrow
-        self.qp.drawPolygon(
-            QPolygonF(
-                [
-                    QPointF(rotatinghsiCircleRadius - 10, 0),
-                    QPointF(rotatinghsiCircleRadius - 40, -20),
-                    QPointF(rotatinghsiCircleRadius - 33, -3),
-                    QPointF(hsiCircleRadius - 10, -3),
-                    QPointF(hsiCircleRadius - 10, 3),
-                    QPointF(rotatinghsiCircleRadius - 33, 3),
-                    QPointF(rotatinghsiCircleRadius - 40, 20),
-                ]
-            )
-        )
-        # CDI bottom bar
-        self.qp.drawPolygon(
-            QPolygonF(
-                [
-                    QPointF(-rotatinghsiCircleRadius + 10, -3),
-                    QPointF(-hsiCircleRadius + 10, -3),
-                    QPointF(-hsiCircleRadius + 10, +3),
-                    QPointF(-rotatinghsiCircleRadius + 10, +3),
-                ]
-            )
-        )
-        # CDI deflection bar
-        if int(navfromto) != 0:
-            hsiDeflectionBound = hsiCircleRadius / 75 * 2
-            deflection = (
-                max(min(navdft, hsiDeflectionBound), -hsiDeflectionBound) / 2 * 75
-            )
-            self.qp.drawPolygon(
-                QPolygonF(
-                    [
-                        QPointF(hsiCircleRadius - 10, deflection - 3),
-                        QPointF(-hsiCircleRadius + 10, deflection - 3),
-                        QPointF(-hsiCircleRadius + 10, deflection + 3),
-                        QPointF(hsiCircleRadius - 10, deflection + 3),
-                    ]
-                )
-            )
+def _make_state_property(index):
+    """Generate a property reading and writing a state store field."""
 
-            # NAV1 FromTo
-            fromToTipX = 65
-            if int(navfromto) == 2:
-                self.qp.rotate(180)
+    def getter(self):
+        if self.snapshot is not None:
+            return self.snapshot[index]
+        return self.stateStore.display[index]
 
-            self.qp.drawPolygon(
-                QPolygonF(
-                    [
-                        QPointF(fromToTipX - 10, 0),
-                        QPointF(fromToTipX - 40, -20),
-                        QPointF(fromToTipX - 30, 0),
-                        QPointF(fromToTipX - 40, 20),
-                    ]
-                )
-            )
-            if int(navfromto) == 2:
-                self.qp.rotate(180)
+    def setter(self, value):
+        self.stateStore.setValue(stateProperties[index][0], value)
 
-        self.qp.rotate(90)
-        # CDI deflection circle
-        self.setPen(2, Qt.GlobalColor.white)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.black))
+    return property(getter, setter)
 
-        for i in [-81, -41, 31, 69]:
-            self.qp.drawArc(
-                QRectF(
-                    i,
-                    -6,
-                    12,
-                    12,
-                ),
-                0,
-                360 * 16,
-            )
 
-        self.qp.resetTransform()
+for _index, _prop in enumerate(stateProperties):
+    setattr(pyG5Widget, "_{}".format(_prop[0]), _make_state_property(_index))
 
-        font = self.qp.font()
-        font.setPixelSize(15)
-        font.setBold(False)
-        self.qp.setFont(font)
-        if int(self._hsiSource) == 2:
-            self.setPen(2, Qt.GlobalColor.magenta)
-        else:
-            self.setPen(2, Qt.GlobalColor.green)
 
-        self.qp.drawText(
-            QRectF(g5CenterX - 70, hsiCenter - 50, 65, 18),
-            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
-            cdiSource,
-        )
+secWidth = 800
+secHeight = 480
 
-        if len(gpscdianonciator):
-            self.qp.drawText(
-                QRectF(g5CenterX + 25, hsiCenter - 50, 65, 18),
-                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
-                gpscdianonciator,
-            )
+# flaps and trim indicator pointer, right edge at x = 0
+pointerShape = [(0, 0), (0, 20), (-30, 20), (-40, 10), (-30, 0), (0, 0)]
 
-        # Draw the heading Bug indicator bottom corner
-        self.setPen(2, Qt.GlobalColor.gray)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.black))
 
-        headingWidth = 105
-        headingHeigth = 30
-        self.qp.drawRect(QRectF(g5Width, g5Height, -headingWidth, -headingHeigth))
+class pyG5SecondaryWidget(pyG5Widget):
+    """Generate G5 wdiget view."""
 
-        self.setPen(2, Qt.GlobalColor.cyan)
-        # draw the bug symbol
-        self.setPen(1, Qt.GlobalColor.cyan)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.cyan))
+    stateFields = (
+        "avionicson",
+        "flaps",
+        "trims",
+        "xpdrMode",
+        "xpdrCode",
+        "carbheat",
+        "fuelpump",
+        "fuelSel",
+    )
+
+    # panel areas, including their labels and outlines
+    flapsArea = QRect(619, 19, 133, 442)
+    trimArea = QRect(459, 19, 133, 442)
+    xpdrArea = QRect(18, 18, 424, 44)
+    carbArea = QRect(18, 78, 84, 124)
+    fuelPumpArea = QRect(18, 178, 84, 164)
+    fuelFeedArea = QRect(119, 79, 322, 262)
+    advisoryArea = QRect(19, 359, 422, 102)
+
+    instrumentName = "secondary"
+    frameRate = 5
+    framePriority = 2
+
+    fieldRegions = {
+        "flaps": (flapsArea,),
+        "trims": (trimArea,),
+        "xpdrMode": (xpdrArea,),
+        "xpdrCode": (xpdrArea,),
+        "carbheat": (carbArea,),
+        "fuelpump": (fuelPumpArea,),
+        "fuelSel": (fuelFeedArea,),
+    }
 
-        self.qp.drawPolygon(
-            QPolygonF(
-                [
-                    QPointF(381, 336),
-                    QPointF(381, 354),
-                    QPointF(387, 354),
-                    QPointF(387, 349),
-                    QPointF(382, 346),
-                    QPointF(382, 344),
-                    QPointF(387, 341),
-                    QPointF(387, 336),
-                ]
-            )
-        )
+    xpdrCodeSignal = Signal(int)
+    xpdrModeSignal = Signal(int)
 
-        self.qp.drawText(
-            QRectF(412, 336, 65, 18),
-            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
-            "{:03d}˚".format(int(self._headingBug)),
-        )
+    def __init__(self, parent=None, stateStore=None):
+        """g5Widget Constructor.
 
-        # draw the dist box
-        if (
-            int(self._hsiSource) == 2
-            or (int(self._hsiSource) == 1 and int(self._nav2fromto) != 0)
-            or (int(self._hsiSource) == 0 and int(self._nav1fromto) != 0)
-        ):
-            font.setPixelSize(12)
-            font.setBold(False)
-            self.qp.setFont(font)
-            distRect = QRectF(g5Width - 105, 0, 105, 45)
+        Args:
+            parent: Parent Widget
+            stateStore: shared pyG5StateStore, a private one is created if None
 
-            self.setPen(2, greyColor)
-            self.qp.setBrush(QBrush(Qt.GlobalColor.black))
-            self.qp.drawRect(distRect)
+        Returns:
+            self
+        """
+        pyG5Widget.__init__(self, parent, stateStore)
 
-            self.qp.drawText(
-                distRect,
-                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop,
-                "Dist NM",
-            )
+        # the advisory panel is repainted when the active alerts change
+        self.alertEngine = pyG5AlertEngine(self.stateStore, parent=self)
+        self.alertEngine.alertsChanged.connect(self.alertsChanged)
 
-            font.setPixelSize(18)
-            font.setBold(True)
-            self.qp.setFont(font)
-            self.setPen(1, navColor)
-            if int(self._hsiSource) == 2:
-                dist = self._gpsdmedist
-            elif int(self._hsiSource) == 1:
-                dist = self._nav2dme
-            else:
-                dist = self._nav1dme
+        self.xpdrKeyboard = False
 
-            distRect = QRectF(g5Width - 105, 12, 105, 45 - 12)
-            self.qp.drawText(
-                distRect,
-                Qt.AlignmentFlag.AlignCenter,
-                "{}".format(round(dist, 1)),
-            )
+        self.setFixedSize(secWidth, secHeight)
 
-        # set default font size
-        font = self.qp.font()
-        font.setPixelSize(18)
-        font.setBold(True)
-        self.qp.setFont(font)
+        self.xpdrXbase = 20
+        self.xpdrYbase = 20
 
-        # draw the wind box
-        self.setPen(2, greyColor)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.black))
+        self.xpdrwidth = 160
+        self.xpdrheight = 40
 
-        self.qp.drawRect(0, 0, 105, 45)
+        self.xpdrRect = QRectF(
+            self.xpdrXbase, self.xpdrYbase, self.xpdrwidth, self.xpdrheight
+        )
 
-        self.setPen(1, Qt.GlobalColor.white)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.white))
+        self.xpdrKeyXbase = 20
+        self.xpdrKeyYbase = self.xpdrYbase + self.xpdrheight
+
+        self.xpdrKeyWidth = 420
+        self.xpdrKeyHeight = secHeight - (self.xpdrYbase + self.xpdrheight) - 20
 
-        self.qp.translate(25, 25)
+        self.xpdrkeyRect = QRectF(
+            self.xpdrKeyXbase, self.xpdrKeyYbase, self.xpdrKeyWidth, self.xpdrKeyHeight
+        )
 
-        self.qp.rotate(180 - self._magHeading + self._windDirection)
+        self.xpdrPos = 3
 
-        self.qp.drawPolygon(
-            QPolygonF(
-                [
-                    QPointF(-5, 0),
-                    QPointF(0, -10),
-                    QPointF(5, 0),
-                    QPointF(2, 0),
-                    QPointF(2, 10),
-                    QPointF(-2, 10),
-                    QPointF(-2, 0),
-                ]
+        self.keyArea = []
+
+        index = 0
+        for i in [1, 2, 3, 4]:
+            rect = QRectF(
+                self.xpdrKeyXbase + 26.125 + index * 95,
+                self.xpdrKeyYbase + 20,
+                82.5,
+                82.5,
             )
-        )
+            self.keyArea.append([rect, i])
+            index += 1
 
-        self.qp.resetTransform()
+        index = 0
+        for i in [5, 6, 7, 0]:
+            rect = QRectF(
+                self.xpdrKeyXbase + 26.125 + index * 95,
+                self.xpdrKeyYbase + 20 + 95 + 20,
+                82.5,
+                82.5,
+            )
+            self.keyArea.append([rect, i])
+            index += 1
 
-        self.qp.drawText(
-            QRectF(50, 2, 50, 20),
-            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
-            "{:03d}˚".format(int(self._windDirection)),
+        self.keyCtrlArea = []
+        self.keyCtrlArea.append(
+            [
+                QRectF(
+                    self.xpdrKeyXbase,
+                    self.xpdrKeyYbase + self.xpdrKeyHeight / 2 + 40,
+                    self.xpdrKeyWidth / 2,
+                    self.xpdrKeyHeight / 4 - 20,
+                ),
+                "OFF",
+                0,
+            ]
         )
-
-        self.qp.drawText(
-            QRectF(50, 22, 50, 20),
-            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
-            "{:02d}kt".format(int(self._windSpeed * mstokt)),
+        self.keyCtrlArea.append(
+            [
+                QRectF(
+                    self.xpdrKeyXbase,
+                    self.xpdrKeyYbase + self.xpdrKeyHeight * 3 / 4 + 20,
+                    self.xpdrKeyWidth / 2,
+                    self.xpdrKeyHeight / 4 - 20,
+                ),
+                "ON",
+                2,
+            ]
         )
 
-        # Draw the magnetic heading box
-        self.setPen(2, greyColor)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.black))
-        self.qp.drawPolygon(
-            QPolygonF(
-                [
-                    QPointF(g5CenterX - headingBoxWidth / 2, 1),
-                    QPointF(g5CenterX - headingBoxWidth / 2, headingBoxHeight),
-                    QPointF(g5CenterX - 6, headingBoxHeight),
-                    QPointF(g5CenterX, headingBoxHeight + 8),
-                    QPointF(g5CenterX + 6, headingBoxHeight),
-                    QPointF(g5CenterX + headingBoxWidth / 2, headingBoxHeight),
-                    QPointF(g5CenterX + headingBoxWidth / 2, 1),
-                ]
-            )
+        self.keyCtrlArea.append(
+            [
+                QRectF(
+                    self.xpdrKeyXbase + self.xpdrKeyWidth / 2,
+                    self.xpdrKeyYbase + self.xpdrKeyHeight / 2 + 40,
+                    self.xpdrKeyWidth / 2,
+                    self.xpdrKeyHeight / 4 - 20,
+                ),
+                "STBY",
+                1,
+            ]
         )
 
-        self.qp.drawText(
-            QRectF(
-                g5CenterX - headingBoxWidth / 2, 1, headingBoxWidth, headingBoxHeight
-            ),
-            Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-            "{:03d}˚".format(int(self._magHeading)),
+        self.keyCtrlArea.append(
+            [
+                QRectF(
+                    self.xpdrKeyXbase + self.xpdrKeyWidth / 2,
+                    self.xpdrKeyYbase + self.xpdrKeyHeight * 3 / 4 + 20,
+                    self.xpdrKeyWidth / 2,
+                    self.xpdrKeyHeight / 4 - 20,
+                ),
+                "ALT",
+                3,
+            ]
         )
 
-        # Draw the ground track
-        self.setPen(0, Qt.GlobalColor.transparent)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.magenta))
-        self.qp.translate(g5CenterX, hsiCenter)
-        self.qp.rotate(-self._magHeading + self._groundTrack)
-        self.qp.drawPolygon(
-            QPolygonF(
-                [
-                    QPointF(
-                        -groundTrackDiamondSize,
-                        -rotatinghsiCircleRadius - groundTrackDiamondSize,
-                    ),
-                    QPointF(
-                        +groundTrackDiamondSize,
-                        -rotatinghsiCircleRadius - groundTrackDiamondSize,
+    def alertsChanged(self):
+        """Flag the advisory panel for repaint when the active alerts changed."""
+        self.invalidate(self.advisoryArea)
+
+    def mousePressEvent(self, event):
+        """Mouse Pressed event overload."""
+        if self._avionicson:
+            if self.xpdrRect.contains(event.position()):
+                self.xpdrKeyboard = not self.xpdrKeyboard
+
+            elif not self.xpdrKeyboard and self.advisoryArea.contains(
+                event.position().toPoint()
+            ):
+                # a click on the advisory panel acknowledges the alerts
+                self.alertEngine.acknowledge()
+
+            else:
+                if self.xpdrkeyRect.contains(event.position()):
+                    for key in self.keyArea:
+                        if key[0].contains(event.position()):
+                            # the input is a BCD value received as integer.
+                            # First step is to turn it into a real integer
+                            codestr = "{:04d}".format(int(self._xpdrCode))
+                            code = 0
+                            for idx, c in enumerate(codestr):
+                                code |= int(c) << (4 * (3 - idx))
+
+                            # code is the integer value of the string
+                            # now apply on code the new number
+                            code = code & ((0xF << (4 * self.xpdrPos)) ^ 0xFFFF)
+                            code = code | (key[1] << (4 * self.xpdrPos))
+
+                            # shift the position we update
+                            self.xpdrPos = (self.xpdrPos - 1) % 4
+
+                            # emit the new code value
+                            xpdrCode = int("{:04x}".format(code))
+                            self._xpdrCode = xpdrCode
+                            self.xpdrCodeSignal.emit(xpdrCode)
+
+                    for key in self.keyCtrlArea:
+                        if key[0].contains(event.position()):
+                            self.xpdrMode(key[2])
+                            self.xpdrModeSignal.emit(key[2])
+                            self.xpdrKeyboard = False
+                else:
+                    self.xpdrKeyboard = False
+
+            if not self.xpdrKeyboard:
+                self.xpdrPos = 3
+
+        # the keyboard is not a state field, and update() would only
+        # present the last frame when threaded
+        self.invalidate()
+        self.updateIfDirty()
+
+    def paintEvent(self, event):
+        """Paint the widget."""
+        self.beginPaint(event)
+
+        # Draw the background
+        self.setPen(1, Qt.GlobalColor.black)
+        self.setBrush(Qt.GlobalColor.black)
+        self.qp.drawRect(0, 0, secWidth, secHeight)
+
+        self.setPen(1, Qt.GlobalColor.white)
+        self.setBrush(Qt.GlobalColor.black)
+
+        # flaps settings
+        flapXBase = 620
+        flapYBase = 20
+        flapHeight = secHeight - 40
+        flapWidth = 130
+
+        if self.exposed(self.flapsArea):
+            self.setPen(1, Qt.GlobalColor.white)
+            self.setBrush(Qt.GlobalColor.white)
+            self.setFontSize(30, True)
+
+            # draw the title
+            self.drawText(
+                QRectF(
+                    flapXBase,
+                    flapYBase,
+                    flapWidth,
+                    40,
+                ),
+                Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignTop,
+                "FLAPS",
+            )
+
+            self.setFontSize(20)
+
+            # draw the flaps angle legend
+            for i in range(0, 4):
+                self.drawText(
+                    QRectF(
+                        flapXBase,
+                        flapYBase + 40 + int((flapHeight) * i / 4),
+                        40,
+                        40,
                     ),
-                    QPointF(+0, -rotatinghsiCircleRadius),
-                ]
+                    Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+                    formatCache.format("{:02d}°", 10 * i),
+                )
+
+            # draw the indicator rectangle
+            self.setBrush(Qt.GlobalColor.black)
+            self.qp.drawRect(flapXBase + 90, flapYBase + 40, 40, flapHeight - 40)
+
+            # draw the indicator legend white
+            self.setPen(1, Qt.GlobalColor.white)
+            self.setBrush(Qt.GlobalColor.white)
+            rect = QRectF(
+                flapXBase + 50,
+                flapYBase + 40 + int((flapHeight - 40) / 3),
+                40,
+                flapHeight - 40 - +int((flapHeight - 40) / 3),
             )
-        )
-        self.setPen(3, greyColor, Qt.PenStyle.DashLine)
-        self.qp.drawLine(0, 0, 0, -rotatinghsiCircleRadius)
-        self.qp.resetTransform()
+            self.qp.drawRect(rect)
+            self.setPen(1, Qt.GlobalColor.black)
+            self.setBrush(Qt.GlobalColor.black)
+            self.drawText(
+                rect,
+                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+                "8\n5",
+            )
+
+            # draw the indicator legend cyan
+            self.setPen(1, Qt.GlobalColor.cyan)
+            self.setBrush(Qt.GlobalColor.cyan)
+            rect = QRectF(
+                flapXBase + 50, flapYBase + 40, 40, int((flapHeight - 40) / 3 + 20)
+            )
+            self.qp.drawRect(rect)
+            self.setPen(1, Qt.GlobalColor.black)
+            self.setBrush(Qt.GlobalColor.black)
+            self.drawText(
+                rect,
+                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+                "1\n1\n0",
+            )
+
+            self.setPen(1, Qt.GlobalColor.white)
+            self.setBrush(Qt.GlobalColor.white)
+
+            self.drawShape(
+                self.shape("pointer", lambda: pointerShape),
+                flapXBase + flapWidth,
+                flapYBase + 50 + self._flaps * int((flapHeight - 100)),
+            )
+
+        # trim settings
+        trimXBase = 460
+        trimYBase = 20
+        trimHeight = secHeight - 40
+        trimWidth = 130
+
+        if self.exposed(self.trimArea):
+            self.setPen(1, Qt.GlobalColor.white)
+            self.setBrush(Qt.GlobalColor.white)
+            self.setFontSize(30, True)
+
+            # draw the title
+            self.drawText(
+                QRectF(
+                    trimXBase + 40,
+                    trimYBase,
+                    90,
+                    40,
+                ),
+                Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignTop,
+                "TRIM",
+            )
+
+            self.setFontSize(20)
+
+            # draw the flaps angle legend
+            self.drawText(
+                QRectF(
+                    trimXBase,
+                    trimYBase + 40 + int((trimHeight) / 2 - 40),
+                    80,
+                    40,
+                ),
+                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+                "Take-off",
+            )
+
+            # draw the indicator rectangle
+            self.setBrush(Qt.GlobalColor.black)
+            self.qp.drawRect(trimXBase + 90, trimYBase + 40, 40, trimHeight - 40)
+
+            self.setPen(1, Qt.GlobalColor.white)
+            self.setBrush(Qt.GlobalColor.white)
+
+            trimShift = (trimHeight - 60) * (self._trims / 2 + 0.5)
+
+            self.drawShape(
+                self.shape("pointer", lambda: pointerShape),
+                trimXBase + trimWidth,
+                trimYBase + 40 + trimShift,
+            )
+
+        # sqawk code and status
+        if self._avionicson and self.exposed(self.xpdrArea):
+            self.setFontSize(self.xpdrheight - 6, True)
+
+            # draw the indicator rectangle
+            self.setPen(2, Qt.GlobalColor.white)
+            self.setBrush(Qt.GlobalColor.white)
+            self.qp.drawRect(self.xpdrRect)
+
+            self.setPen(1, Qt.GlobalColor.black)
+            self.setBrush(Qt.GlobalColor.black)
+            self.drawText(
+                self.xpdrRect,
+                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+                "XPDR",
+            )
+
+            self.setPen(2, Qt.GlobalColor.white)
+            self.setBrush(Qt.GlobalColor.black)
+            rect = QRectF(
+                self.xpdrXbase + self.xpdrwidth,
+                self.xpdrYbase,
+                420 - self.xpdrwidth,
+                self.xpdrheight,
+            )
+            self.qp.drawRect(rect)
+
+            self.setPen(1, Qt.GlobalColor.white)
+            self.setBrush(Qt.GlobalColor.white)
+
+            if int(self._xpdrMode) == 0:
+                xpdrMode = "OFF"
+            elif int(self._xpdrMode) == 1:
+                xpdrMode = "STDBY"
+            elif int(self._xpdrMode) == 2:
+                xpdrMode = "ON"
+            elif int(self._xpdrMode) == 3:
+                xpdrMode = "ALT"
+            elif int(self._xpdrMode) == 4:
+                xpdrMode = "TEST"
+
+            self.drawText(
+                rect,
+                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+                formatCache.format("{:04d} {}", int(self._xpdrCode), xpdrMode),
+            )
+
+        if self.xpdrKeyboard:
+            self.setFontSize(self.xpdrheight - 6, True)
+
+            self.setPen(2, Qt.GlobalColor.white)
+            self.setBrush(Qt.GlobalColor.black)
+            self.qp.drawRect(self.xpdrkeyRect)
+
+            for key in self.keyArea:
+                self.qp.drawEllipse(key[0])
+                self.drawText(
+                    key[0],
+                    Qt.AlignmentFlag.AlignCenter,
+                    formatCache.format("{:01d}", key[1]),
+                )
+
+            for key in self.keyCtrlArea:
+                self.qp.drawRect(key[0])
+                self.drawText(
+                    key[0],
+                    Qt.AlignmentFlag.AlignCenter,
+                    key[1],
+                )
+
+        else:
+            # carb heat status
+            carbXbase = 20
+            carbYbase = self.xpdrYbase + self.xpdrheight + 20
+
+            carbwidth = 80
+            carbheight = 80
+
+            if self.exposed(self.carbArea):
+                self.setFontSize(20)
+
+                rect = QRectF(carbXbase, carbYbase, carbwidth, 40)
+
+                self.drawText(
+                    rect,
+                    Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+                    "CARB",
+                )
+
+                self.setPen(2, Qt.GlobalColor.white)
+                if self._carbheat > 0.1:
+                    self.setBrush(Qt.GlobalColor.green)
+                else:
+                    self.setBrush(Qt.GlobalColor.black)
+
+                rect = QRectF(carbXbase, carbYbase + 40, carbwidth, carbheight)
+
+                self.qp.drawEllipse(rect)
+
+            # fuel pump status
+            fuelXbase = 20
+            fuelYbase = carbYbase + carbheight + 20
+
+            fuelwidth = 80
+            fuelheight = 80
+
+            if self.exposed(self.fuelPumpArea):
+                self.setFontSize(20)
+
+                rect = QRectF(fuelXbase, fuelYbase, fuelwidth, 100)
+
+                self.drawText(
+                    rect,
+                    Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+                    "FUEL\nPUMP",
+                )
+
+                self.setPen(2, Qt.GlobalColor.white)
+                self.setBrush(Qt.GlobalColor.green)
+
+                rect = QRectF(fuelXbase, fuelYbase + 80, fuelwidth, fuelheight)
+
+                if self._fuelpump > 0 and self._avionicson:
+                    self.setBrush(Qt.GlobalColor.green)
+                else:
+                    self.setBrush(Qt.GlobalColor.black)
+
+                self.qp.drawEllipse(rect)
+
+            # fuel feed settings
+
+            ffXBase = 120
+            ffYBase = carbYbase + 40
+
+            ffWdidth = 440 - ffXBase
+            ffHeight = 220
+
+            if self.exposed(self.fuelFeedArea):
+                self.setFontSize(20)
+
+                self.setPen(1, Qt.GlobalColor.white)
+                self.setBrush(Qt.GlobalColor.white)
+                rect = QRectF(ffXBase, carbYbase, ffWdidth, 20)
+                self.drawText(
+                    rect,
+                    Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+                    "FUEL FEED",
+                )
+
+                self.setPen(1, Qt.GlobalColor.white)
+                self.setBrush(Qt.GlobalColor.black)
+
+                rect = QRectF(ffXBase, ffYBase, ffWdidth, ffHeight)
+                self.qp.drawRect(rect)
+
+                self.drawText(
+                    rect,
+                    Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop,
+                    "BOTH",
+                )
+                self.drawText(
+                    rect,
+                    Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignBottom,
+                    "OFF",
+                )
+
+                self.drawText(
+                    rect,
+                    Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                    "LEFT",
+                )
+
+                self.drawText(
+                    rect,
+                    Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                    "RIGHT",
+                )
+
+                self.qp.translate(rect.center())
+
+                if self._fuelSel == 0:
+                    self.qp.rotate(180)
+                elif self._fuelSel == 1:
+                    self.qp.rotate(-90)
+                elif self._fuelSel == 2:
+                    self.qp.rotate(45)
+                elif self._fuelSel == 3:
+                    self.qp.rotate(90)
+                elif self._fuelSel == 4:
+                    self.qp.rotate(0)
+                else:
+                    self.qp.rotate(0)
+
+                brect = QRectF(-50, -50, 100, 100)
+                self.qp.drawEllipse(brect)
+
+                self.setPen(1, Qt.GlobalColor.white)
+                self.setBrush(Qt.GlobalColor.white)
+                self.qp.drawPolygon(
+                    self.shape(
+                        "fuelSelector",
+                        lambda: [
+                            (-10, +50),
+                            (+10, +50),
+                            (+10, -50),
+                            (0, -70),
+                            (-10, -50),
+                        ],
+                    )
+                )
+
+                self.setPen(1, Qt.GlobalColor.black)
+                self.setBrush(Qt.GlobalColor.black)
+                brect = QRectF(-5, -5, 10, 10)
+                self.qp.drawEllipse(brect)
+
+                self.resetPaintTransform()
+
+            # advisory panel (low voltage)
+            advXBase = 20
+            advYBase = fuelYbase + fuelheight + 100
+
+            advWdidth = 420
+            advHeight = 100
+
+            if self.exposed(self.advisoryArea):
+                self.setFontSize(20)
+
+                self.setPen(1, advisoryGridColor)
+                self.setBrush(Qt.GlobalColor.black)
+
+                rect = QRectF(advXBase, advYBase, advWdidth, advHeight)
+                self.qp.drawRect(rect)
+
+                # each rule keeps its annunciator cell, in the rule order
+                rules = self.alertEngine.rules
+                active = self.alertEngine.active
+                cells = [
+                    QRectF(
+                        advXBase + j * advWdidth / 4,
+                        advYBase + i * advHeight / 2,
+                        advWdidth / 4,
+                        advHeight / 2,
+                    )
+                    for i in range(0, 2)
+                    for j in range(0, 4)
+                ]
+
+                # the grid and the inactive annunciators, greyed out
+                for idx, advrect in enumerate(cells):
+                    self.qp.drawRect(advrect)
+
+                    if idx < len(rules) and rules[idx] not in active:
+                        self.drawText(
+                            advrect,
+                            Qt.AlignmentFlag.AlignHCenter
+                            | Qt.AlignmentFlag.AlignVCenter,
+                            rules[idx]["text"],
+                        )
+
+                # the active alerts lit in their cell
+                for rule in active:
+                    self.setPen(1, rule["color"])
+                    self.drawText(
+                        cells[rules.index(rule)],
+                        Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+                        rule["text"],
+                    )
+
+        self.endPaint()
+
+
+# compass card heading: label
+compassLabels = [
+    (
+        heading,
+        {0: "N", 90: "E", 180: "S", 270: "W"}.get(
+            heading, "{:2d}".format(heading // 10)
+        ),
+    )
+    for heading in range(0, 360, 30)
+]
+
+
+class pyG5HSIWidget(pyG5Widget):
+    """Generate G5 wdiget view."""
+
+    stateFields = (
+        "avionicson",
+        "magHeading",
+        "headingBug",
+        "groundTrack",
+        "windDirection",
+        "windSpeed",
+        "hsiSource",
+        "gpshsisens",
+        "gpsdft",
+        "gpsfromto",
+        "gpscrs",
+        "gpsgs",
+        "gpsgsavailable",
+        "gpsvnavavailable",
+        "gpsdmedist",
+        "nav1type",
+        "nav1dft",
+        "nav1fromto",
+        "nav1crs",
+        "nav1gs",
+        "nav1gsavailable",
+        "nav1bearing",
+        "nav1dme",
+        "nav2type",
+        "nav2dft",
+        "nav2fromto",
+        "nav2crs",
+        "nav2gs",
+        "nav2gsavailable",
+        "nav2bearing",
+        "nav2dme",
+        "stale",
+    )
+
+    derivedValues = {
+        "navSource": (navSourceInputs, deriveNavSource),
+        "navTypes": (navTypesInputs, deriveNavTypes),
+        "wind": (windInputs, deriveWind),
+    }
+
+    trendFields = ("magHeading",)
+
+    # compass center ordinate and label radius
+    hsiCenter = 190
+    hsiTextRadius = 120
+
+    # compass card and box areas, including their outlines
+    cardArea = QRect(70, 20, 340, 340)
+    headingBugArea = QRect(373, 328, 107, 32)
+    distArea = QRect(373, 0, 107, 47)
+    windArea = QRect(0, 0, 107, 47)
+
+    instrumentName = "hsi"
+    frameRate = 30
+    framePriority = 1
+
+    fieldRegions = {
+        "headingBug": (cardArea, headingBugArea),
+        "groundTrack": (cardArea,),
+        "windDirection": (windArea,),
+        "windSpeed": (windArea,),
+        "gpsdmedist": (distArea,),
+        "nav1dme": (distArea,),
+        "nav2dme": (distArea,),
+        "nav1bearing": (cardArea,),
+        "nav2bearing": (cardArea,),
+    }
+
+    def __init__(self, parent=None, stateStore=None):
+        """g5Widget Constructor.
+
+        Args:
+            parent: Parent Widget
+            stateStore: shared pyG5StateStore, a private one is created if None
+
+        Returns:
+            self
+        """
+        pyG5Widget.__init__(self, parent, stateStore)
 
-        # draw the aircraft
-        self.setPen(1, Qt.GlobalColor.white)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.white))
+    def paintHSIFrame(self):
+        """Paint the fixed compass circle and the 45° markers."""
+        hsiCircleRadius = 90
 
-        self.qp.drawPolygon(
-            QPolygonF(
-                [
-                    QPointF(240, 163),
-                    QPointF(235, 169),
-                    QPointF(235, 180),
-                    QPointF(215, 195),
-                    QPointF(215, 200),
-                    QPointF(235, 195),
-                    QPointF(235, 205),
-                    QPointF(227, 213),
-                    QPointF(227, 217),
-                    QPointF(240, 213),
-                    QPointF(253, 217),
-                    QPointF(253, 213),
-                    QPointF(245, 205),
-                    QPointF(245, 195),
-                    QPointF(265, 200),
-                    QPointF(265, 195),
-                    QPointF(245, 180),
-                    QPointF(245, 169),
-                ]
-            )
+        # Draw the Horizontal Situation Indicator circle
+        self.setPen(2, greyColor)
+
+        self.qp.drawArc(
+            -hsiCircleRadius,
+            -hsiCircleRadius,
+            2 * hsiCircleRadius,
+            2 * hsiCircleRadius,
+            0,
+            360 * 16,
         )
 
-        # draw the GlideScope
-        gsWidth = 16
-        gsHeigth = 192
-        gsCircleRad = 10
-        gsFromLeft = 20
-        gsDiamond = 16
+        # Draw the fixed Horizontal Situation Indicator marker
+        hsiPeripheralMarkers = [
+            45,
+            90,
+            135,
+            225,
+            270,
+            315,
+        ]
+        self.setPen(2, Qt.GlobalColor.white)
 
-        if vertAvailable:
-            # Vertical guidance source
-            rect = QRectF(
-                g5Width - gsFromLeft - gsWidth,
-                hsiCenter - gsHeigth / 2 - 15,
-                gsWidth,
-                15,
-            )
+        self.drawLines(radialTicks(90 - np.array(hsiPeripheralMarkers), 170, 185))
 
-            font.setPixelSize(12)
-            self.qp.setFont(font)
-            self.setPen(1, navColor)
+    def paintCompassCard(self):
+        """Paint the compass card ticks, heading up."""
+        rotatinghsiCircleRadius = 160
 
-            vertSourceTxt = "G"
-            if int(self._hsiSource) == 2 and self._gpsgsavailable == 0:
-                vertSourceTxt = "V"
+        self.setPen(2, Qt.GlobalColor.white)
 
-            self.qp.drawText(
-                rect,
-                Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter,
-                vertSourceTxt,
+        headings = np.arange(0, 360, 5)
+        headings = headings[self.keepTicks(headings % 10 == 0)]
+        length = np.where(headings % 90 == 0, 20, np.where(headings % 10 == 0, 15, 10))
+        self.drawLines(
+            radialTicks(
+                headings + 90,
+                rotatinghsiCircleRadius - length,
+                rotatinghsiCircleRadius,
             )
+        )
 
-            self.setPen(2, greyColor)
-            self.qp.setBrush(QBrush(Qt.GlobalColor.transparent))
-
-            self.qp.drawRect(rect)
+    def paintCompassLabel(self, rect, text):
+        """Paint a compass card label.
 
-            # main rectangle
-            self.qp.drawRect(
-                QRectF(
-                    g5Width - gsFromLeft - gsWidth,
-                    hsiCenter - gsHeigth / 2,
-                    gsWidth,
-                    gsHeigth,
-                )
-            )
+        Args:
+            rect: label rectangle
+            text: label text
 
-            self.qp.drawLine(
-                g5Width - gsFromLeft - gsWidth,
-                hsiCenter,
-                g5Width - gsFromLeft,
-                hsiCenter,
-            )
+        Returns:
+            None
+        """
+        self.setPen(2, Qt.GlobalColor.white)
+        self.drawText(
+            rect, Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter, text
+        )
 
-            for offset in [-70, -35, 35, 70]:
-                self.qp.drawEllipse(
-                    QPointF(
-                        int(g5Width - gsFromLeft - gsWidth / 2),
-                        int(hsiCenter + offset),
-                    ),
-                    gsCircleRad / 2,
-                    gsCircleRad / 2,
-                )
+    def compassLabelOffset(self, heading):
+        """Return the offset of a compass label from the compass center.
 
-            self.setPen(1, Qt.GlobalColor.black)
-            self.qp.setBrush(QBrush(navColor))
+        Args:
+            heading: label heading
 
-            self.qp.translate(
-                g5Width - gsFromLeft - gsWidth, hsiCenter + gsDev / 2.5 * gsHeigth / 2
-            )
-            self.qp.drawPolygon(
-                QPolygonF(
-                    [
-                        QPointF(0, 0),
-                        QPointF(gsDiamond / 2, gsDiamond / 2),
-                        QPointF(gsDiamond, 0),
-                        QPointF(gsDiamond / 2, -gsDiamond / 2),
-                    ]
-                )
-            )
+        Returns:
+            (x, y) in whole pixels
+        """
+        angle = radians(heading - self._magHeading)
+        return (
+            round(self.hsiTextRadius * sin(angle)),
+            round(-self.hsiTextRadius * cos(angle)),
+        )
 
-            self.qp.resetTransform()
+    def paintCardPointers(self):
+        """Paint the heading bug, the bearing pointers and the CDI, heading up."""
+        rotatinghsiCircleRadius = 160
+        hsiCircleRadius = 90
 
-        crsBoxHeight = 30
-        crsBoxWidth = 105
+        # draw the Heading bug
+        self.setPen(1, Qt.GlobalColor.cyan)
+        self.setBrush(Qt.GlobalColor.cyan)
 
-        # draw the Selected Nav Bearing type
-        self.setPen(2, greyColor)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.black))
+        self.qp.rotate(180 + self._headingBug)
 
-        if int(self._nav1fromto) != 0:
-            # draw the contour
-            self.qp.drawPolyline(
-                QPolygonF(
-                    [
-                        QPointF(0, g5Height - crsBoxHeight),
-                        QPointF(0, g5Height - 3 * crsBoxHeight),
-                        QPointF(60, g5Height - 3 * crsBoxHeight),
-                    ]
-                )
+        self.qp.drawPolygon(
+            self.shape(
+                "headingBug",
+                lambda: [
+                    (-15, rotatinghsiCircleRadius - 3),
+                    (+15, rotatinghsiCircleRadius - 3),
+                    (+15, rotatinghsiCircleRadius + 6),
+                    (+6, rotatinghsiCircleRadius + 6),
+                    (0, rotatinghsiCircleRadius + 1),
+                    (-6, rotatinghsiCircleRadius + 6),
+                    (-15, rotatinghsiCircleRadius + 6),
+                ],
             )
+        )
 
-            # draw the contour arc
-            self.qp.drawArc(
-                QRectF(g5Width / 2 - 195, g5Height / 2 - 185, 390, 390),
-                3268,
-                350,
-            )
+        self.setPen(1, Qt.GlobalColor.black)
+        navSource = self.derived("navSource")
+        navColor = navSource["color"]
+        navdft = navSource["dft"]
+        navfromto = navSource["fromto"]
+        navcrs = navSource["crs"]
+
+        # bearing 1
+        if int(self._nav1fromto) != 0:
+            self.qp.rotate(90 - self._headingBug + self._nav1bearing)
 
-            # set color to cyan and draw the bearing symbol
             self.setPen(2, Qt.GlobalColor.cyan)
 
+            # upside
             self.qp.drawPolyline(
-                QPolygonF(
-                    [
-                        QPointF(10, g5Height - 2.5 * crsBoxHeight),
-                        QPointF(50, g5Height - 2.5 * crsBoxHeight),
-                    ]
+                self.shape(
+                    "bearing1Head",
+                    lambda: [(rotatinghsiCircleRadius - 25, 0), (hsiCircleRadius, 0)],
                 )
             )
+            # backside
             self.qp.drawPolyline(
-                QPolygonF(
-                    [
-                        QPointF(30, g5Height - 2.8 * crsBoxHeight),
-                        QPointF(40, g5Height - 2.5 * crsBoxHeight),
-                        QPointF(30, g5Height - 2.2 * crsBoxHeight),
-                    ]
+                self.shape(
+                    "bearing1Tail",
+                    lambda: [(-rotatinghsiCircleRadius + 25, 0), (-hsiCircleRadius, 0)],
                 )
             )
-
-            # draw the nav type
-            self.qp.drawText(
-                QRectF(
-                    QPointF(0, g5Height - crsBoxHeight),
-                    QPointF(crsBoxWidth, g5Height - 2 * crsBoxHeight),
-                ),
-                Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter,
-                "{}".format(self.getNavTypeString(self._nav1type, "")),
-            )
-
-        if int(self._nav2fromto) != 0 and vertAvailable == 0:
-            # set color to grey
-            self.setPen(2, Qt.GlobalColor.gray)
-
-            # draw the contour
+            # arrow
             self.qp.drawPolyline(
-                QPolygonF(
-                    [
-                        QPointF(g5Width, g5Height - crsBoxHeight),
-                        QPointF(g5Width, g5Height - 3 * crsBoxHeight),
-                        QPointF(g5Width - 60, g5Height - 3 * crsBoxHeight),
-                    ]
+                self.shape(
+                    "bearing1Arrow",
+                    lambda: [
+                        (hsiCircleRadius + 20, -10),
+                        (hsiCircleRadius + 30, 0),
+                        (hsiCircleRadius + 20, 10),
+                    ],
                 )
             )
 
-            # draw the contour arc
-            self.qp.drawArc(
-                QRectF(g5Width / 2 - 195, g5Height / 2 - 185, 390, 390),
-                5036,
-                335,
-            )
+            self.qp.rotate(-90 + self._headingBug - self._nav1bearing)
+
+        # bearing 2
+        if int(self._nav2fromto) != 0:
+            self.qp.rotate(90 - self._headingBug + self._nav2bearing)
 
-            # set color to cyan and draw the bearing symbol
             self.setPen(2, Qt.GlobalColor.cyan)
+
+            # backside
             self.qp.drawPolyline(
-                QPolygonF(
-                    [
-                        QPointF(g5Width - 40, g5Height - 2.5 * crsBoxHeight),
-                        QPointF(g5Width - 50, g5Height - 2.5 * crsBoxHeight),
-                    ]
+                self.shape(
+                    "bearing2Tail",
+                    lambda: [
+                        (-hsiCircleRadius, -5),
+                        (-hsiCircleRadius - 25, -5),
+                        (-hsiCircleRadius - 30, 0),
+                        (-rotatinghsiCircleRadius + 25, 0),
+                        (-hsiCircleRadius - 30, 0),
+                        (-hsiCircleRadius - 25, +5),
+                        (-hsiCircleRadius, +5),
+                    ],
                 )
             )
+
+            # upside
             self.qp.drawPolyline(
-                QPolygonF(
-                    [
-                        QPointF(g5Width - 10, g5Height - 2.5 * crsBoxHeight + 5),
-                        QPointF(g5Width - 34, g5Height - 2.5 * crsBoxHeight + 5),
-                    ]
+                self.shape(
+                    "bearing2HeadUpper",
+                    lambda: [(rotatinghsiCircleRadius - 42, -5), (hsiCircleRadius, -5)],
                 )
             )
             self.qp.drawPolyline(
-                QPolygonF(
-                    [
-                        QPointF(g5Width - 10, g5Height - 2.5 * crsBoxHeight - 5),
-                        QPointF(g5Width - 34, g5Height - 2.5 * crsBoxHeight - 5),
-                    ]
+                self.shape(
+                    "bearing2HeadLower",
+                    lambda: [(rotatinghsiCircleRadius - 42, +5), (hsiCircleRadius, +5)],
                 )
             )
+            # arrow
             self.qp.drawPolyline(
-                QPolygonF(
-                    [
-                        QPointF(g5Width - 30, g5Height - 2.8 * crsBoxHeight),
-                        QPointF(g5Width - 40, g5Height - 2.5 * crsBoxHeight),
-                        QPointF(g5Width - 30, g5Height - 2.2 * crsBoxHeight),
-                    ]
+                self.shape(
+                    "bearing2Arrow",
+                    lambda: [
+                        (hsiCircleRadius + 25, -10),
+                        (hsiCircleRadius + 35, 0),
+                        (hsiCircleRadius + 45, 0),
+                        (hsiCircleRadius + 35, 0),
+                        (hsiCircleRadius + 25, 10),
+                    ],
                 )
             )
 
-            # draw the nav type
-            self.qp.drawText(
-                QRectF(
-                    QPointF(g5Width, g5Height - crsBoxHeight),
-                    QPointF(g5Width - crsBoxWidth, g5Height - 2 * crsBoxHeight),
-                ),
-                Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter,
-                "{}".format(self.getNavTypeString(self._nav2type, "")),
-            )
-
-        # draw the CRS selection
-
-        self.setPen(2, greyColor)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.black))
-
-        rect = QRectF(0, g5Height - crsBoxHeight, crsBoxWidth, crsBoxHeight)
-        self.qp.drawRect(rect)
-
-        self.setPen(1, Qt.GlobalColor.white)
+            self.qp.rotate(-90 + self._headingBug - self._nav2bearing)
 
-        font = self.qp.font()
-        font.setPixelSize(15)
-        self.qp.setFont(font)
+        self.setPen(1, Qt.GlobalColor.black)
+        self.setBrush(navColor)
+        # Draw the CDI
+        self.qp.rotate(90 - self._headingBug + navcrs)
 
-        rect = QRectF(1, g5Height - crsBoxHeight + 1, crsBoxWidth - 2, crsBoxHeight - 2)
-        self.qp.drawText(
-            rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignBottom, "CRS"
+        # CDI arrow
+        self.qp.drawPolygon(
+            self.shape(
+                "cdiArrow",
+                lambda: [
+                    (rotatinghsiCircleRadius - 10, 0),
+                    (rotatinghsiCircleRadius - 40, -20),
+                    (rotatinghsiCircleRadius - 33, -3),
+                    (hsiCircleRadius - 10, -3),
+                    (hsiCircleRadius - 10, 3),
+                    (rotatinghsiCircleRadius - 33, 3),
+                    (rotatinghsiCircleRadius - 40, 20),
+                ],
+            )
         )
-
-        font = self.qp.font()
-        font.setPixelSize(25)
-        self.qp.setFont(font)
-        if int(self._hsiSource) == 2:
-            self.setPen(1, Qt.GlobalColor.magenta)
-        else:
-            self.setPen(1, Qt.GlobalColor.green)
-        rect = QRectF(40, g5Height - crsBoxHeight + 1, 65, crsBoxHeight - 2)
-        self.qp.drawText(
-            rect,
-            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
-            "{:03d}˚".format(int(navcrs)),
+        # CDI bottom bar
+        self.qp.drawPolygon(
+            self.shape(
+                "cdiTail",
+                lambda: [
+                    (-rotatinghsiCircleRadius + 10, -3),
+                    (-hsiCircleRadius + 10, -3),
+                    (-hsiCircleRadius + 10, +3),
+                    (-rotatinghsiCircleRadius + 10, +3),
+                ],
+            )
         )
+        # CDI deflection bar
+        if int(navfromto) != 0:
+            hsiDeflectionBound = hsiCircleRadius / 75 * 2
+            deflection = (
+                max(min(navdft, hsiDeflectionBound), -hsiDeflectionBound) / 2 * 75
+            )
+            self.drawShape(
+                self.shape(
+                    "cdiDeflection",
+                    lambda: [
+                        (hsiCircleRadius - 10, -3),
+                        (-hsiCircleRadius + 10, -3),
+                        (-hsiCircleRadius + 10, +3),
+                        (hsiCircleRadius - 10, +3),
+                    ],
+                ),
+                0,
+                deflection,
+            )
 
-        self.qp.end()
+            # NAV1 FromTo
+            fromToTipX = 65
+            if int(navfromto) == 2:
+                self.qp.rotate(180)
 
+            self.qp.drawPolygon(
+                self.shape(
+                    "fromToArrow",
+                    lambda: [
+                        (fromToTipX - 10, 0),
+                        (fromToTipX - 40, -20),
+                        (fromToTipX - 30, 0),
+                        (fromToTipX - 40, 20),
+                    ],
+                )
+            )
+            if int(navfromto) == 2:
+                self.qp.rotate(180)
 
-class pyG5AIWidget(pyG5Widget):
-    """Generate G5 wdiget view."""
+        self.qp.rotate(90)
+        # CDI deflection circle
+        self.setPen(2, Qt.GlobalColor.white)
+        self.setBrush(Qt.GlobalColor.black)
 
-    def __init__(self, parent=None):
-        """g5Widget Constructor.
+        for i in [-81, -41, 31, 69]:
+            self.qp.drawArc(
+                QRectF(
+                    i,
+                    -6,
+                    12,
+                    12,
+                ),
+                0,
+                360 * 16,
+            )
 
-        Args:
-            parent: Parent Widget
+    def paintGroundTrack(self):
+        """Paint the ground track diamond and line, pointing up."""
+        rotatinghsiCircleRadius = 160
+        groundTrackDiamondSize = 7
+
+        self.setPen(0, Qt.GlobalColor.transparent)
+        self.setBrush(Qt.GlobalColor.magenta)
+        self.qp.drawPolygon(
+            self.shape(
+                "groundTrack",
+                lambda: [
+                    (
+                        -groundTrackDiamondSize,
+                        -rotatinghsiCircleRadius - groundTrackDiamondSize,
+                    ),
+                    (
+                        +groundTrackDiamondSize,
+                        -rotatinghsiCircleRadius - groundTrackDiamondSize,
+                    ),
+                    (+0, -rotatinghsiCircleRadius),
+                ],
+            )
+        )
+        self.setPen(3, greyColor, Qt.PenStyle.DashLine)
+        self.qp.drawLine(0, 0, 0, -rotatinghsiCircleRadius)
 
-        Returns:
-            self
-        """
-        pyG5Widget.__init__(self, parent)
+    def paintAircraft(self):
+        """Paint the aircraft symbol at the compass center."""
+        self.setPen(1, Qt.GlobalColor.white)
+        self.setBrush(Qt.GlobalColor.white)
 
-        # parameters
-        self.rollArcRadius = g5CenterY * 0.8
-        self._pitchScale = 25
+        self.qp.drawPolygon(
+            self.shape(
+                "aircraft",
+                lambda: [
+                    (240, 163),
+                    (235, 169),
+                    (235, 180),
+                    (215, 195),
+                    (215, 200),
+                    (235, 195),
+                    (235, 205),
+                    (227, 213),
+                    (227, 217),
+                    (240, 213),
+                    (253, 217),
+                    (253, 213),
+                    (245, 205),
+                    (245, 195),
+                    (265, 200),
+                    (265, 195),
+                    (245, 180),
+                    (245, 169),
+                ],
+            )
+        )
 
     def paintEvent(self, event):
         """Paint the widget."""
-        diamondHeight = 14
-        diamondWidth = 14
+        self.beginPaint(event)
+
+        rotatinghsiCircleRadius = 160
+        hsiCenter = self.hsiCenter
+
+        headingBoxWidth = 50
+        headingBoxHeight = 22
 
-        self.qp = QPainter(self)
+        self.setFontSize(headingBoxHeight - 2, True)
 
         if self._avionicson == 0:
+            # Draw the background
             self.setPen(1, Qt.GlobalColor.black)
-            self.qp.setBrush(QBrush(Qt.GlobalColor.black))
+            self.setBrush(Qt.GlobalColor.black)
             self.qp.drawRect(0, 0, g5Width, g5Height)
+
             self.setPen(1, Qt.GlobalColor.white)
             self.qp.drawLine(0, 0, g5Width, g5Height)
             self.qp.drawLine(0, g5Height, g5Width, 0)
-            self.qp.end()
+            self.endPaint()
             return
 
-        # set default font size
-        font = self.qp.font()
-        font.setPixelSize(6)
-        font.setBold(True)
-        self.qp.setFont(font)
+        if not self.sceneGraphLayers:
+            # offset the center to the Horizontal Situation Indicator center
+            self.qp.translate(g5CenterX, hsiCenter)
 
-        self.setPen(1, Qt.GlobalColor.white)
-        grad = QLinearGradient(g5CenterX, g5Height, g5CenterX, 0)
-        grad.setColorAt(1, QColor(0, 50, 200, 255))
-        grad.setColorAt(0, QColor(0, 255, 255, 255))
-        self.qp.setBrush(grad)
+            # opaque background with the fixed compass frame
+            self.drawStaticLayer(
+                "hsiFrame",
+                QRectF(-g5CenterX, -hsiCenter, g5Width, g5Height),
+                self.paintHSIFrame,
+                Qt.GlobalColor.black,
+            )
+            self.setPen(2, Qt.GlobalColor.white)
+            self.setBrush(Qt.GlobalColor.black)
 
-        # draw contour + backgorun sky
-        self.qp.drawRect(QRectF(0, 0, g5Width, g5Height))
+            # Draw the RotatingHSI lines and Text
+            # the card is one sprite rotated by the current magnetic heading
+            self.qp.rotate(-self._magHeading)
+            self.drawStaticLayer(
+                "compassCard",
+                QRectF(
+                    -rotatinghsiCircleRadius - 2,
+                    -rotatinghsiCircleRadius - 2,
+                    2 * rotatinghsiCircleRadius + 4,
+                    2 * rotatinghsiCircleRadius + 4,
+                ),
+                self.paintCompassCard,
+            )
+            self.qp.rotate(self._magHeading)
+
+            # the labels are upright sprites moved along the card
+            fontSize = self.qp.font().pixelSize()
+            labelRect = QRectF(-fontSize / 2 - 3, -fontSize / 2, fontSize + 6, fontSize)
+            for heading, text in compassLabels:
+                x, y = self.compassLabelOffset(heading)
+                self.qp.translate(x, y)
+                self.drawStaticLayer(
+                    "compassLabel{}".format(heading),
+                    labelRect,
+                    partial(self.paintCompassLabel, labelRect, text),
+                )
+                self.qp.translate(-x, -y)
 
-        # draw the rotating part depending on the roll angle
-        self.qp.translate(g5CenterX, g5CenterY)
-        self.qp.rotate(-self._rollAngle)
+            self.qp.rotate(-self._magHeading)
+            self.paintCardPointers()
+            self.resetPaintTransform()
 
-        # draw the ground
-        grad = QLinearGradient(
-            g5CenterX,
-            +self._pitchAngle / self._pitchScale * g5CenterY,
-            g5CenterX,
-            +g5Diag,
-        )
-        grad.setColorAt(0, QColor(152, 103, 45))
-        grad.setColorAt(1, QColor(255, 222, 173))
-        self.qp.setBrush(grad)
+        navSource = self.derived("navSource")
+        navColor = navSource["color"]
+        navcrs = navSource["crs"]
+        vertAvailable = navSource["vertAvailable"]
+        gsDev = navSource["gsDev"]
 
-        self.qp.drawRect(
-            QRectF(
-                QPointF(
-                    -g5Diag,
-                    +self._pitchAngle / self._pitchScale * g5CenterY,
-                ),
-                QPointF(
-                    +g5Diag,
-                    +g5Diag,
-                ),
-            )
+        self.setFontSize(15)
+        if int(self._hsiSource) == 2:
+            self.setPen(2, Qt.GlobalColor.magenta)
+        else:
+            self.setPen(2, Qt.GlobalColor.green)
+
+        self.drawText(
+            QRectF(g5CenterX - 70, hsiCenter - 50, 65, 18),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            navSource["cdiSource"],
         )
 
-        # draw the pitch lines
-        height = 0
-        pitch = 0
-        width = [10, 20, 10, 30]
-        mode = 0
-        while height < self.rollArcRadius - 40:
-            pitch += 2.5
-            height = (
-                pitch / self._pitchScale * g5CenterY
-                + self._pitchAngle / self._pitchScale * g5CenterY
-            )
-            self.qp.drawLine(
-                QPointF(
-                    -width[mode],
-                    height,
-                ),
-                QPointF(
-                    width[mode],
-                    height,
-                ),
-            )
-            if width[mode] == 30:
-                self.qp.drawText(QPoint(30 + 3, int(height + 2)), str(int(pitch)))
-                self.qp.drawText(QPoint(-40, int(height + 2)), str(int(pitch)))
-            mode = (mode + 1) % 4
-
-        height = 0
-        pitch = 0
-        width = [10, 20, 10, 30]
-        mode = 0
-        while height > -self.rollArcRadius + 30:
-            pitch -= 2.5
-            height = (
-                pitch / self._pitchScale * g5CenterY
-                + self._pitchAngle / self._pitchScale * g5CenterY
+        if len(navSource["annunciator"]):
+            self.drawText(
+                QRectF(g5CenterX + 25, hsiCenter - 50, 65, 18),
+                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                navSource["annunciator"],
             )
-            self.qp.drawLine(
-                QPointF(
-                    -width[mode],
-                    height,
-                ),
-                QPointF(
-                    width[mode],
-                    height,
-                ),
+
+        # Draw the heading Bug indicator bottom corner
+        if self.exposed(self.headingBugArea):
+            self.setPen(2, Qt.GlobalColor.gray)
+            self.setBrush(Qt.GlobalColor.black)
+
+            headingWidth = 105
+            headingHeigth = 30
+            self.qp.drawRect(QRectF(g5Width, g5Height, -headingWidth, -headingHeigth))
+
+            self.setPen(2, Qt.GlobalColor.cyan)
+            # draw the bug symbol
+            self.setPen(1, Qt.GlobalColor.cyan)
+            self.setBrush(Qt.GlobalColor.cyan)
+
+            self.qp.drawPolygon(
+                self.shape(
+                    "headingBugIcon",
+                    lambda: [
+                        (381, 336),
+                        (381, 354),
+                        (387, 354),
+                        (387, 349),
+                        (382, 346),
+                        (382, 344),
+                        (387, 341),
+                        (387, 336),
+                    ],
+                )
             )
-            if width[mode] == 30:
-                self.qp.drawText(QPoint(30 + 3, int(height + 2)), str(abs(int(pitch))))
-                self.qp.drawText(QPoint(-40, int(height + 2)), str(abs(int(pitch))))
 
-            mode = (mode + 1) % 4
+            self.drawText(
+                QRectF(412, 336, 65, 18),
+                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                formatCache.format("{:03d}˚", int(self._headingBug)),
+            )
 
-        # draw the static roll arc
-        self.setPen(3, Qt.GlobalColor.white)
+        # draw the dist box
+        if navSource["showDist"] and self.exposed(self.distArea):
+            self.setFontSize(12)
+            distRect = QRectF(g5Width - 105, 0, 105, 45)
 
-        bondingRect = QRectF(
-            -self.rollArcRadius,
-            -self.rollArcRadius,
-            2 * self.rollArcRadius,
-            2 * self.rollArcRadius,
-        )
-        self.qp.drawArc(bondingRect, 30 * 16, 120 * 16)
+            self.setPen(2, greyColor)
+            self.setBrush(Qt.GlobalColor.black)
+            self.qp.drawRect(distRect)
 
-        # draw the Roll angle arc markers
-        rollangleindicator = [
-            [-30, 10],
-            [-45, 5],
-            [-135, 5],
-            [-150, 10],
-            [-60, 10],
-            [-70, 5],
-            [-80, 5],
-            [-100, 5],
-            [-110, 5],
-            [-120, 10],
-        ]
+            self.drawText(
+                distRect,
+                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop,
+                "Dist NM",
+            )
 
-        self.qp.setBrush(QBrush(Qt.GlobalColor.white))
-        self.setPen(2, Qt.GlobalColor.white)
-        for lineParam in rollangleindicator:
-            self.qp.drawLine(self.alongRadiusCoord(lineParam[0], lineParam[1]))
+            self.setFontSize(18, True)
+            self.setPen(1, navColor)
 
-        self.setPen(1, Qt.GlobalColor.white)
-        # draw the diamond on top of the roll arc
-        self.qp.drawPolygon(
-            QPolygonF(
-                [
-                    QPointF(
-                        0,
-                        -self.rollArcRadius - 2,
-                    ),
-                    QPointF(-diamondWidth / 2, -self.rollArcRadius - diamondHeight),
-                    QPointF(+diamondWidth / 2, -self.rollArcRadius - diamondHeight),
-                ]
+            distRect = QRectF(g5Width - 105, 12, 105, 45 - 12)
+            self.drawText(
+                distRect,
+                Qt.AlignmentFlag.AlignCenter,
+                formatCache.format("{}", round(navSource["dist"], 1)),
             )
-        )
 
-        self.qp.resetTransform()
+        # set default font size
+        self.setFontSize(18, True)
 
-        # create the fixed diamond
+        # draw the wind box
+        if self.exposed(self.windArea):
+            self.setPen(2, greyColor)
+            self.setBrush(Qt.GlobalColor.black)
 
-        fixedDiamond = QPolygonF(
-            [
-                QPointF(g5CenterX, g5CenterY - self.rollArcRadius + 2),
-                QPointF(
-                    g5CenterX + diamondWidth / 2,
-                    g5CenterY - self.rollArcRadius + diamondHeight,
-                ),
-                QPointF(
-                    g5CenterX - diamondWidth / 2,
-                    g5CenterY - self.rollArcRadius + diamondHeight,
-                ),
-            ]
-        )
+            self.qp.drawRect(0, 0, 105, 45)
 
-        self.qp.drawPolygon(fixedDiamond)
+            self.setPen(1, Qt.GlobalColor.white)
+            self.setBrush(Qt.GlobalColor.white)
 
-        # create the nose
-        self.qp.setBrush(QBrush(Qt.GlobalColor.yellow))
-        self.qp.setBackgroundMode(Qt.BGMode.OpaqueMode)
+            windDirection, windSpeed = self.derived("wind")
 
-        self.setPen(1, Qt.GlobalColor.black)
+            self.qp.translate(25, 25)
 
-        # solid polygon left
-        nose = QPolygonF(
-            [
-                QPointF(g5CenterX - 1, g5CenterY + 1),
-                QPointF(g5CenterX - 75, g5CenterY + 38),
-                QPointF(g5CenterX - 54, g5CenterY + 38),
-            ]
-        )
-        self.qp.drawPolygon(nose)
+            self.qp.rotate(180 - self._magHeading + self._windDirection)
 
-        # solid polygon right
-        nose = QPolygonF(
-            [
-                QPointF(g5CenterX + 1, g5CenterY + 1),
-                QPointF(g5CenterX + 75, g5CenterY + 38),
-                QPointF(g5CenterX + 54, g5CenterY + 38),
-            ]
-        )
-        self.qp.drawPolygon(nose)
+            self.qp.drawPolygon(
+                self.shape(
+                    "windArrow",
+                    lambda: [
+                        (-5, 0),
+                        (0, -10),
+                        (5, 0),
+                        (2, 0),
+                        (2, 10),
+                        (-2, 10),
+                        (-2, 0),
+                    ],
+                )
+            )
 
-        # solid marker left
-        marker = QPolygonF(
-            [
-                QPointF(120, g5CenterY - 5),
-                QPointF(155, g5CenterY - 5),
-                QPointF(160, g5CenterY),
-                QPointF(155, g5CenterY + 5),
-                QPointF(120, g5CenterY + 5),
-            ]
-        )
-        self.qp.drawPolygon(marker)
+            self.resetPaintTransform()
 
-        # solid marker right
-        marker = QPolygonF(
-            [
-                QPointF(360, g5CenterY - 5),
-                QPointF(325, g5CenterY - 5),
-                QPointF(320, g5CenterY),
-                QPointF(325, g5CenterY + 5),
-                QPointF(360, g5CenterY + 5),
-            ]
-        )
-        self.qp.drawPolygon(marker)
+            self.drawText(
+                QRectF(50, 2, 50, 20),
+                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                windDirection,
+            )
 
-        brush = QBrush(QColor(0x7E, 0x7E, 0x34, 255))
-        self.qp.setBrush(brush)
+            self.drawText(
+                QRectF(50, 22, 50, 20),
+                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                windSpeed,
+            )
 
-        # cross pattern polygon left
-        nose = QPolygonF(
-            [
-                QPointF(g5CenterX - 2, g5CenterY + 2),
-                QPointF(g5CenterX - 33, g5CenterY + 38),
-                QPointF(g5CenterX - 54, g5CenterY + 38),
-            ]
+        # draw the 6 seconds heading trend along the compass card
+        headingTrend = max(min(self.trend("magHeading", self._turnRate), 90), -90)
+        self.setPen(4, Qt.GlobalColor.magenta)
+        self.qp.drawArc(
+            QRectF(
+                g5CenterX - rotatinghsiCircleRadius - 3,
+                hsiCenter - rotatinghsiCircleRadius - 3,
+                2 * rotatinghsiCircleRadius + 6,
+                2 * rotatinghsiCircleRadius + 6,
+            ),
+            90 * 16,
+            int(-headingTrend * 16),
         )
-        self.qp.drawPolygon(nose)
 
-        # cross pattern polygon right
-        nose = QPolygonF(
-            [
-                QPointF(g5CenterX + 2, g5CenterY + 2),
-                QPointF(g5CenterX + 33, g5CenterY + 38),
-                QPointF(g5CenterX + 54, g5CenterY + 38),
-            ]
+        # Draw the magnetic heading box
+        self.setPen(2, greyColor)
+        self.setBrush(Qt.GlobalColor.black)
+        self.qp.drawPolygon(
+            self.shape(
+                "headingBox",
+                lambda: [
+                    (g5CenterX - headingBoxWidth / 2, 1),
+                    (g5CenterX - headingBoxWidth / 2, headingBoxHeight),
+                    (g5CenterX - 6, headingBoxHeight),
+                    (g5CenterX, headingBoxHeight + 8),
+                    (g5CenterX + 6, headingBoxHeight),
+                    (g5CenterX + headingBoxWidth / 2, headingBoxHeight),
+                    (g5CenterX + headingBoxWidth / 2, 1),
+                ],
+            )
         )
-        self.qp.drawPolygon(nose)
 
-        self.setPen(0, Qt.GlobalColor.transparent)
-        # solid polygon right
-        nose = QPolygonF(
-            [
-                QPointF(120, g5CenterY),
-                QPointF(160, g5CenterY),
-                QPointF(155, g5CenterY + 5),
-                QPointF(120, g5CenterY + 5),
-            ]
-        )
-        self.qp.drawPolygon(nose)
-        # solid polygon right
-        nose = QPolygonF(
-            [
-                QPointF(360, g5CenterY),
-                QPointF(320, g5CenterY),
-                QPointF(325, g5CenterY + 5),
-                QPointF(360, g5CenterY + 5),
-            ]
+        self.drawText(
+            QRectF(
+                g5CenterX - headingBoxWidth / 2, 1, headingBoxWidth, headingBoxHeight
+            ),
+            Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+            formatCache.format("{:03d}˚", int(self._magHeading)),
         )
-        self.qp.drawPolygon(nose)
 
-        #################################################
-        # SPEED TAPE
-        #################################################
+        if not self.sceneGraphLayers:
+            self.qp.translate(g5CenterX, hsiCenter)
+            self.qp.rotate(-self._magHeading + self._groundTrack)
+            self.paintGroundTrack()
+            self.resetPaintTransform()
 
-        speedBoxLeftAlign = 7
-        speedBoxHeight = 50
-        speedBoxWdith = 75
-        speedBoxSpikedimension = 10
-        tasHeight = 30
-        speedDeltaWidth = 4
+            self.paintAircraft()
+
+        # draw the GlideScope
+        gsWidth = 16
+        gsHeigth = 192
+        gsCircleRad = 10
+        gsFromLeft = 20
+        gsDiamond = 16
+
+        if vertAvailable:
+            # Vertical guidance source
+            rect = QRectF(
+                g5Width - gsFromLeft - gsWidth,
+                hsiCenter - gsHeigth / 2 - 15,
+                gsWidth,
+                15,
+            )
 
-        tapeScale = 50
+            self.setFontSize(12, True)
+            self.setPen(1, navColor)
 
-        self.setPen(0, Qt.GlobalColor.transparent)
+            self.drawText(
+                rect,
+                Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter,
+                navSource["vertSource"],
+            )
 
-        self.qp.setBrush(QBrush(QColor(0, 0, 0, 90)))
-        self.qp.drawRect(QRectF(0, 0, speedBoxLeftAlign + speedBoxWdith + 15, g5Height))
+            self.setPen(2, greyColor)
+            self.setBrush(Qt.GlobalColor.transparent)
 
-        if (self._kias + tapeScale / 2) > self._vne:
-            brush = QBrush(QColor(Qt.GlobalColor.red))
-            self.qp.setBrush(brush)
+            self.qp.drawRect(rect)
 
+            # main rectangle
             self.qp.drawRect(
                 QRectF(
-                    speedBoxLeftAlign + speedBoxWdith + 8,
-                    0,
-                    8,
-                    (1 - 2 * (self._vne - self._kias) / tapeScale) * g5CenterY,
+                    g5Width - gsFromLeft - gsWidth,
+                    hsiCenter - gsHeigth / 2,
+                    gsWidth,
+                    gsHeigth,
                 )
             )
 
-        if (self._kias + tapeScale / 2) > self._vno:
-            brush = QBrush(QColor(Qt.GlobalColor.yellow))
-            self.qp.setBrush(brush)
-
-            self.qp.drawRect(
-                QRectF(
-                    speedBoxLeftAlign + speedBoxWdith + 8,
-                    (1 - 2 * (self._vne - self._kias) / tapeScale) * g5CenterY,
-                    8,
-                    (2 * (self._vne - self._vno) / tapeScale) * g5CenterY,
-                )
+            self.qp.drawLine(
+                g5Width - gsFromLeft - gsWidth,
+                hsiCenter,
+                g5Width - gsFromLeft,
+                hsiCenter,
             )
 
-        if (self._kias + tapeScale / 2) > self._vs:
-            brush = QBrush(QColor(Qt.GlobalColor.green))
-            self.qp.setBrush(brush)
-            self.qp.drawRect(
-                QRectF(
-                    speedBoxLeftAlign + speedBoxWdith + 8,
-                    max(0, (1 - 2 * (self._vno - self._kias) / tapeScale) * g5CenterY),
-                    8,
-                    (1 - 2 * (self._vs - self._kias) / tapeScale) * g5CenterY,
+            for offset in [-70, -35, 35, 70]:
+                self.qp.drawEllipse(
+                    QPointF(
+                        int(g5Width - gsFromLeft - gsWidth / 2),
+                        int(hsiCenter + offset),
+                    ),
+                    gsCircleRad / 2,
+                    gsCircleRad / 2,
                 )
-            )
 
-        if (self._kias + tapeScale / 2) > self._vs:
-            brush = QBrush(QColor(Qt.GlobalColor.white))
-            self.qp.setBrush(brush)
-            self.qp.drawRect(
-                QRectF(
-                    speedBoxLeftAlign + speedBoxWdith + 13,
-                    max(0, (1 - 2 * (self._vfe - self._kias) / tapeScale) * g5CenterY),
-                    3,
-                    (1 - 2 * (self._vs0 - self._kias) / tapeScale) * g5CenterY,
+            self.setPen(1, Qt.GlobalColor.black)
+            self.setBrush(navColor)
+
+            self.qp.translate(
+                g5Width - gsFromLeft - gsWidth, hsiCenter + gsDev / 2.5 * gsHeigth / 2
+            )
+            self.qp.drawPolygon(
+                self.shape(
+                    "gsDiamond",
+                    lambda: [
+                        (0, 0),
+                        (gsDiamond / 2, gsDiamond / 2),
+                        (gsDiamond, 0),
+                        (gsDiamond / 2, -gsDiamond / 2),
+                    ],
                 )
             )
 
-        self.setPen(2, Qt.GlobalColor.white)
+            self.resetPaintTransform()
+
+        crsBoxHeight = 30
+        crsBoxWidth = 105
 
-        self.qp.setBackgroundMode(Qt.BGMode.TransparentMode)
-        font = self.qp.font()
-        font.setPixelSize(speedBoxHeight - 15)
+        navTypes = self.derived("navTypes")
 
-        # set default font size
-        self.qp.setFont(font)
+        # draw the Selected Nav Bearing type
+        self.setPen(2, greyColor)
+        self.setBrush(Qt.GlobalColor.black)
 
-        currentTape = int(self._kias + tapeScale / 2)
-        while currentTape > max(0, self._kias - tapeScale / 2):
-            if (currentTape % 10) == 0:
-                tapeHeight = (
-                    1 - 2 * (currentTape - self._kias) / tapeScale
-                ) * g5CenterY
-                self.qp.drawLine(
-                    QPointF(speedBoxLeftAlign + speedBoxWdith + 5, tapeHeight),
-                    QPointF(speedBoxLeftAlign + speedBoxWdith + 15, tapeHeight),
+        if int(self._nav1fromto) != 0:
+            # draw the contour
+            self.qp.drawPolyline(
+                self.shape(
+                    "nav1Contour",
+                    lambda: [
+                        (0, g5Height - crsBoxHeight),
+                        (0, g5Height - 3 * crsBoxHeight),
+                        (60, g5Height - 3 * crsBoxHeight),
+                    ],
                 )
+            )
 
-                self.qp.drawText(
-                    QRectF(
-                        speedBoxLeftAlign,
-                        tapeHeight - speedBoxHeight / 2,
-                        speedBoxWdith,
-                        speedBoxHeight,
-                    ),
-                    Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
-                    "{:d}".format(int(currentTape)),
+            # draw the contour arc
+            self.qp.drawArc(
+                QRectF(g5Width / 2 - 195, g5Height / 2 - 185, 390, 390),
+                3268,
+                350,
+            )
+
+            # set color to cyan and draw the bearing symbol
+            self.setPen(2, Qt.GlobalColor.cyan)
+
+            self.qp.drawPolyline(
+                self.shape(
+                    "nav1BearingLine",
+                    lambda: [
+                        (10, g5Height - 2.5 * crsBoxHeight),
+                        (50, g5Height - 2.5 * crsBoxHeight),
+                    ],
+                )
+            )
+            self.qp.drawPolyline(
+                self.shape(
+                    "nav1BearingArrow",
+                    lambda: [
+                        (30, g5Height - 2.8 * crsBoxHeight),
+                        (40, g5Height - 2.5 * crsBoxHeight),
+                        (30, g5Height - 2.2 * crsBoxHeight),
+                    ],
                 )
+            )
 
-            elif (currentTape % 5) == 0:
-                self.qp.drawLine(
-                    QPointF(
-                        speedBoxLeftAlign + speedBoxWdith + 8,
-                        (1 - 2 * (currentTape - self._kias) / tapeScale) * g5CenterY,
-                    ),
-                    QPointF(
-                        speedBoxLeftAlign + speedBoxWdith + 15,
-                        (1 - 2 * (currentTape - self._kias) / tapeScale) * g5CenterY,
-                    ),
+            # draw the nav type
+            self.drawText(
+                QRectF(
+                    QPointF(0, g5Height - crsBoxHeight),
+                    QPointF(crsBoxWidth, g5Height - 2 * crsBoxHeight),
+                ),
+                Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter,
+                navTypes[0],
+            )
+
+        if int(self._nav2fromto) != 0 and vertAvailable == 0:
+            # set color to grey
+            self.setPen(2, Qt.GlobalColor.gray)
+
+            # draw the contour
+            self.qp.drawPolyline(
+                self.shape(
+                    "nav2Contour",
+                    lambda: [
+                        (g5Width, g5Height - crsBoxHeight),
+                        (g5Width, g5Height - 3 * crsBoxHeight),
+                        (g5Width - 60, g5Height - 3 * crsBoxHeight),
+                    ],
                 )
+            )
+
+            # draw the contour arc
+            self.qp.drawArc(
+                QRectF(g5Width / 2 - 195, g5Height / 2 - 185, 390, 390),
+                5036,
+                335,
+            )
 
-            currentTape -= 1
+            # set color to cyan and draw the bearing symbol
+            self.setPen(2, Qt.GlobalColor.cyan)
+            self.qp.drawPolyline(
+                self.shape(
+                    "nav2BearingLine",
+                    lambda: [
+                        (g5Width - 40, g5Height - 2.5 * crsBoxHeight),
+                        (g5Width - 50, g5Height - 2.5 * crsBoxHeight),
+                    ],
+                )
+            )
+            self.qp.drawPolyline(
+                self.shape(
+                    "nav2BearingUpper",
+                    lambda: [
+                        (g5Width - 10, g5Height - 2.5 * crsBoxHeight + 5),
+                        (g5Width - 34, g5Height - 2.5 * crsBoxHeight + 5),
+                    ],
+                )
+            )
+            self.qp.drawPolyline(
+                self.shape(
+                    "nav2BearingLower",
+                    lambda: [
+                        (g5Width - 10, g5Height - 2.5 * crsBoxHeight - 5),
+                        (g5Width - 34, g5Height - 2.5 * crsBoxHeight - 5),
+                    ],
+                )
+            )
+            self.qp.drawPolyline(
+                self.shape(
+                    "nav2BearingArrow",
+                    lambda: [
+                        (g5Width - 30, g5Height - 2.8 * crsBoxHeight),
+                        (g5Width - 40, g5Height - 2.5 * crsBoxHeight),
+                        (g5Width - 30, g5Height - 2.2 * crsBoxHeight),
+                    ],
+                )
+            )
 
-        speedBox = QPolygonF(
-            [
-                QPointF(speedBoxLeftAlign, g5CenterY + speedBoxHeight / 2),
-                QPointF(
-                    speedBoxLeftAlign + speedBoxWdith, g5CenterY + speedBoxHeight / 2
-                ),
-                QPointF(
-                    speedBoxLeftAlign + speedBoxWdith,
-                    g5CenterY + speedBoxSpikedimension,
-                ),
-                QPointF(
-                    speedBoxLeftAlign + speedBoxWdith + speedBoxSpikedimension,
-                    g5CenterY,
-                ),
-                QPointF(
-                    speedBoxLeftAlign + speedBoxWdith,
-                    g5CenterY - speedBoxSpikedimension,
-                ),
-                QPointF(
-                    speedBoxLeftAlign + speedBoxWdith, g5CenterY - speedBoxHeight / 2
+            # draw the nav type
+            self.drawText(
+                QRectF(
+                    QPointF(g5Width, g5Height - crsBoxHeight),
+                    QPointF(g5Width - crsBoxWidth, g5Height - 2 * crsBoxHeight),
                 ),
-                QPointF(speedBoxLeftAlign, g5CenterY - speedBoxHeight / 2),
-            ]
-        )
+                Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter,
+                navTypes[1],
+            )
 
-        self.setPen(2, Qt.GlobalColor.white)
+        # draw the CRS selection
 
-        brush = QBrush(QColor(0, 0, 0, 255))
-        self.qp.setBrush(brush)
+        self.setPen(2, greyColor)
+        self.setBrush(Qt.GlobalColor.black)
 
-        self.qp.drawPolygon(speedBox)
+        rect = QRectF(0, g5Height - crsBoxHeight, crsBoxWidth, crsBoxHeight)
+        self.qp.drawRect(rect)
 
-        font = self.qp.font()
-        font.setPixelSize(speedBoxHeight - 10)
-        # set default font size
-        self.qp.setFont(font)
+        self.setPen(1, Qt.GlobalColor.white)
 
-        self.qp.drawText(
-            QRectF(
-                speedBoxLeftAlign,
-                g5CenterY - speedBoxHeight / 2,
-                speedBoxWdith,
-                speedBoxHeight,
-            ),
-            Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-            "{:03d}".format(int(self._kias)),
+        self.setFontSize(15, True)
+
+        rect = QRectF(1, g5Height - crsBoxHeight + 1, crsBoxWidth - 2, crsBoxHeight - 2)
+        self.drawText(
+            rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignBottom, "CRS"
         )
 
-        # draw the TAS box
-        rect = QRectF(
-            0,
-            0,
-            speedBoxLeftAlign + speedBoxWdith + 15,
-            tasHeight,
+        self.setFontSize(25, True)
+        if int(self._hsiSource) == 2:
+            self.setPen(1, Qt.GlobalColor.magenta)
+        else:
+            self.setPen(1, Qt.GlobalColor.green)
+        rect = QRectF(40, g5Height - crsBoxHeight + 1, 65, crsBoxHeight - 2)
+        self.drawText(
+            rect,
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            formatCache.format("{:03d}˚", int(navcrs)),
         )
-        self.qp.drawRect(rect)
 
-        font = self.qp.font()
-        font.setPixelSize(20)
+        self.drawStaleMarker(g5CenterX, hsiCenter + 40)
+
+        self.endPaint()
+
+
+class pyG5AIWidget(pyG5Widget):
+    """Generate G5 wdiget view."""
+
+    stateFields = (
+        "avionicson",
+        "rollAngle",
+        "pitchAngle",
+        "kias",
+        "kiasDelta",
+        "ktas",
+        "gs",
+        "vs0",
+        "vs",
+        "vfe",
+        "vno",
+        "vne",
+        "altitude",
+        "altitudeSel",
+        "alt_setting",
+        "vh_ind_fpm",
+        "turnRate",
+        "slip",
+        "stale",
+    )
+
+    derivedValues = {
+        "speedBands": (speedBandsInputs, deriveSpeedBands),
+    }
+
+    trendFields = ("kias", "altitude")
+
+    # speed and altitude tape backgrounds, the tiles are 1 pixel wider,
+    # and the ranges displayed over the widget height
+    speedTapeRect = QRectF(0, 0, 97, g5Height)
+    altitudeTapeRect = QRectF(383, 0, g5Width - 383, g5Height)
+    speedTapeScale = 50
+    altitudeTapeScale = 300
+
+    # tape and readout areas, including their outlines
+    speedTapeArea = QRect(0, 0, 102, g5Height)
+    tasArea = QRect(0, 0, 99, 31)
+    gsArea = QRect(0, g5Height - 31, 99, 31)
+    altitudeTapeArea = QRect(380, 0, g5Width - 380, g5Height)
+    altSettingArea = QRect(382, g5Height - 31, g5Width - 382, 31)
+    turnRateArea = QRect(98, g5Height - 16, 284, 16)
+    slipArea = QRect(0, 303, g5Width, 35)
+    turnCoordinatorArea = QRect(0, 303, g5Width, g5Height - 303)
+
+    instrumentName = "ai"
+    frameRate = 60
+    framePriority = 0
+
+    fieldRegions = {
+        "kias": (speedTapeArea,),
+        "kiasDelta": (speedTapeArea,),
+        "vs0": (speedTapeArea,),
+        "vs": (speedTapeArea,),
+        "vfe": (speedTapeArea,),
+        "vno": (speedTapeArea,),
+        "vne": (speedTapeArea,),
+        "ktas": (tasArea,),
+        "gs": (gsArea,),
+        "altitude": (altitudeTapeArea,),
+        "altitudeSel": (altitudeTapeArea,),
+        "alt_setting": (altSettingArea,),
+        "vh_ind_fpm": (altitudeTapeArea,),
+        "turnRate": (turnRateArea,),
+        "slip": (slipArea,),
+    }
+
+    def __init__(self, parent=None, stateStore=None):
+        """g5Widget Constructor.
+
+        Args:
+            parent: Parent Widget
+            stateStore: shared pyG5StateStore, a private one is created if None
+
+        Returns:
+            self
+        """
+        pyG5Widget.__init__(self, parent, stateStore)
+
+        # parameters
+        self.rollArcRadius = g5CenterY * 0.8
+        self._pitchScale = 25
+
+    def paintEvent(self, event):
+        """Paint the widget."""
+        self.beginPaint(event)
+
+        if self._avionicson == 0:
+            self.setPen(1, Qt.GlobalColor.black)
+            self.setBrush(Qt.GlobalColor.black)
+            self.qp.drawRect(0, 0, g5Width, g5Height)
+            self.setPen(1, Qt.GlobalColor.white)
+            self.qp.drawLine(0, 0, g5Width, g5Height)
+            self.qp.drawLine(0, g5Height, g5Width, 0)
+            self.endPaint()
+            return
+
         # set default font size
-        self.qp.setFont(font)
+        self.setFontSize(6, True)
 
-        self.qp.drawText(
-            rect,
-            Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-            "TAS {:03d} kt".format(int(self._ktas)),
-        )
+        if not self.sceneGraphLayers:
+            self.paintAttitude()
 
-        # draw the TAS box
-        rect = QRectF(
-            0,
-            g5Height - tasHeight,
-            speedBoxLeftAlign + speedBoxWdith + 15,
-            tasHeight,
-        )
-        self.qp.drawRect(rect)
-        self.qp.drawText(
-            rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, "GS"
-        )
+        #################################################
+        # SPEED TAPE
+        #################################################
 
-        self.setPen(2, Qt.GlobalColor.magenta)
+        speedBoxLeftAlign = 7
+        speedBoxHeight = 50
+        speedBoxWdith = 75
+        speedBoxSpikedimension = 10
+        tasHeight = 30
 
-        self.qp.drawText(
-            rect,
-            Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
-            "{:03d} kt".format(int(self._gs * mstokt)),
-        )
+        if self.exposed(self.speedTapeArea):
+            self.qp.setBackgroundMode(Qt.BGMode.TransparentMode)
 
-        self.setPen(1, Qt.GlobalColor.magenta)
+            if not self.sceneGraphLayers:
+                self.setPen(0, Qt.GlobalColor.transparent)
+                self.setBrush(tapeBackgroundColor)
+                self.qp.drawRect(self.speedTapeRect)
 
-        brush = QBrush(Qt.GlobalColor.magenta)
-        self.qp.setBrush(brush)
+                self.drawTape(self.speedTapeTiles())
 
-        self.qp.drawRect(
-            QRectF(
+            speedBox = self.shape(
+                "speedBox",
+                lambda: [
+                    (speedBoxLeftAlign, g5CenterY + speedBoxHeight / 2),
+                    (speedBoxLeftAlign + speedBoxWdith, g5CenterY + speedBoxHeight / 2),
+                    (
+                        speedBoxLeftAlign + speedBoxWdith,
+                        g5CenterY + speedBoxSpikedimension,
+                    ),
+                    (
+                        speedBoxLeftAlign + speedBoxWdith + speedBoxSpikedimension,
+                        g5CenterY,
+                    ),
+                    (
+                        speedBoxLeftAlign + speedBoxWdith,
+                        g5CenterY - speedBoxSpikedimension,
+                    ),
+                    (speedBoxLeftAlign + speedBoxWdith, g5CenterY - speedBoxHeight / 2),
+                    (speedBoxLeftAlign, g5CenterY - speedBoxHeight / 2),
+                ],
+            )
+
+            self.setPen(2, Qt.GlobalColor.white)
+
+            self.setBrush(Qt.GlobalColor.black)
+
+            self.qp.drawPolygon(speedBox)
+
+            # set default font size
+            self.setFontSize(speedBoxHeight - 10, True)
+
+            self.drawText(
+                QRectF(
+                    speedBoxLeftAlign,
+                    g5CenterY - speedBoxHeight / 2,
+                    speedBoxWdith,
+                    speedBoxHeight,
+                ),
+                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+                formatCache.format("{:03d}", int(self._kias)),
+            )
+
+            # draw the TAS box
+            rect = QRectF(
+                0,
+                0,
                 speedBoxLeftAlign + speedBoxWdith + 15,
-                g5CenterY,
-                speedDeltaWidth,
-                -2 * (self._kiasDelta * 10) / tapeScale * g5CenterY,
+                tasHeight,
             )
-        )
+            self.qp.drawRect(rect)
+
+            # set default font size
+            self.setFontSize(20, True)
+
+            self.drawText(
+                rect,
+                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+                formatCache.format("TAS {:03d} kt", int(self._ktas)),
+            )
+
+            # draw the TAS box
+            rect = QRectF(
+                0,
+                g5Height - tasHeight,
+                speedBoxLeftAlign + speedBoxWdith + 15,
+                tasHeight,
+            )
+            self.qp.drawRect(rect)
+            self.drawText(
+                rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, "GS"
+            )
+
+            self.setPen(2, Qt.GlobalColor.magenta)
+
+            self.drawText(
+                rect,
+                Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                formatCache.format("{:03d} kt", int(self._gs * mstokt)),
+            )
+
+            if not self.sceneGraphLayers:
+                self.setPen(1, Qt.GlobalColor.magenta)
+
+                self.setBrush(Qt.GlobalColor.magenta)
+
+                # 6 seconds airspeed trend
+                self.qp.drawRect(self.speedTrendRect())
 
         #################################################
         # ALTITUDE TAPE
@@ -2225,292 +3357,295 @@ class pyG5AIWidget(pyG5Widget):
         altBoxHeight = 30
         altBoxWdith = 75
         altBoxSpikedimension = 10
-        altTapeScale = 300
+        altTapeScale = self.altitudeTapeScale
         altTapeLeftAlign = g5Width - altBoxRightAlign - altBoxWdith
         altSettingHeight = 30
 
-        vsScale = 30
-        vsIndicatorWidth = 7
-
-        alttapteLeftBound = altTapeLeftAlign - 1.5 * altBoxSpikedimension
-        self.setPen(0, Qt.GlobalColor.transparent)
-        self.qp.setBrush(QBrush(QColor(0, 0, 0, 90)))
-        self.qp.drawRect(
-            QRectF(alttapteLeftBound, 0, g5Width - alttapteLeftBound, int(g5Height))
-        )
-        self.setPen(2, Qt.GlobalColor.white)
-
-        self.qp.setBackgroundMode(Qt.BGMode.TransparentMode)
-        font = self.qp.font()
-        font.setPixelSize(10)
-        # set default font size
-        self.qp.setFont(font)
-
-        # VS tape
-        currentTape = vsScale
+        alttapteLeftBound = altTapeLeftAlign - 1.5 * altBoxSpikedimension
+        if self.exposed(self.altitudeTapeArea):
+            self.qp.setBackgroundMode(Qt.BGMode.TransparentMode)
 
-        while currentTape >= 0:
-            tapeHeight = (vsScale - currentTape) / vsScale * g5Height
-            if (currentTape % 5) == 0:
-                self.qp.drawLine(
-                    QPointF(g5Width - 10, tapeHeight),
-                    QPointF(g5Width, tapeHeight),
-                )
-                self.qp.drawText(
-                    QRectF(
-                        g5Width - 30,
-                        tapeHeight - 5,
-                        15,
-                        vsIndicatorWidth + 3,
-                    ),
-                    Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
-                    "{:d}".format(abs(int(currentTape - vsScale / 2))),
-                )
-            else:
-                self.qp.drawLine(
-                    QPointF(g5Width - vsIndicatorWidth, tapeHeight),
-                    QPointF(g5Width, tapeHeight),
-                )
+            if not self.sceneGraphLayers:
+                self.setPen(0, Qt.GlobalColor.transparent)
+                self.setBrush(tapeBackgroundColor)
+                self.qp.drawRect(self.altitudeTapeRect)
 
-            currentTape -= 1
-        # tapeHeight = (vsScale - currentTape) / vsScale * g5Height
-        vsHeight = -self._vh_ind_fpm / 100 / vsScale * g5Height
-        vsRect = QRectF(g5Width, g5CenterY, -vsIndicatorWidth, vsHeight)
+                # VS tape
+                self.drawStaticLayer("vsScale", self.vsScaleRect(), self.paintVSScale)
 
-        self.setPen(0, Qt.GlobalColor.transparent)
+                self.setPen(0, Qt.GlobalColor.transparent)
+                self.setBrush(Qt.GlobalColor.magenta)
+                self.qp.drawRect(self.vsRect())
 
-        brush = QBrush(QColor(Qt.GlobalColor.magenta))
-        self.qp.setBrush(brush)
+                # altitude tape
+                self.drawTape(self.altitudeTapeTiles())
 
-        self.qp.drawRect(vsRect)
+                # 6 seconds altitude trend
+                self.setPen(0, Qt.GlobalColor.transparent)
+                self.setBrush(Qt.GlobalColor.magenta)
+                self.qp.drawRect(self.altitudeTrendRect())
 
-        self.setPen(2, Qt.GlobalColor.white)
+            # set default font size
+            self.setFontSize(20, True)
 
-        font = self.qp.font()
-        font.setPixelSize(20)
-        # set default font size
-        self.qp.setFont(font)
+            # altitude selector
+            self.setPen(2, Qt.GlobalColor.cyan)
+            self.setBrush(Qt.GlobalColor.cyan)
 
-        # altitude tape
-        currentTape = int(self._altitude + altTapeScale / 2)
-
-        while currentTape > self._altitude - altTapeScale / 2:
-            if (currentTape % 20) == 0:
-                tapeHeight = (
-                    1 - 2 * (currentTape - self._altitude) / altTapeScale
-                ) * g5CenterY
-                self.qp.drawLine(
-                    QPointF(altTapeLeftAlign - 1.5 * altBoxSpikedimension, tapeHeight),
-                    QPointF(altTapeLeftAlign - altBoxSpikedimension / 2, tapeHeight),
+            altSelCenter = g5CenterY
+            if self._altitudeSel >= int(self._altitude + altTapeScale / 2 - 24):
+                altSelCenter = altSettingHeight
+            elif self._altitudeSel <= int(self._altitude - altTapeScale / 2 + 24):
+                altSelCenter = g5Height - altSettingHeight
+            else:
+                altSelCenter = (
+                    (floor(self._altitude + altTapeScale / 2) - self._altitudeSel)
+                    / altTapeScale
+                    * g5Height
                 )
-                if (currentTape % 100) == 0:
-                    self.qp.drawText(
-                        QRectF(
-                            altTapeLeftAlign,
-                            tapeHeight - speedBoxHeight / 2,
-                            speedBoxWdith,
-                            speedBoxHeight,
-                        ),
-                        Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
-                        "{:d}".format(int(currentTape)),
-                    )
 
-            currentTape -= 1
-
-        # altitude selector
-        pen = self.qp.pen()
-        pen.setColor(Qt.GlobalColor.cyan)
-        pen.setWidth(2)
-        self.qp.setPen(pen)
-        brush = QBrush(QColor(Qt.GlobalColor.cyan))
-        self.qp.setBrush(brush)
-
-        altSelCenter = g5CenterY
-        if self._altitudeSel >= int(self._altitude + altTapeScale / 2 - 24):
-            altSelCenter = altSettingHeight
-        elif self._altitudeSel <= int(self._altitude - altTapeScale / 2 + 24):
-            altSelCenter = g5Height - altSettingHeight
-        else:
-            altSelCenter = (
-                (floor(self._altitude + altTapeScale / 2) - self._altitudeSel)
-                / altTapeScale
-                * g5Height
+            altSel = self.shape(
+                "altSel",
+                lambda: [
+                    (alttapteLeftBound, -altBoxHeight / 2),
+                    (alttapteLeftBound, altBoxHeight / 2),
+                    (altTapeLeftAlign, altBoxHeight / 2),
+                    (altTapeLeftAlign, altBoxSpikedimension),
+                    (altTapeLeftAlign - altBoxSpikedimension, 0),
+                    (altTapeLeftAlign, -altBoxSpikedimension),
+                    (altTapeLeftAlign, -altBoxHeight / 2),
+                ],
             )
+            self.drawShape(altSel, 0, altSelCenter)
 
-        altSel = QPolygonF(
-            [
-                QPointF(alttapteLeftBound, altSelCenter - altBoxHeight / 2),
-                QPointF(alttapteLeftBound, altSelCenter + altBoxHeight / 2),
-                QPointF(altTapeLeftAlign, altSelCenter + altBoxHeight / 2),
-                QPointF(altTapeLeftAlign, altSelCenter + altBoxSpikedimension),
-                QPointF(altTapeLeftAlign - altBoxSpikedimension, altSelCenter),
-                QPointF(altTapeLeftAlign, altSelCenter - altBoxSpikedimension),
-                QPointF(altTapeLeftAlign, altSelCenter - altBoxHeight / 2),
-            ]
-        )
-        self.qp.drawPolygon(altSel)
+            # Altitude Box
+            self.setPen(2, Qt.GlobalColor.white)
+            altBoxTextSplitRatio = 2 / 5
+            altBox = self.shape(
+                "altBox",
+                lambda: [
+                    (g5Width - altBoxRightAlign, g5CenterY - altBoxHeight),
+                    (
+                        g5Width - altBoxRightAlign - altBoxWdith * altBoxTextSplitRatio,
+                        g5CenterY - altBoxHeight,
+                    ),
+                    (
+                        g5Width - altBoxRightAlign - altBoxWdith * altBoxTextSplitRatio,
+                        g5CenterY - altBoxHeight / 2,
+                    ),
+                    (altTapeLeftAlign, g5CenterY - altBoxHeight / 2),
+                    (altTapeLeftAlign, g5CenterY - altBoxSpikedimension),
+                    (altTapeLeftAlign - altBoxSpikedimension, g5CenterY),
+                    (altTapeLeftAlign, g5CenterY + altBoxSpikedimension),
+                    (altTapeLeftAlign, g5CenterY + altBoxHeight / 2),
+                    (
+                        g5Width - altBoxRightAlign - altBoxWdith * altBoxTextSplitRatio,
+                        g5CenterY + altBoxHeight / 2,
+                    ),
+                    (
+                        g5Width - altBoxRightAlign - altBoxWdith * altBoxTextSplitRatio,
+                        g5CenterY + altBoxHeight,
+                    ),
+                    (g5Width - altBoxRightAlign, g5CenterY + altBoxHeight),
+                ],
+            )
 
-        # Altitude Box
-        self.setPen(2, Qt.GlobalColor.white)
-        altBoxTextSplitRatio = 2 / 5
-        altBox = QPolygonF(
-            [
-                QPointF(g5Width - altBoxRightAlign, g5CenterY - altBoxHeight),
-                QPointF(
-                    g5Width - altBoxRightAlign - altBoxWdith * altBoxTextSplitRatio,
-                    g5CenterY - altBoxHeight,
-                ),
-                QPointF(
-                    g5Width - altBoxRightAlign - altBoxWdith * altBoxTextSplitRatio,
-                    g5CenterY - altBoxHeight / 2,
-                ),
-                QPointF(
+            self.setBrush(Qt.GlobalColor.black)
+
+            self.qp.drawPolygon(altBox)
+
+            # implement the last 2 digits in 20 ft steps
+            altStep = 20
+            charWidth = 15
+
+            if self._altitude < 0 and self._altitude > -1000:
+                # Add the  minus sign
+                dispRect = QRectF(
                     altTapeLeftAlign,
                     g5CenterY - altBoxHeight / 2,
-                ),
-                QPointF(
-                    altTapeLeftAlign,
-                    g5CenterY - altBoxSpikedimension,
-                ),
-                QPointF(
-                    altTapeLeftAlign - altBoxSpikedimension,
-                    g5CenterY,
-                ),
-                QPointF(
-                    altTapeLeftAlign,
-                    g5CenterY + altBoxSpikedimension,
-                ),
-                QPointF(
-                    altTapeLeftAlign,
-                    g5CenterY + altBoxHeight / 2,
-                ),
-                QPointF(
-                    g5Width - altBoxRightAlign - altBoxWdith * altBoxTextSplitRatio,
-                    g5CenterY + altBoxHeight / 2,
-                ),
-                QPointF(
-                    g5Width - altBoxRightAlign - altBoxWdith * altBoxTextSplitRatio,
-                    g5CenterY + altBoxHeight,
-                ),
-                QPointF(g5Width - altBoxRightAlign, g5CenterY + altBoxHeight),
-            ]
-        )
+                    charWidth,
+                    altBoxHeight,
+                )
+
+                self.drawText(
+                    dispRect,
+                    Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+                    "-",
+                )
 
-        brush = QBrush(QColor(0, 0, 0, 255))
-        self.qp.setBrush(brush)
+                # extract lower digits
+                altLowerDigit = abs(int(self._altitude)) % 100
 
-        self.qp.drawPolygon(altBox)
+                # floor the last to digit to the closest multiple of 20
+                altLowerDigitrounded = 20 * floor(altLowerDigit / 20)
 
-        # implement the last 2 digits in 20 ft steps
-        altStep = 20
-        charWidth = 15
+                altLowerDigitMod20 = altLowerDigit % 20
 
-        if self._altitude < 0 and self._altitude > -1000:
-            # Add the  minus sign
-            dispRect = QRectF(
-                altTapeLeftAlign,
-                g5CenterY - altBoxHeight / 2,
-                charWidth,
-                altBoxHeight,
-            )
+                if self._altitude >= -40:
+                    pass
+                    if altLowerDigitrounded == 20:
+                        altArray = [20, 0, 20, 40, 60]
+                    elif altLowerDigitrounded == 40:
+                        altArray = [0, 20, 40, 60, 80]
+                    else:
+                        altArray = [40, 20, 0, 20, 40]
 
-            self.qp.drawText(
-                dispRect,
-                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-                "-",
-            )
+                else:
+                    altArray = []
+                    for i in range(5):
+                        tmp = altLowerDigitrounded + altStep * (i - 2)
+                        if int(self._altitude / 100) * 100 + tmp >= 0:
+                            altArray.append(tmp % 100)
+                        else:
+                            altArray.append((100 - tmp) % 100)
+
+                # define a clip rect to avoid overflowing the alt box
+                self.qp.setClipRect(
+                    QRectF(
+                        g5Width - altBoxRightAlign - altBoxWdith * altBoxTextSplitRatio,
+                        g5CenterY - altBoxHeight,
+                        altBoxWdith * altBoxTextSplitRatio,
+                        2 * altBoxHeight,
+                    )
+                )
+
+                # draw the last 2 digits altitude
+                self.drawText(
+                    QRectF(
+                        altTapeLeftAlign + altBoxWdith * (1 - altBoxTextSplitRatio),
+                        g5CenterY
+                        - 2 * altBoxHeight
+                        - 0.8 * altBoxHeight * (altLowerDigitMod20 / 20),
+                        altBoxWdith * altBoxTextSplitRatio,
+                        4 * altBoxHeight,
+                    ),
+                    Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+                    formatCache.lines("{:02d}", altArray),
+                )
 
-            # extract lower digits
-            altLowerDigit = int("{:05d}".format(int(self._altitude))[3:5])
+                # clear clip rect
+                self.qp.setClipRect(0, 0, g5Width, g5Height)
 
-            # floor the last to digit to the closest multiple of 20
-            altLowerDigitrounded = 20 * floor(altLowerDigit / 20)
+            if self._altitude >= 0:
+                # extract the last 2 digit
+                altLowerDigit = int(self._altitude % 100)
 
-            altLowerDigitMod20 = altLowerDigit % 20
+                # floor the last to digit to the closest multiple of 20
+                altLowerDigitrounded = 20 * floor(altLowerDigit / 20)
 
-            if self._altitude >= -40:
-                pass
-                if altLowerDigitrounded == 20:
-                    altArray = [20, 0, 20, 40, 60]
-                elif altLowerDigitrounded == 40:
-                    altArray = [0, 20, 40, 60, 80]
-                else:
-                    altArray = [40, 20, 0, 20, 40]
+                altLowerDigitMod20 = altLowerDigit % 20
 
-            else:
+                # fill the array centered on the floor value in multiple of 20ft
                 altArray = []
                 for i in range(5):
-                    tmp = altLowerDigitrounded + altStep * (i - 2)
+                    tmp = altLowerDigitrounded + altStep * (2 - i)
                     if int(self._altitude / 100) * 100 + tmp >= 0:
                         altArray.append(tmp % 100)
                     else:
                         altArray.append((100 - tmp) % 100)
 
-            # define a clip rect to avoid overflowing the alt box
-            self.qp.setClipRect(
-                QRectF(
-                    g5Width - altBoxRightAlign - altBoxWdith * altBoxTextSplitRatio,
-                    g5CenterY - altBoxHeight,
-                    altBoxWdith * altBoxTextSplitRatio,
-                    2 * altBoxHeight,
-                )
-            )
+                altString = formatCache.format("{:05d}", int(self._altitude))
 
-            # draw the last 2 digits altitude
-            self.qp.drawText(
-                QRectF(
-                    altTapeLeftAlign + altBoxWdith * (1 - altBoxTextSplitRatio),
-                    g5CenterY
-                    - 2 * altBoxHeight
-                    - 0.8 * altBoxHeight * (altLowerDigitMod20 / 20),
-                    altBoxWdith * altBoxTextSplitRatio,
-                    4 * altBoxHeight,
-                ),
-                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-                "\n".join("{:02d}".format(t) for t in altArray),
-            )
+                if self._altitude > 9900:
+                    dispRect = QRectF(
+                        altTapeLeftAlign,
+                        g5CenterY - altBoxHeight / 2,
+                        charWidth,
+                        altBoxHeight,
+                    )
 
-            # clear clip rect
-            self.qp.setClipRect(0, 0, g5Width, g5Height)
+                    if (
+                        altString[1] == "9"
+                        and altString[2] == "9"
+                        and altLowerDigitrounded == 80
+                    ):
+                        self.qp.setClipRect(dispRect)
+
+                        self.drawText(
+                            QRectF(
+                                altTapeLeftAlign,
+                                g5CenterY
+                                - altBoxHeight / 2
+                                - 20
+                                + +0.8 * altBoxHeight * (altLowerDigitMod20 / 20),
+                                charWidth,
+                                60,
+                            ),
+                            Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop,
+                            formatCache.format(
+                                "{:01d}\n{}", (int(altString[0]) + 1) % 10, altString[0]
+                            )
+                            if self._altitude >= 10000
+                            else formatCache.format(
+                                "{:01d}\n ", (int(altString[0]) + 1) % 10
+                            ),
+                        )
+
+                        self.qp.setClipRect(0, 0, g5Width, g5Height)
 
-        if self._altitude >= 0:
-            # extract the last 2 digit
-            altLowerDigit = int(self._altitude % 100)
+                    else:
+                        self.drawText(
+                            dispRect,
+                            Qt.AlignmentFlag.AlignHCenter
+                            | Qt.AlignmentFlag.AlignVCenter,
+                            altString[0] if self._altitude >= 10000 else "",
+                        )
 
-            # floor the last to digit to the closest multiple of 20
-            altLowerDigitrounded = 20 * floor(altLowerDigit / 20)
+                if self._altitude >= 980:
+                    dispRect = QRectF(
+                        altTapeLeftAlign + charWidth,
+                        g5CenterY - altBoxHeight / 2,
+                        charWidth,
+                        altBoxHeight,
+                    )
 
-            altLowerDigitMod20 = altLowerDigit % 20
+                    if altString[2] == "9" and altLowerDigitrounded == 80:
+                        self.qp.setClipRect(dispRect)
+
+                        self.drawText(
+                            QRectF(
+                                altTapeLeftAlign + charWidth,
+                                g5CenterY
+                                - altBoxHeight / 2
+                                - 20
+                                + +0.8 * altBoxHeight * (altLowerDigitMod20 / 20),
+                                charWidth,
+                                60,
+                            ),
+                            Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop,
+                            formatCache.format(
+                                "{:01d}\n{}", (int(altString[1]) + 1) % 10, altString[1]
+                            )
+                            if self._altitude >= 1000
+                            else formatCache.format(
+                                "{:01d}\n ", (int(altString[1]) + 1) % 10
+                            ),
+                        )
 
-            # fill the array centered on the floor value in multiple of 20ft
-            altArray = []
-            for i in range(5):
-                tmp = altLowerDigitrounded + altStep * (2 - i)
-                if int(self._altitude / 100) * 100 + tmp >= 0:
-                    altArray.append(tmp % 100)
-                else:
-                    altArray.append((100 - tmp) % 100)
+                        self.qp.setClipRect(0, 0, g5Width, g5Height)
 
-            altString = "{:05d}".format(int(self._altitude))
+                    else:
+                        self.drawText(
+                            dispRect,
+                            Qt.AlignmentFlag.AlignHCenter
+                            | Qt.AlignmentFlag.AlignVCenter,
+                            altString[1] if self._altitude >= 1000 else "",
+                        )
+                        pass
 
-            if self._altitude > 9900:
                 dispRect = QRectF(
-                    altTapeLeftAlign,
+                    altTapeLeftAlign + 2 * charWidth,
                     g5CenterY - altBoxHeight / 2,
                     charWidth,
                     altBoxHeight,
                 )
 
-                if (
-                    altString[1] == "9"
-                    and altString[2] == "9"
-                    and altLowerDigitrounded == 80
-                ):
+                if altLowerDigitrounded == 80:
                     self.qp.setClipRect(dispRect)
 
-                    self.qp.drawText(
+                    self.drawText(
                         QRectF(
-                            altTapeLeftAlign,
+                            altTapeLeftAlign + 2 * charWidth,
                             g5CenterY
                             - altBoxHeight / 2
                             - 20
@@ -2519,272 +3654,741 @@ class pyG5AIWidget(pyG5Widget):
                             60,
                         ),
                         Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop,
-                        "{:01d}\n{}".format((int(altString[0]) + 1) % 10, altString[0])
-                        if self._altitude >= 10000
-                        else "{:01d}\n ".format((int(altString[0]) + 1) % 10),
+                        formatCache.format(
+                            "{:01d}\n{}", (int(altString[2]) + 1) % 10, altString[2]
+                        ),
                     )
-
                     self.qp.setClipRect(0, 0, g5Width, g5Height)
-
                 else:
-                    self.qp.drawText(
+                    self.drawText(
                         dispRect,
                         Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-                        altString[0] if self._altitude >= 10000 else "",
+                        altString[2],
                     )
 
-            if self._altitude >= 980:
-                dispRect = QRectF(
-                    altTapeLeftAlign + charWidth,
-                    g5CenterY - altBoxHeight / 2,
-                    charWidth,
-                    altBoxHeight,
+                # define a clip rect to avoid overflowing the alt box
+                self.qp.setClipRect(
+                    QRectF(
+                        g5Width - altBoxRightAlign - altBoxWdith * altBoxTextSplitRatio,
+                        g5CenterY - altBoxHeight,
+                        altBoxWdith * altBoxTextSplitRatio,
+                        2 * altBoxHeight,
+                    )
                 )
 
-                if altString[2] == "9" and altLowerDigitrounded == 80:
-                    self.qp.setClipRect(dispRect)
+                # draw the last 2 digits altitude
+                self.drawText(
+                    QRectF(
+                        altTapeLeftAlign + altBoxWdith * (1 - altBoxTextSplitRatio),
+                        g5CenterY
+                        - 2 * altBoxHeight
+                        + 0.8 * altBoxHeight * (altLowerDigitMod20 / 20),
+                        altBoxWdith * altBoxTextSplitRatio,
+                        4 * altBoxHeight,
+                    ),
+                    Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+                    formatCache.lines("{:02d}", altArray),
+                )
 
-                    self.qp.drawText(
-                        QRectF(
-                            altTapeLeftAlign + charWidth,
-                            g5CenterY
-                            - altBoxHeight / 2
-                            - 20
-                            + +0.8 * altBoxHeight * (altLowerDigitMod20 / 20),
-                            charWidth,
-                            60,
-                        ),
-                        Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop,
-                        "{:01d}\n{}".format((int(altString[1]) + 1) % 10, altString[1])
-                        if self._altitude >= 1000
-                        else "{:01d}\n ".format((int(altString[1]) + 1) % 10),
-                    )
+                # clear clip rect
+                self.qp.setClipRect(0, 0, g5Width, g5Height)
 
-                    self.qp.setClipRect(0, 0, g5Width, g5Height)
+            # draw the altimeter setting
+            self.setPen(2, Qt.GlobalColor.cyan)
+            leftAlign = altTapeLeftAlign - 1.5 * altBoxSpikedimension
+            rect = QRectF(
+                leftAlign,
+                g5Height - altSettingHeight,
+                g5Width - leftAlign,
+                altSettingHeight,
+            )
+            self.qp.drawRect(rect)
 
-                else:
-                    self.qp.drawText(
-                        dispRect,
-                        Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-                        altString[1] if self._altitude >= 1000 else "",
+            if 1:
+                self.drawText(
+                    rect,
+                    Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+                    formatCache.format("{:04.00f}", 33.863886 * self._alt_setting),
+                )
+            else:
+                self.drawText(
+                    rect,
+                    Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+                    formatCache.format("{:02.02f}", self._alt_setting),
+                )
+
+            # draw the altitude selector
+            self.setPen(2, Qt.GlobalColor.cyan)
+            leftAlign = altTapeLeftAlign - 1.5 * altBoxSpikedimension
+            rect = QRectF(
+                leftAlign,
+                0,
+                g5Width - leftAlign,
+                altSettingHeight,
+            )
+            self.qp.drawRect(rect)
+
+            self.drawText(
+                rect,
+                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
+                formatCache.format("{:d}ft", int(self._altitudeSel)),
+            )
+
+        #################################################
+        # Turn coordinator
+        #################################################
+
+        turnrateHalfWidth = 62
+        turnrateHeight = 15
+        slipballHeigh = 320
+        slipballRadius = 15
+        slipballMarkeWidth = 6
+        slipballMovementMax = 1
+        slipballMovementWdith = 15
+
+        if self.exposed(self.turnCoordinatorArea):
+            self.setPen(1, turnRateScaleColor)
+
+            self.qp.drawLines(
+                self.lines(
+                    "turnRateScale",
+                    lambda: np.array(
+                        [
+                            [g5CenterX, g5Height - turnrateHeight, g5CenterX, g5Height],
+                            [
+                                g5CenterX - turnrateHalfWidth,
+                                g5Height - turnrateHeight,
+                                g5CenterX + turnrateHalfWidth,
+                                g5Height - turnrateHeight,
+                            ],
+                        ]
+                    ),
+                )
+            )
+
+            self.setPen(0, Qt.GlobalColor.transparent)
+
+            self.setBrush(Qt.GlobalColor.magenta)
+            rect = QRectF(
+                g5CenterX,
+                g5Height - turnrateHeight + 1,
+                min(max(self._turnRate, -73), 73) / 32 * turnrateHalfWidth,
+                turnrateHeight - 2,
+            )
+            self.qp.drawRect(rect)
+
+            self.setPen(1, turnRateMarkerColor)
+
+            self.qp.drawLines(
+                self.lines(
+                    "turnRateMarkers",
+                    lambda: np.array(
+                        [
+                            [
+                                g5CenterX + offset,
+                                g5Height - turnrateHeight,
+                                g5CenterX + offset,
+                                g5Height,
+                            ]
+                            for offset in (-turnrateHalfWidth, turnrateHalfWidth)
+                        ]
+                    ),
+                )
+            )
+
+            # slip ball
+            # draw the static roll arc
+            self.setPen(2, slipMarkerPenColor)
+
+            self.setBrush(slipMarkerColor)
+
+            self.qp.drawRect(
+                QRectF(
+                    g5CenterX - slipballRadius,
+                    slipballHeigh - slipballRadius,
+                    -slipballMarkeWidth,
+                    2 * slipballRadius,
+                )
+            )
+            self.qp.drawRect(
+                QRectF(
+                    g5CenterX + slipballRadius,
+                    slipballHeigh - slipballRadius,
+                    slipballMarkeWidth,
+                    2 * slipballRadius,
+                )
+            )
+            # draw the slip ball, its gradient is centered on the brush origin
+            slipballX = (
+                g5CenterX - self._slip * slipballMovementMax * slipballMovementWdith
+            )
+            self.qp.setBrushOrigin(QPointF(slipballX, slipballHeigh))
+            if self.quality["gradients"]:
+                self.qp.setBrush(
+                    self.gradient(
+                        "slipBall", partial(self.slipBallGradient, slipballRadius)
                     )
-                    pass
+                )
+            else:
+                self.setBrush(QColor(208, 208, 208, 200))
+
+            self.qp.drawEllipse(
+                QPoint(int(slipballX), int(slipballHeigh)),
+                slipballRadius,
+                slipballRadius,
+            )
+            self.qp.setBrushOrigin(0, 0)
+
+        self.drawStaleMarker(g5CenterX, 16)
+
+        self.endPaint()
+
+    def paintAttitude(self):
+        """Draw the sky, the layers rotating with the roll and the aircraft symbol."""
+        # draw contour + backgorun sky
+        self.drawStaticLayer(
+            "sky",
+            QRectF(0, 0, g5Width, g5Height),
+            self.paintSky,
+            Qt.GlobalColor.black,
+        )
+
+        horizon = self.horizon()
+        groundRect = self.groundRect()
+        ladderRect = self.pitchLadderRect()
+        dpr = self.renderRatio()
+
+        # draw the rotating part depending on the roll angle
+        self.qp.translate(g5CenterX, g5CenterY)
+        self.qp.rotate(-self._rollAngle)
+
+        # draw the ground, the texture spans the widget diagonal so it
+        # covers the widget at any roll angle
+        groundTop = max(horizon, -g5Diag / 2)
+        if groundTop < g5Diag / 2:
+            self.qp.drawImage(
+                QRectF(-g5Diag / 2, groundTop, g5Diag, g5Diag / 2 - groundTop),
+                self.staticLayer("ground", groundRect, self.paintGround),
+                QRectF(
+                    0,
+                    (groundTop - horizon) * dpr,
+                    groundRect.width() * dpr,
+                    (g5Diag / 2 - groundTop) * dpr,
+                ),
+            )
+
+        # draw the pitch lines visible around the center
+        ladderWindow = self.pitchLadderWindow()
+        self.qp.drawImage(
+            ladderWindow,
+            self.staticLayer("pitchLadder", ladderRect, self.paintPitchLadder),
+            QRectF(
+                0,
+                (ladderWindow.top() - horizon - ladderRect.top()) * dpr,
+                ladderRect.width() * dpr,
+                ladderWindow.height() * dpr,
+            ),
+        )
+
+        # the roll scale rotates with the horizon
+        self.drawStaticLayer("rollScale", self.rollScaleRect(), self.paintRollScale)
+
+        self.resetPaintTransform()
+
+        self.drawStaticLayer(
+            "aircraftSymbol", self.aircraftSymbolRect(), self.paintAircraftSymbol
+        )
+
+    def horizon(self):
+        """Return the horizon offset, the textures hold the full pitch range."""
+        return (
+            max(-maxPitch, min(maxPitch, self._pitchAngle))
+            / self._pitchScale
+            * g5CenterY
+        )
+
+    def pitchLadderWindow(self):
+        """Return the visible pitch ladder area, in the rotated coordinates."""
+        ladderRect = self.pitchLadderRect()
+        ladderTop = -self.rollArcRadius + 30 - 2.5 / self._pitchScale * g5CenterY
+        ladderBottom = self.rollArcRadius - 40 + 2.5 / self._pitchScale * g5CenterY
+
+        return QRectF(
+            ladderRect.left(), ladderTop, ladderRect.width(), ladderBottom - ladderTop
+        )
+
+    def rollScaleRect(self):
+        """Return the roll scale layer rectangle, in the rotated coordinates."""
+        return QRectF(
+            -self.rollArcRadius - 16,
+            -self.rollArcRadius - 16,
+            2 * self.rollArcRadius + 32,
+            self.rollArcRadius + 32,
+        )
+
+    def aircraftSymbolRect(self):
+        """Return the aircraft symbol layer rectangle."""
+        return QRectF(
+            115, g5CenterY - self.rollArcRadius - 6, 250, self.rollArcRadius + 50
+        )
+
+    def speedTapeTiles(self):
+        """Return the speed tape tiles, see tapeTiles()."""
+        # the tiles depend on the aircraft V-speeds for the color bands
+        return self.tapeTiles(
+            "speedTape",
+            self._kias,
+            self.speedTapeScale,
+            self.speedTapeScale,
+            0,
+            self.speedTapeRect.width() + 1,
+            self.paintSpeedTape,
+            tuple(self.value(name) for name in speedBandsInputs),
+        )
+
+    def speedTrendRect(self):
+        """Return the 6 seconds airspeed trend bar."""
+        return QRectF(
+            self.speedTapeRect.right(),
+            g5CenterY,
+            4,
+            -2 * self.trend("kias", self._kiasDelta) / self.speedTapeScale * g5CenterY,
+        )
+
+    def altitudeTapeTiles(self):
+        """Return the altitude tape tiles, see tapeTiles()."""
+        return self.tapeTiles(
+            "altitudeTape",
+            self._altitude,
+            self.altitudeTapeScale,
+            self.altitudeTapeScale,
+            self.altitudeTapeRect.left() - 2,
+            self.altitudeTapeRect.width() + 2,
+            self.paintAltitudeTape,
+        )
+
+    def altitudeTrendRect(self):
+        """Return the 6 seconds altitude trend bar."""
+        return QRectF(
+            self.altitudeTapeRect.left(),
+            g5CenterY,
+            4,
+            -2
+            * self.trend("altitude", self._vh_ind_fpm / 60)
+            / self.altitudeTapeScale
+            * g5CenterY,
+        )
+
+    def vsScaleRect(self):
+        """Return the vertical speed scale layer rectangle."""
+        return QRectF(g5Width - 30, -5, 30, g5Height + 10)
+
+    def vsRect(self):
+        """Return the vertical speed indicator bar."""
+        # 30 hundreds of fpm over the widget height
+        return QRectF(g5Width, g5CenterY, -7, -self._vh_ind_fpm / 100 / 30 * g5Height)
+
+    def paintSky(self):
+        """Paint the sky gradient and the contour."""
+        self.setPen(1, Qt.GlobalColor.white)
+        if self.quality["gradients"]:
+            grad = QLinearGradient(g5CenterX, g5Height, g5CenterX, 0)
+            grad.setColorAt(1, QColor(0, 50, 200, 255))
+            grad.setColorAt(0, QColor(0, 255, 255, 255))
+            self.qp.setBrush(grad)
+        else:
+            self.setBrush(QColor(0, 152, 228))
+
+        self.qp.drawRect(QRectF(0, 0, g5Width, g5Height))
+
+    def groundRect(self):
+        """Return the ground texture rectangle, horizon at 0."""
+        height = ceil(maxPitch / self._pitchScale * g5CenterY + g5Diag / 2)
+        return QRectF(0, 0, ceil(g5Diag), height)
+
+    def paintGround(self):
+        """Paint the ground gradient below the white horizon line."""
+        rect = self.groundRect()
+
+        if self.quality["gradients"]:
+            grad = QLinearGradient(0, 0, 0, g5Diag)
+            grad.setColorAt(0, QColor(152, 103, 45))
+            grad.setColorAt(1, QColor(255, 222, 173))
+            self.qp.setBrush(grad)
+        else:
+            self.setBrush(QColor(180, 135, 80))
+        self.setPen(1, Qt.GlobalColor.white)
+        self.qp.drawRect(
+            QRectF(QPointF(-10, 0), QPointF(rect.right() + 10, rect.bottom() + 10))
+        )
+
+    def pitchLadderRect(self):
+        """Return the pitch ladder texture rectangle, horizon at 0."""
+        halfHeight = ceil(maxPitch / self._pitchScale * g5CenterY + g5CenterY)
+        return QRectF(-50, -halfHeight, 100, 2 * halfHeight)
+
+    def paintPitchLadder(self):
+        """Paint the pitch ladder lines and labels over the full pitch range."""
+        self.setPen(1, Qt.GlobalColor.white)
 
-            dispRect = QRectF(
-                altTapeLeftAlign + 2 * charWidth,
-                g5CenterY - altBoxHeight / 2,
-                charWidth,
-                altBoxHeight,
+        # a line every 2.5°, 10°, 20°, 10° and 30° wide, repeated
+        pitch = 2.5 * np.arange(1, int(maxPitch / 2.5) + 1)
+        width = np.resize([10, 20, 10, 30], pitch.shape)
+        kept = self.keepTicks(width > 10)
+        pitch = pitch[kept]
+        width = width[kept]
+        height = pitch / self._pitchScale * g5CenterY
+        self.drawLines(
+            horizontalTicks(
+                np.concatenate((-height, height)),
+                -np.tile(width, 2),
+                np.tile(width, 2),
             )
+        )
+
+        for labelPitch in pitch[width == 30].tolist():
+            for sign in (-1, 1):
+                height = sign * labelPitch / self._pitchScale * g5CenterY
+                self.qp.drawText(QPoint(30 + 3, int(height + 2)), str(int(labelPitch)))
+                self.qp.drawText(QPoint(-40, int(height + 2)), str(int(labelPitch)))
+
+    def paintSpeedTape(self, low, high, y):
+        """Paint the speed tape color bands, ticks and labels.
+
+        Args:
+            low: lowest speed painted
+            high: highest speed painted
+            y: function mapping a speed to the ordinate
+
+        Returns:
+            None
+        """
+        speedBoxLeftAlign = 7
+        speedBoxHeight = 50
+        speedBoxWdith = 75
 
-            if altLowerDigitrounded == 80:
-                self.qp.setClipRect(dispRect)
+        self.setPen(0, Qt.GlobalColor.transparent)
 
-                self.qp.drawText(
+        for xOffset, width, color, bandLow, bandHigh in self.derived("speedBands"):
+            if bandHigh > low and bandLow < high:
+                top = max(y(high), y(bandHigh))
+                bottom = min(y(low), y(bandLow))
+                self.setBrush(color)
+                self.qp.drawRect(
                     QRectF(
-                        altTapeLeftAlign + 2 * charWidth,
-                        g5CenterY
-                        - altBoxHeight / 2
-                        - 20
-                        + +0.8 * altBoxHeight * (altLowerDigitMod20 / 20),
-                        charWidth,
-                        60,
-                    ),
-                    Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop,
-                    "{:01d}\n{}".format((int(altString[2]) + 1) % 10, altString[2]),
-                )
-                self.qp.setClipRect(0, 0, g5Width, g5Height)
-            else:
-                self.qp.drawText(
-                    dispRect,
-                    Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-                    altString[2],
+                        speedBoxLeftAlign + speedBoxWdith + xOffset,
+                        top,
+                        width,
+                        bottom - top,
+                    )
                 )
 
-            # define a clip rect to avoid overflowing the alt box
-            self.qp.setClipRect(
-                QRectF(
-                    g5Width - altBoxRightAlign - altBoxWdith * altBoxTextSplitRatio,
-                    g5CenterY - altBoxHeight,
-                    altBoxWdith * altBoxTextSplitRatio,
-                    2 * altBoxHeight,
-                )
+        self.setPen(2, Qt.GlobalColor.white)
+
+        self.setFontSize(speedBoxHeight - 15, True)
+
+        # the labels overlapping the tile edges are painted on both tiles
+        margin = 10
+        tapes = np.arange(max(1, int(low) - margin), int(high) + margin + 1)
+        tapes = tapes[tapes % 5 == 0]
+        tapes = tapes[self.keepTicks(tapes % 10 == 0)]
+        self.drawLines(
+            horizontalTicks(
+                y(tapes),
+                speedBoxLeftAlign + speedBoxWdith + np.where(tapes % 10 == 0, 5, 8),
+                speedBoxLeftAlign + speedBoxWdith + 15,
             )
+        )
 
-            # draw the last 2 digits altitude
-            self.qp.drawText(
+        for currentTape in tapes[tapes % 10 == 0].tolist():
+            tapeHeight = y(currentTape)
+            self.drawText(
                 QRectF(
-                    altTapeLeftAlign + altBoxWdith * (1 - altBoxTextSplitRatio),
-                    g5CenterY
-                    - 2 * altBoxHeight
-                    + 0.8 * altBoxHeight * (altLowerDigitMod20 / 20),
-                    altBoxWdith * altBoxTextSplitRatio,
-                    4 * altBoxHeight,
+                    speedBoxLeftAlign,
+                    tapeHeight - speedBoxHeight / 2,
+                    speedBoxWdith,
+                    speedBoxHeight,
                 ),
-                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-                "\n".join("{:02d}".format(t) for t in altArray),
-            )
-
-            # clear clip rect
-            self.qp.setClipRect(0, 0, g5Width, g5Height)
-
-        # draw the altimeter setting
-        pen = self.qp.pen()
-        pen.setColor(Qt.GlobalColor.cyan)
-        pen.setWidth(2)
-        self.qp.setPen(pen)
-        leftAlign = altTapeLeftAlign - 1.5 * altBoxSpikedimension
-        rect = QRectF(
-            leftAlign,
-            g5Height - altSettingHeight,
-            g5Width - leftAlign,
-            altSettingHeight,
-        )
-        self.qp.drawRect(rect)
+                Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                "{:d}".format(currentTape),
+            )
 
-        if 1:
-            self.qp.drawText(
-                rect,
-                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-                "{:04.00f}".format(33.863886 * self._alt_setting),
+    def paintVSScale(self):
+        """Paint the vertical speed scale."""
+        vsScale = 30
+        vsIndicatorWidth = 7
+
+        self.setPen(2, Qt.GlobalColor.white)
+        self.setFontSize(10, True)
+
+        tapes = np.arange(vsScale, -1, -1)
+        tapes = tapes[self.keepTicks(tapes % 5 == 0)]
+        self.drawLines(
+            horizontalTicks(
+                (vsScale - tapes) / vsScale * g5Height,
+                np.where(tapes % 5 == 0, g5Width - 10, g5Width - vsIndicatorWidth),
+                g5Width,
             )
-        else:
-            self.qp.drawText(
-                rect,
-                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-                "{:02.02f}".format(self._alt_setting),
+        )
+
+        for currentTape in range(vsScale, -1, -5):
+            tapeHeight = (vsScale - currentTape) / vsScale * g5Height
+            self.drawText(
+                QRectF(
+                    g5Width - 30,
+                    tapeHeight - 5,
+                    15,
+                    vsIndicatorWidth + 3,
+                ),
+                Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                "{:d}".format(abs(int(currentTape - vsScale / 2))),
             )
 
-        # draw the altitude selector
-        pen = self.qp.pen()
-        pen.setColor(Qt.GlobalColor.cyan)
-        pen.setWidth(2)
-        self.qp.setPen(pen)
-        leftAlign = altTapeLeftAlign - 1.5 * altBoxSpikedimension
-        rect = QRectF(
-            leftAlign,
-            0,
-            g5Width - leftAlign,
-            altSettingHeight,
-        )
-        self.qp.drawRect(rect)
+    def paintAltitudeTape(self, low, high, y):
+        """Paint the altitude tape ticks and labels.
 
-        self.qp.drawText(
-            rect,
-            Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter,
-            "{:d}ft".format(int(self._altitudeSel)),
+        Args:
+            low: lowest altitude painted
+            high: highest altitude painted
+            y: function mapping an altitude to the ordinate
+
+        Returns:
+            None
+        """
+        altBoxRightAlign = 7
+        altBoxWdith = 75
+        altBoxSpikedimension = 10
+        altTapeLeftAlign = g5Width - altBoxRightAlign - altBoxWdith
+        labelHeight = 50
+
+        self.setPen(2, Qt.GlobalColor.white)
+
+        self.setFontSize(20, True)
+
+        # the labels overlapping the tile edges are painted on both tiles
+        margin = 40
+        tapes = np.arange(int(low) - margin, int(high) + margin + 1)
+        tapes = tapes[tapes % 20 == 0]
+        tapes = tapes[self.keepTicks(tapes % 100 == 0)]
+        self.drawLines(
+            horizontalTicks(
+                y(tapes),
+                altTapeLeftAlign - 1.5 * altBoxSpikedimension,
+                altTapeLeftAlign - altBoxSpikedimension / 2,
+            )
         )
 
-        #################################################
-        # Turn coordinator
-        #################################################
+        for currentTape in tapes[tapes % 100 == 0].tolist():
+            self.drawText(
+                QRectF(
+                    altTapeLeftAlign,
+                    y(currentTape) - labelHeight / 2,
+                    altBoxWdith,
+                    labelHeight,
+                ),
+                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                "{:d}".format(currentTape),
+            )
 
-        turnrateHalfWidth = 62
-        turnrateHeight = 15
-        slipballHeigh = 320
-        slipballRadius = 15
-        slipballMarkeWidth = 6
-        slipballMovementMax = 1
-        slipballMovementWdith = 15
+    def paintRollScale(self):
+        """Paint the roll arc, its markers and the roll pointer."""
+        diamondHeight = 14
+        diamondWidth = 14
 
-        self.setPen(1, QColor(0, 0, 0, 127))
+        # draw the static roll arc
+        self.setPen(3, Qt.GlobalColor.white)
 
-        self.qp.drawLine(
-            QPointF(g5CenterX, g5Height - turnrateHeight),
-            QPointF(g5CenterX, g5Height),
+        bondingRect = QRectF(
+            -self.rollArcRadius,
+            -self.rollArcRadius,
+            2 * self.rollArcRadius,
+            2 * self.rollArcRadius,
         )
-        self.qp.drawLine(
-            QPointF(g5CenterX - turnrateHalfWidth, g5Height - turnrateHeight),
-            QPointF(g5CenterX + turnrateHalfWidth, g5Height - turnrateHeight),
+        self.qp.drawArc(bondingRect, 30 * 16, 120 * 16)
+
+        # draw the Roll angle arc markers: angle, length
+        rollangleindicator = np.array(
+            [
+                [-30, 10],
+                [-45, 5],
+                [-135, 5],
+                [-150, 10],
+                [-60, 10],
+                [-70, 5],
+                [-80, 5],
+                [-100, 5],
+                [-110, 5],
+                [-120, 10],
+            ]
         )
 
-        self.setPen(0, Qt.GlobalColor.transparent)
+        self.setBrush(Qt.GlobalColor.white)
+        self.setPen(2, Qt.GlobalColor.white)
+        # the marker ends are truncated to whole pixels
+        self.drawLines(
+            np.trunc(
+                radialTicks(
+                    rollangleindicator[:, 0],
+                    self.rollArcRadius,
+                    self.rollArcRadius + rollangleindicator[:, 1],
+                )
+            )
+        )
 
-        brush = QBrush(QColor(Qt.GlobalColor.magenta))
-        self.qp.setBrush(brush)
-        rect = QRectF(
-            g5CenterX,
-            g5Height - turnrateHeight + 1,
-            min(max(self._turnRate, -73), 73) / 32 * turnrateHalfWidth,
-            turnrateHeight - 2,
+        self.setPen(1, Qt.GlobalColor.white)
+        # draw the diamond on top of the roll arc
+        self.qp.drawPolygon(
+            QPolygonF(
+                [
+                    QPointF(
+                        0,
+                        -self.rollArcRadius - 2,
+                    ),
+                    QPointF(-diamondWidth / 2, -self.rollArcRadius - diamondHeight),
+                    QPointF(+diamondWidth / 2, -self.rollArcRadius - diamondHeight),
+                ]
+            )
         )
-        self.qp.drawRect(rect)
 
-        self.setPen(1, QColor(255, 255, 255, 128))
+    def paintAircraftSymbol(self):
+        """Paint the fixed roll diamond, the nose and the wing markers."""
+        diamondHeight = 14
+        diamondWidth = 14
 
-        self.qp.drawLine(
-            QPointF(g5CenterX - turnrateHalfWidth, g5Height - turnrateHeight),
-            QPointF(g5CenterX - turnrateHalfWidth, g5Height),
-        )
-        self.qp.drawLine(
-            QPointF(g5CenterX + turnrateHalfWidth, g5Height - turnrateHeight),
-            QPointF(g5CenterX + turnrateHalfWidth, g5Height),
+        self.setPen(1, Qt.GlobalColor.white)
+        self.setBrush(Qt.GlobalColor.white)
+
+        # create the fixed diamond
+
+        fixedDiamond = QPolygonF(
+            [
+                QPointF(g5CenterX, g5CenterY - self.rollArcRadius + 2),
+                QPointF(
+                    g5CenterX + diamondWidth / 2,
+                    g5CenterY - self.rollArcRadius + diamondHeight,
+                ),
+                QPointF(
+                    g5CenterX - diamondWidth / 2,
+                    g5CenterY - self.rollArcRadius + diamondHeight,
+                ),
+            ]
         )
 
-        # slip ball
-        # draw the static roll arc
-        self.setPen(2, QColor(0, 0, 0, 128))
+        self.qp.drawPolygon(fixedDiamond)
+
+        # create the nose
+        self.setBrush(Qt.GlobalColor.yellow)
+        self.qp.setBackgroundMode(Qt.BGMode.OpaqueMode)
 
-        self.qp.setBrush(QBrush(QColor(220, 220, 220)))
+        self.setPen(1, Qt.GlobalColor.black)
 
-        self.qp.drawRect(
-            QRectF(
-                g5CenterX - slipballRadius,
-                slipballHeigh - slipballRadius,
-                -slipballMarkeWidth,
-                2 * slipballRadius,
-            )
+        # solid polygon left
+        nose = QPolygonF(
+            [
+                QPointF(g5CenterX - 1, g5CenterY + 1),
+                QPointF(g5CenterX - 75, g5CenterY + 38),
+                QPointF(g5CenterX - 54, g5CenterY + 38),
+            ]
         )
-        self.qp.drawRect(
-            QRectF(
-                g5CenterX + slipballRadius,
-                slipballHeigh - slipballRadius,
-                slipballMarkeWidth,
-                2 * slipballRadius,
-            )
+        self.qp.drawPolygon(nose)
+
+        # solid polygon right
+        nose = QPolygonF(
+            [
+                QPointF(g5CenterX + 1, g5CenterY + 1),
+                QPointF(g5CenterX + 75, g5CenterY + 38),
+                QPointF(g5CenterX + 54, g5CenterY + 38),
+            ]
         )
-        # set slip ball gradian
-        grad = QRadialGradient(
-            g5CenterX - self._slip * slipballMovementMax * slipballMovementWdith,
-            slipballHeigh,
-            slipballRadius,
-            g5CenterX - self._slip * slipballMovementMax * slipballMovementWdith,
-            slipballHeigh,
+        self.qp.drawPolygon(nose)
+
+        # solid marker left
+        marker = QPolygonF(
+            [
+                QPointF(120, g5CenterY - 5),
+                QPointF(155, g5CenterY - 5),
+                QPointF(160, g5CenterY),
+                QPointF(155, g5CenterY + 5),
+                QPointF(120, g5CenterY + 5),
+            ]
         )
-        grad.setColorAt(0, QColor(255, 255, 255, 200))
-        grad.setColorAt(1, QColor(160, 160, 160, 200))
-        self.qp.setBrush(grad)
+        self.qp.drawPolygon(marker)
 
-        self.qp.drawEllipse(
-            QPoint(
-                int(
-                    g5CenterX - self._slip * slipballMovementMax * slipballMovementWdith
-                ),
-                int(slipballHeigh),
-            ),
-            slipballRadius,
-            slipballRadius,
+        # solid marker right
+        marker = QPolygonF(
+            [
+                QPointF(360, g5CenterY - 5),
+                QPointF(325, g5CenterY - 5),
+                QPointF(320, g5CenterY),
+                QPointF(325, g5CenterY + 5),
+                QPointF(360, g5CenterY + 5),
+            ]
         )
+        self.qp.drawPolygon(marker)
 
-        self.qp.end()
+        self.setBrush(QColor(0x7E, 0x7E, 0x34, 255))
 
-    def pitchLine(self, offset, length):
-        """Return a pitch line.
+        # cross pattern polygon left
+        nose = QPolygonF(
+            [
+                QPointF(g5CenterX - 2, g5CenterY + 2),
+                QPointF(g5CenterX - 33, g5CenterY + 38),
+                QPointF(g5CenterX - 54, g5CenterY + 38),
+            ]
+        )
+        self.qp.drawPolygon(nose)
 
-        As the pitch line is drawn using translate and rotate
-        align the pitch line around the center
+        # cross pattern polygon right
+        nose = QPolygonF(
+            [
+                QPointF(g5CenterX + 2, g5CenterY + 2),
+                QPointF(g5CenterX + 33, g5CenterY + 38),
+                QPointF(g5CenterX + 54, g5CenterY + 38),
+            ]
+        )
+        self.qp.drawPolygon(nose)
+
+        self.setPen(0, Qt.GlobalColor.transparent)
+        # solid polygon right
+        nose = QPolygonF(
+            [
+                QPointF(120, g5CenterY),
+                QPointF(160, g5CenterY),
+                QPointF(155, g5CenterY + 5),
+                QPointF(120, g5CenterY + 5),
+            ]
+        )
+        self.qp.drawPolygon(nose)
+        # solid polygon right
+        nose = QPolygonF(
+            [
+                QPointF(360, g5CenterY),
+                QPointF(320, g5CenterY),
+                QPointF(325, g5CenterY + 5),
+                QPointF(360, g5CenterY + 5),
+            ]
+        )
+        self.qp.drawPolygon(nose)
+
+    def slipBallGradient(self, radius):
+        """Return the slip ball gradient centered on the origin.
 
         Args:
-            angle: in degrees
-            length: in pixel
+            radius: slip ball radius
 
         Returns:
-            Qline
+            QRadialGradient
         """
-        pass
+        grad = QRadialGradient(0, 0, radius, 0, 0)
+        grad.setColorAt(0, QColor(255, 255, 255, 200))
+        grad.setColorAt(1, QColor(160, 160, 160, 200))
+        return grad
+
+    def pitchLine(self, offset, length):
+        """Return a pitch line.
 
-    def alongRadiusCoord(self, angle, length):
-        """Return a line along the radius of the circle.
+        As the pitch line is drawn using translate and rotate
+        align the pitch line around the center
 
         Args:
             angle: in degrees
@@ -2793,69 +4397,103 @@ class pyG5AIWidget(pyG5Widget):
         Returns:
             Qline
         """
-        startPoint = QPoint(
-            int(self.rollArcRadius * cos(radians(angle))),
-            int(self.rollArcRadius * sin(radians(angle))),
-        )
-        endPoint = QPoint(
-            int((self.rollArcRadius + length) * cos(radians(angle))),
-            int((self.rollArcRadius + length) * sin(radians(angle))),
-        )
-
-        return QLine(startPoint, endPoint)
+        pass
 
 
 class pyG5FMA(pyG5Widget):
     """Generate G5 wdiget view."""
 
-    def __init__(self, parent=None):
+    stateFields = (
+        "avionicson",
+        "apMode",
+        "apState",
+        "apAirSpeed",
+        "apVS",
+        "apAltitude",
+        "altitudeHold",
+        "altitudeVNAV",
+        "hsiSource",
+        "nav1type",
+        "nav2type",
+    )
+
+    derivedValues = {
+        "navTypes": (navTypesInputs, deriveNavTypes),
+    }
+
+    # mode columns
+    lateralArea = QRect(0, 0, g5Width // 3, fmaHeight)
+    activeVerticalArea = QRect(g5Width // 2, 0, g5Width // 3, fmaHeight)
+    armedVerticalArea = QRect(g5Width * 2 // 3, 0, g5Width // 3, fmaHeight)
+
+    instrumentName = "fma"
+    frameRate = 5
+    framePriority = 2
+
+    fieldRegions = {
+        "apAirSpeed": (activeVerticalArea,),
+        "apVS": (activeVerticalArea,),
+        "altitudeHold": (activeVerticalArea,),
+        "apAltitude": (armedVerticalArea,),
+        "altitudeVNAV": (armedVerticalArea,),
+        "hsiSource": (lateralArea,),
+        "nav1type": (lateralArea,),
+        "nav2type": (lateralArea,),
+    }
+
+    def __init__(self, parent=None, stateStore=None):
         """g5Widget Constructor.
 
         Args:
             parent: Parent Widget
+            stateStore: shared pyG5StateStore, a private one is created if None
 
         Returns:
             self
         """
-        pyG5Widget.__init__(self, parent)
+        pyG5Widget.__init__(self, parent, stateStore)
 
     def paintEvent(self, event):
         """Paint the widget."""
-        self.qp = QPainter(self)
+        self.beginPaint(event)
 
         self.setPen(1, Qt.GlobalColor.black)
-        self.qp.setBrush(QBrush(Qt.GlobalColor.black))
+        self.setBrush(Qt.GlobalColor.black)
         self.qp.drawRect(0, 0, g5Width, fmaHeight)
 
         if self._avionicson == 0:
             self.setPen(1, Qt.GlobalColor.white)
             self.qp.drawLine(0, 0, g5Width, fmaHeight)
             self.qp.drawLine(0, fmaHeight, g5Width, 0)
-            self.qp.end()
+            self.endPaint()
             return
 
         # draw the FMA sections delimiters
         delimMargin = 5
         self.setPen(2, Qt.GlobalColor.white)
-        self.qp.drawLine(
-            QLineF(g5Width / 2, delimMargin, g5Width / 2, fmaHeight - delimMargin)
-        )
-        self.qp.drawLine(
-            QLineF(g5Width / 3, delimMargin, g5Width / 3, fmaHeight - delimMargin)
+        self.qp.drawLines(
+            self.lines(
+                "delimiters",
+                lambda: np.array(
+                    [
+                        [x, delimMargin, x, fmaHeight - delimMargin]
+                        for x in (g5Width / 2, g5Width / 3)
+                    ]
+                ),
+            )
         )
 
         self.setPen(2, Qt.GlobalColor.green)
 
-        font = self.qp.font()
-        font.setPixelSize(20)
-        font.setBold(True)
-        self.qp.setFont(font)
+        self.setFontSize(20, True)
+
+        navTypes = self.derived("navTypes")
 
         # draw the text when the AP is engaged
         if self._apMode != 0:
             # Draw the AP mode
             mode = "AP" if self._apMode == 2 else "FD"
-            self.qp.drawText(
+            self.drawText(
                 QRectF(
                     g5Width / 3 + delimMargin,
                     delimMargin,
@@ -2875,14 +4513,14 @@ class pyG5FMA(pyG5Widget):
                 if int(self._hsiSource) == 2:
                     hmode = "GPS"
                 elif int(self._hsiSource) == 1:
-                    hmode = "{}".format(self.getNavTypeString(self._nav2type, ""))
+                    hmode = navTypes[1]
                 elif int(self._hsiSource) == 0:
-                    hmode = "{}".format(self.getNavTypeString(self._nav1type, ""))
+                    hmode = navTypes[0]
                 else:
                     hmode = "ERR"
             else:
                 hmode = ""
-            self.qp.drawText(
+            self.drawText(
                 QRectF(
                     g5Width / 6 + delimMargin,
                     delimMargin,
@@ -2895,19 +4533,19 @@ class pyG5FMA(pyG5Widget):
 
             # find the engaged vertical navigation mode
             if int(self._apState) & 0x8:
-                vmode = "FLC {} kts".format(int(self._apAirSpeed))
+                vmode = formatCache.format("FLC {} kts", int(self._apAirSpeed))
             elif int(self._apState) & 0x10:
-                vmode = "VS {} fpm".format(int(self._apVS))
+                vmode = formatCache.format("VS {} fpm", int(self._apVS))
             elif int(self._apState) & 0x800:
                 vmode = "GS"
             elif int(self._apState) & 0x4000:
-                vmode = "ALT {} ft".format(int(self._altitudeHold))
+                vmode = formatCache.format("ALT {} ft", int(self._altitudeHold))
             elif int(self._apState) & 0x40000:
                 vmode = "VPATH"
             else:
                 vmode = "PIT"
 
-            self.qp.drawText(
+            self.drawText(
                 QRectF(
                     g5Width / 2 + delimMargin,
                     delimMargin,
@@ -2925,13 +4563,13 @@ class pyG5FMA(pyG5Widget):
             if int(self._hsiSource) == 2:
                 hmode = "GPS"
             elif int(self._hsiSource) == 1:
-                hmode = "{}".format(self.getNavTypeString(self._nav2type, ""))
+                hmode = navTypes[1]
             elif int(self._hsiSource) == 0:
-                hmode = "{}".format(self.getNavTypeString(self._nav1type, ""))
+                hmode = navTypes[0]
             else:
                 hmode = "ERR"
 
-            self.qp.drawText(
+            self.drawText(
                 QRectF(
                     delimMargin,
                     delimMargin,
@@ -2953,7 +4591,7 @@ class pyG5FMA(pyG5Widget):
         if int(self._apState) & 0x400:
             vmode += " GS" if len(vmode) else "GS"
 
-        self.qp.drawText(
+        self.drawText(
             QRectF(
                 g5Width * 4 / 6 + delimMargin,
                 delimMargin,
@@ -2964,4 +4602,4 @@ class pyG5FMA(pyG5Widget):
             vmode,
         )
 
-        self.qp.end()
+        self.endPaint()